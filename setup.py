@@ -44,6 +44,9 @@ try:
         'gui_scripts' : [
             'veusz = veusz.veusz_main:run',
             'veusz_listen = veusz.veusz_listen:run'
+            ],
+        'console_scripts' : [
+            'veusz_export_client = veusz.export_client:run'
             ]
         }
   
@@ -53,7 +56,8 @@ except ImportError:
     from distutils.command.install import install as orig_install
 
     extraoptions['requires'] = ['numpy']
-    extraoptions['scripts'] =  ['scripts/veusz', 'scripts/veusz_listen']
+    extraoptions['scripts'] =  ['scripts/veusz', 'scripts/veusz_listen',
+                               'scripts/veusz_export_client']
     
 from distutils.command.install_data import install_data
 import pyqtdistutils
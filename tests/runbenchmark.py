@@ -0,0 +1,513 @@
+#!/usr/bin/env python
+
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""A program to measure the speed of Veusz.
+
+This times the example and self test documents, plus synthetic
+documents containing large amounts of data (large xy plots, large
+images, many pages and big CSV and HDF5 imports). The import, load,
+draw and export phases are timed separately. For each phase the
+minimum time over the repeats is taken.
+
+The results are written as JSON (option --output). If a baseline
+results file is given (option --baseline) the results are compared
+against it, and the program exits with a return code of 1 if any
+phase is slower than the baseline by more than the threshold (0
+otherwise). The baseline can be written using --save-baseline.
+
+Like runselftest.py, this requires the veusz module to be on the
+PYTHONPATH and the DISPLAY to be set (or use Xvfb).
+"""
+
+# messes up loaded files if set
+# from __future__ import division
+from __future__ import print_function
+import datetime
+import glob
+import json
+import optparse
+import os
+import os.path
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as N
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+try:
+    from astropy.io import fits as pyfits
+except ImportError:
+    try:
+        import pyfits
+    except ImportError:
+        pyfits = None
+
+import veusz.qtall as qt4
+import veusz.utils as utils
+import veusz.document as document
+import veusz.setting as setting
+import veusz.dataimport
+
+# required to get structures initialised
+import veusz.windows.mainwindow
+
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+# phases timed for each document
+phases = ('import', 'load', 'draw', 'export')
+
+# documents not benchmarked
+excluded_docs = set([
+        # don't expect this to work
+        'mathml.vsz',
+    ])
+
+# dpi used for drawing and bitmap export
+benchdpi = 100
+
+class Case(object):
+    """A document to benchmark.
+
+    filename is the document to load. importfilename, if set, is a
+    document containing only the data import commands of the
+    document, which is used to time the import phase.
+    """
+    def __init__(self, name, filename, importfilename=None):
+        self.name = name
+        self.filename = filename
+        self.importfilename = importfilename
+
+def loadDoc(filename):
+    """Load a document, returning it."""
+    doc = document.Document()
+    mode = 'hdf5' if os.path.splitext(filename)[1] == '.vszh5' else 'vsz'
+    doc.load(filename, mode=mode)
+    return doc
+
+def drawDoc(doc):
+    """Draw each page of the document to an image."""
+    for page in range(doc.getNumberPages()):
+        size = doc.pageSize(page, dpi=(benchdpi, benchdpi))
+        helper = document.PaintHelper(doc, size, dpi=(benchdpi, benchdpi))
+        doc.paintTo(helper, page)
+
+        img = qt4.QImage(
+            max(size[0], 1), max(size[1], 1),
+            qt4.QImage.Format_ARGB32_Premultiplied)
+        img.fill(qt4.QColor(255, 255, 255).rgb())
+        painter = qt4.QPainter(img)
+        helper.renderToPainter(painter)
+        painter.end()
+
+def exportDoc(doc, outdir, formats):
+    """Export the document to each of the formats.
+    Multipage formats get every page, otherwise the first page."""
+    npages = doc.getNumberPages()
+    if npages == 0:
+        return
+    for fmt in formats:
+        filename = os.path.join(outdir, 'benchmark.%s' % fmt)
+        pages = list(range(npages)) if fmt in ('pdf', 'ps') else 0
+        e = document.Export(doc, filename, pages, bitmapdpi=benchdpi)
+        e.export()
+        os.unlink(filename)
+
+def timeCall(fn, repeats):
+    """Call fn repeats times, returning minimum time and last result."""
+    best = None
+    for i in range(repeats):
+        start = _clock()
+        retn = fn()
+        elapsed = _clock() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, retn
+
+def profilePhases():
+    """Sum profiler times over names for each profiler phase."""
+    out = {}
+    for name, phase, total, count, mean in utils.profiler.report():
+        out[phase] = out.get(phase, 0.) + total
+    return out
+
+def runCase(case, outdir, repeats=1, formats=('png',), profile=False):
+    """Benchmark a single case, returning a dict of results."""
+
+    res = {}
+    if case.importfilename:
+        res['import'] = timeCall(
+            lambda: loadDoc(case.importfilename), repeats)[0]
+
+    res['load'], doc = timeCall(lambda: loadDoc(case.filename), repeats)
+
+    utils.profiler.reset()
+    utils.profiler.enable(profile)
+    try:
+        res['draw'] = timeCall(lambda: drawDoc(doc), repeats)[0]
+    finally:
+        utils.profiler.enable(False)
+    if profile:
+        # these are summed over the repeats
+        res['profile'] = profilePhases()
+
+    if formats:
+        res['export'] = timeCall(
+            lambda: exportDoc(doc, outdir, formats), repeats)[0]
+
+    res['pages'] = doc.getNumberPages()
+    return res
+
+##############################################################################
+# Synthetic documents
+
+_graphcmds = '''
+Add('page', name='page1', autoadd=False)
+To('page1')
+Add('graph', name='graph1', autoadd=False)
+To('graph1')
+Add('axis', name='x', autoadd=False)
+Add('axis', name='y', autoadd=False)
+To('y')
+Set('direction', 'vertical')
+To('..')
+'''
+
+def writeDoc(outdir, name, importcmds, widgetcmds):
+    """Write a document and an import-only document.
+    Returns Case for document."""
+
+    filename = os.path.join(outdir, name + '.vsz')
+    with open(filename, 'w') as f:
+        f.write(importcmds + widgetcmds)
+    importfilename = None
+    if importcmds:
+        importfilename = os.path.join(outdir, name + '_import.vsz')
+        with open(importfilename, 'w') as f:
+            f.write(importcmds)
+    return Case(name, filename, importfilename)
+
+def _sizeName(size):
+    """Make a short string for a size, e.g. 1e6."""
+    exp = int(N.log10(size))
+    if size == 10**exp:
+        return '1e%i' % exp
+    return str(size)
+
+def genXY(outdir, npts):
+    """An xy plot with npts points, with markers and a line."""
+    name = 'synthetic_xy_%s' % _sizeName(npts)
+    x = N.linspace(0., 100., npts)
+    y = N.sin(x) + N.random.RandomState(1).normal(size=npts)
+    N.savez(os.path.join(outdir, name + '.npz'), x=x, y=y)
+
+    importcmds = ("ImportFilePlugin(u'Numpy NPZ import', u'%s.npz', "
+                  "linked=True)\n" % name)
+    widgetcmds = _graphcmds + '''
+Add('xy', name='xy1', autoadd=False)
+To('xy1')
+Set('xData', u'x')
+Set('yData', u'y')
+Set('markerSize', u'1pt')
+To('..')
+'''
+    return writeDoc(outdir, name, importcmds, widgetcmds)
+
+def genImage(outdir, npix):
+    """An image with npix pixels (square)."""
+    name = 'synthetic_image_%s' % _sizeName(npix)
+    dim = int(N.sqrt(npix))
+    y, x = N.indices((dim, dim))
+    img = N.sin(x*0.01) * N.cos(y*0.013)
+    N.savez(os.path.join(outdir, name + '.npz'), img=img)
+
+    importcmds = ("ImportFilePlugin(u'Numpy NPZ import', u'%s.npz', "
+                  "linked=True)\n" % name)
+    widgetcmds = _graphcmds + '''
+Add('image', name='image1', autoadd=False)
+To('image1')
+Set('data', u'img')
+Set('colorMap', u'heat')
+To('..')
+'''
+    return writeDoc(outdir, name, importcmds, widgetcmds)
+
+def genPages(outdir, npages):
+    """A document with npages pages, each containing a few plots."""
+    name = 'synthetic_pages_%i' % npages
+    cmds = []
+    for i in range(npages):
+        cmds.append('''
+Add('page', name='page%i', autoadd=False)
+To('page%i')
+Add('graph', name='graph1', autoadd=False)
+To('graph1')
+Add('axis', name='x', autoadd=False)
+Add('axis', name='y', autoadd=False)
+To('y')
+Set('direction', 'vertical')
+To('..')
+Add('function', name='function1', autoadd=False)
+To('function1')
+Set('function', u'sin(x*%i)')
+To('..')
+Add('label', name='label1', autoadd=False)
+To('label1')
+Set('label', u'Page %i: x^{2}_{i} \\\\alpha')
+To('..')
+To('..')
+To('..')
+''' % (i, i, i+1, i+1))
+    return writeDoc(outdir, name, '', ''.join(cmds))
+
+def genCSV(outdir, nrows):
+    """A CSV file with nrows rows and three columns, plotted."""
+    name = 'synthetic_csv_%s' % _sizeName(nrows)
+    rs = N.random.RandomState(2)
+    data = N.column_stack((
+        N.arange(nrows), rs.normal(size=nrows), rs.uniform(size=nrows)))
+    N.savetxt(os.path.join(outdir, name + '.csv'), data, delimiter=',',
+              header='a,b,c', comments='', fmt='%.9g')
+
+    importcmds = "ImportFileCSV(u'%s.csv', linked=True)\n" % name
+    widgetcmds = _graphcmds + '''
+Add('xy', name='xy1', autoadd=False)
+To('xy1')
+Set('xData', u'a')
+Set('yData', u'b')
+Set('marker', u'none')
+To('..')
+'''
+    return writeDoc(outdir, name, importcmds, widgetcmds)
+
+def genHDF5(outdir, nrows):
+    """A HDF5 file with nrows x and y values, plotted."""
+    name = 'synthetic_hdf5_%s' % _sizeName(nrows)
+    rs = N.random.RandomState(3)
+    with h5py.File(os.path.join(outdir, name + '.hdf5'), 'w') as f:
+        f['x'] = N.arange(nrows, dtype=N.float64)
+        f['y'] = N.cumsum(rs.normal(size=nrows))
+
+    importcmds = ("ImportFileHDF5(u'%s.hdf5', [u'/x', u'/y'], "
+                  "linked=True)\n" % name)
+    widgetcmds = _graphcmds + '''
+Add('xy', name='xy1', autoadd=False)
+To('xy1')
+Set('xData', u'x')
+Set('yData', u'y')
+Set('marker', u'none')
+To('..')
+'''
+    return writeDoc(outdir, name, importcmds, widgetcmds)
+
+# generator functions and sizes (number of values or pages) to generate
+generators = [
+    (genXY, (10**6, 10**7, 10**8)),
+    (genImage, (10**6, 10**7, 10**8)),
+    (genPages, (100, 1000)),
+    (genCSV, (10**5, 10**6, 10**7)),
+    (genHDF5, (10**6, 10**7, 10**8)),
+    ]
+
+def syntheticCases(outdir, maxsize):
+    """Generate synthetic documents with sizes up to maxsize."""
+    cases = []
+    for gen, sizes in generators:
+        if gen is genHDF5 and h5py is None:
+            continue
+        for size in sizes:
+            if size <= maxsize:
+                cases.append( gen(outdir, size) )
+    return cases
+
+def fileCases():
+    """Cases from example and self test documents."""
+    thisdir = os.path.dirname(__file__)
+    files = ( glob.glob(os.path.join(thisdir, '..', 'examples', '*.vsz')) +
+              glob.glob(os.path.join(thisdir, 'selftests', '*.vsz')) +
+              glob.glob(os.path.join(thisdir, 'selftests', '*.vszh5')) )
+
+    cases = []
+    for f in sorted(files):
+        base = os.path.basename(f)
+        if ( base in excluded_docs or
+             (base[:5] == 'hdf5_' and h5py is None) or
+             (base[:5] == 'fits_' and pyfits is None) or
+             (base[-6:] == '.vszh5' and h5py is None) ):
+            continue
+        cases.append( Case(base, f) )
+    return cases
+
+##############################################################################
+# Results
+
+def systemInfo():
+    """Information about system running the benchmark."""
+    return {
+        'veusz': utils.version(),
+        'python': platform.python_version(),
+        'qt': qt4.qVersion(),
+        'numpy': N.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'date': datetime.datetime.utcnow().isoformat(),
+        }
+
+def compareBaseline(results, baseline, threshold):
+    """Compare results with baseline results.
+
+    Prints differences and returns number of phases which are slower
+    than the baseline by more than the fraction threshold.
+    """
+
+    print()
+    print('Comparison with baseline (%s, veusz %s)' % (
+            baseline['info'].get('date'), baseline['info'].get('veusz')))
+    fmt = '%-40s %-8s %10s %10s %8s'
+    print(fmt % ('Name', 'Phase', 'Base (s)', 'New (s)', 'Ratio'))
+
+    regressions = 0
+    for name in sorted(results):
+        if name not in baseline['results']:
+            continue
+        newres = results[name]
+        oldres = baseline['results'][name]
+        for phase in phases:
+            if phase not in newres or phase not in oldres:
+                continue
+            ratio = newres[phase] / max(oldres[phase], 1e-9)
+            flag = ''
+            if ratio > 1+threshold:
+                flag = ' SLOWER'
+                regressions += 1
+            elif ratio < 1/(1+threshold):
+                flag = ' faster'
+            print(fmt % (name, phase, '%.4f' % oldres[phase],
+                         '%.4f' % newres[phase], '%.2f' % ratio) + flag)
+
+    print()
+    if regressions == 0:
+        print('No phases were slower than the baseline')
+    else:
+        print('%i phases were slower than the baseline' % regressions)
+    return regressions
+
+def runBenchmarks(cases, outdir, options):
+    """Run each case, returning a dict of results."""
+
+    formats = [f for f in options.formats.split(',') if f]
+    fmt = '%-40s' + ' %10s'*len(phases)
+    print(fmt % (('Name',) + phases))
+
+    results = {}
+    for case in cases:
+        try:
+            res = runCase(
+                case, outdir, repeats=options.repeat, formats=formats,
+                profile=options.profile)
+        except Exception as e:
+            print('%-40s FAILED: %s' % (case.name, e))
+            continue
+        results[case.name] = res
+        print(fmt % ((case.name,) + tuple(
+                    '%.4f' % res[p] if p in res else '-' for p in phases)))
+        sys.stdout.flush()
+
+    return results
+
+def main():
+    parser = optparse.OptionParser()
+    parser.add_option("", "--output", metavar="FILE",
+                      help="write results as JSON to FILE")
+    parser.add_option("", "--baseline", metavar="FILE",
+                      help="compare results against baseline JSON FILE")
+    parser.add_option("", "--save-baseline", metavar="FILE",
+                      help="write results as baseline to FILE")
+    parser.add_option("", "--threshold", type="float", default=0.25,
+                      help="fractional slow down counted as regression "
+                      "[default %default]")
+    parser.add_option("", "--repeat", type="int", default=3,
+                      help="number of repeats for each phase "
+                      "[default %default]")
+    parser.add_option("", "--formats", default="png,pdf,svg",
+                      help="comma separated list of export formats "
+                      "[default %default]")
+    parser.add_option("", "--max-size", type="float", default=1e7,
+                      help="maximum size of synthetic data (values or pages) "
+                      "[default %default]")
+    parser.add_option("", "--no-files", action="store_true",
+                      help="do not benchmark example and self test files")
+    parser.add_option("", "--no-synthetic", action="store_true",
+                      help="do not benchmark synthetic documents")
+    parser.add_option("", "--filter", metavar="REGEX",
+                      help="only benchmark names matching REGEX")
+    parser.add_option("", "--profile", action="store_true",
+                      help="include times for drawing subphases")
+
+    options, args = parser.parse_args()
+    if args:
+        parser.error("no arguments expected")
+
+    outdir = tempfile.mkdtemp(prefix='veusz-benchmark-')
+    try:
+        cases = []
+        if not options.no_files:
+            cases += fileCases()
+        if not options.no_synthetic:
+            cases += syntheticCases(outdir, options.max_size)
+        if options.filter:
+            regex = re.compile(options.filter)
+            cases = [c for c in cases if regex.search(c.name)]
+
+        results = runBenchmarks(cases, outdir, options)
+    finally:
+        shutil.rmtree(outdir)
+
+    output = {'info': systemInfo(), 'results': results}
+    for filename in (options.output, options.save_baseline):
+        if filename:
+            with open(filename, 'w') as f:
+                json.dump(output, f, indent=1, sort_keys=True)
+
+    regressions = 0
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        regressions = compareBaseline(results, baseline, options.threshold)
+    sys.exit(1 if regressions else 0)
+
+if __name__ == '__main__':
+    os.environ['LC_ALL'] = 'C'
+
+    app = qt4.QApplication([])
+
+    setting.transient_settings['unsafe_mode'] = True
+
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""Compare searches of the index of pickable points with checking
+every point.
+
+Points are put on a coarse lattice, so that many are equidistant
+from the cursor, to check that the first point is chosen when there
+are ties. This program requires the veusz module to be on the
+PYTHONPATH.
+"""
+
+from __future__ import division, print_function
+import unittest
+
+import numpy as N
+
+from veusz.widgets.pickable import _PointIndex
+
+def linearClosest(x, y, bounds, x0, y0, direction):
+    """Find the closest valid point by checking every point, returning
+    (index, distance) of the first of any equidistant points."""
+    with N.errstate(invalid='ignore'):
+        valid = ( N.isfinite(x) & N.isfinite(y) &
+                  (x >= bounds[0]) & (x <= bounds[2]) &
+                  (y >= bounds[1]) & (y <= bounds[3]) )
+    if not valid.any():
+        return None
+    if direction == 'vertical':
+        dist = N.abs(y - y0)
+    elif direction == 'horizontal':
+        dist = N.abs(x - x0)
+    else:
+        dist = N.sqrt((x - x0)**2 + (y - y0)**2)
+    dist = N.where(valid, dist, N.inf)
+    m = dist.min()
+    return N.flatnonzero(dist == m)[0], m
+
+class PointIndexTest(unittest.TestCase):
+    """Test _PointIndex against a linear search."""
+
+    directions = ('radial', 'horizontal', 'vertical')
+
+    def makePoints(self, rand, num, bounds, lattice):
+        """Make points on a lattice, with some invalid or outside
+        the bounds."""
+        x = rand.randint(-2, lattice+3, num) * (
+            (bounds[2]-bounds[0]) / lattice) + bounds[0]
+        y = rand.randint(-2, lattice+3, num) * (
+            (bounds[3]-bounds[1]) / lattice) + bounds[1]
+        x[rand.random_sample(num) < 0.05] = N.nan
+        y[rand.random_sample(num) < 0.05] = N.inf
+        return x, y
+
+    def checkQueries(self, rand, x, y, bounds, numqueries):
+        """Check searches at random positions inside and outside the
+        bounds, including on lattice points."""
+
+        index = _PointIndex(x, y, bounds)
+        w = bounds[2]-bounds[0]
+        h = bounds[3]-bounds[1]
+        for i in range(numqueries):
+            if i % 2 == 0:
+                # pick near an existing point to get many ties
+                j = rand.randint(len(x))
+                x0 = x[j] if N.isfinite(x[j]) else bounds[0]
+                y0 = y[j] if N.isfinite(y[j]) else bounds[1]
+                x0 += rand.randint(-1, 2) * w * 0.05
+                y0 += rand.randint(-1, 2) * h * 0.05
+            else:
+                x0 = bounds[0] + (rand.random_sample()*1.6-0.3)*w
+                y0 = bounds[1] + (rand.random_sample()*1.6-0.3)*h
+
+            for direction in self.directions:
+                # the first search of each direction is linear, the
+                # others use the grid or sorted points
+                res = index.closest(x0, y0, direction)
+                exp = linearClosest(x, y, bounds, x0, y0, direction)
+                if exp is None:
+                    self.assertIsNone(res)
+                else:
+                    self.assertEqual(
+                        (int(res[0]), float(res[1])),
+                        (int(exp[0]), float(exp[1])),
+                        msg='%s search at (%g, %g)' % (direction, x0, y0))
+
+        # check the grid and sorted points were used
+        if len(index.indices) > 0:
+            self.assertIsNotNone(index.grid)
+            self.assertEqual(set(index.sortorders), set(('x', 'y')))
+
+    def testRandom(self):
+        """Random points and searches."""
+        rand = N.random.RandomState(4321)
+        for trial in range(40):
+            bounds = (rand.uniform(-100, 100), rand.uniform(-100, 100))
+            bounds += ( bounds[0] + rand.uniform(1, 500),
+                        bounds[1] + rand.uniform(1, 500) )
+            num = rand.randint(1, 2000)
+            lattice = rand.randint(1, 60)
+            x, y = self.makePoints(rand, num, bounds, lattice)
+            self.checkQueries(rand, x, y, bounds, 50)
+
+    def testRingSearch(self):
+        """Sparse points, so that many rings of the grid are searched."""
+        rand = N.random.RandomState(1234)
+        bounds = (0., 0., 1000., 1000.)
+        num = 4000
+        x = N.full(num, N.nan)
+        y = N.full(num, N.nan)
+        # a few points in the corners, the rest invalid
+        x[:12] = rand.choice([0., 1., 999., 1000.], 12)
+        y[:12] = rand.choice([0., 1., 999., 1000.], 12)
+        rand.shuffle(x)
+        self.checkQueries(rand, x, y, bounds, 60)
+
+    def testTies(self):
+        """Points equidistant from the cursor return the first point."""
+        bounds = (0., 0., 10., 10.)
+        x = N.array([5., 7., 3., 5., 5., 7., 3.])
+        y = N.array([5., 5., 5., 7., 3., 5., 5.])
+        index = _PointIndex(x, y, bounds)
+        for direction in self.directions:
+            for i in range(2):
+                self.assertEqual(
+                    index.closest(6., 5., direction)[0],
+                    linearClosest(x, y, bounds, 6., 5., direction)[0])
+                self.assertEqual(
+                    index.closest(4., 5., direction)[0],
+                    linearClosest(x, y, bounds, 4., 5., direction)[0])
+
+    def testNoPoints(self):
+        """No valid points."""
+        bounds = (0., 0., 10., 10.)
+        x = N.array([N.nan, 20., 5.])
+        y = N.array([1., 5., -3.])
+        index = _PointIndex(x, y, bounds)
+        for direction in self.directions:
+            for i in range(2):
+                self.assertIsNone(index.closest(5., 5., direction))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,10 +18,48 @@
 
 # hooks to allow different datatypes to be imported
 
-from . import defn_standard, dialog_standard
-from . import defn_csv, dialog_csv
-from . import defn_twod, dialog_twod
-from . import defn_nd, dialog_nd
-from . import defn_hdf5, dialog_hdf5
-from . import dialog_fits, defn_fits
-from . import defn_plugin, dialog_plugin
+import importlib
+
+from .. import document
+
+# modules defining import commands, with the commands they register
+# these are only imported when one of their commands is first used
+defnmodules = (
+    ('defn_standard', ('ImportFile', 'ImportFiles', 'ImportString')),
+    ('defn_csv', ('ImportFileCSV', 'ImportFilesCSV')),
+    ('defn_twod', ('ImportFile2D', 'ImportString2D')),
+    ('defn_nd', ('ImportFileND', 'ImportStringND')),
+    ('defn_hdf5', ('ImportFileHDF5',)),
+    ('defn_fits', ('ImportFileFITS', 'ImportFITSFile')),
+    ('defn_plugin', ('ImportFilePlugin',)),
+)
+
+def _lazyCommand(modname, name):
+    """Make command which imports module modname, which replaces the
+    command with the real one, then calls it."""
+    def command(self, *args, **argsv):
+        importlib.import_module('.'+modname, __name__)
+        return getattr(self, name)(*args, **argsv)
+    command.__name__ = name
+    command.__doc__ = 'Import command %s (loaded on first use).' % name
+    return command
+
+for _modname, _names in defnmodules:
+    for _name in _names:
+        document.registerImportCommand(_name, _lazyCommand(_modname, _name))
+
+def loadImporters():
+    """Import the modules which define import commands."""
+    for modname, names in defnmodules:
+        importlib.import_module('.'+modname, __name__)
+
+# modules providing import dialog tabs, in the order of the tabs
+# these are only imported when the import dialog is first opened
+dialogmodules = (
+    'dialog_standard', 'dialog_csv', 'dialog_twod', 'dialog_nd',
+    'dialog_hdf5', 'dialog_fits', 'dialog_plugin')
+
+def loadDialogs():
+    """Import the modules which register import dialog tabs."""
+    for name in dialogmodules:
+        importlib.import_module('.'+name, __name__)
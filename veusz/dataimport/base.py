@@ -21,9 +21,20 @@
 from __future__ import division, print_function
 import sys
 import copy
+import multiprocessing
+import multiprocessing.pool
+import pickle
 
-from ..compat import citems, cstr
+import numpy as N
+
+from ..compat import citems, cstr, czip
+from .. import qtall as qt4
+from .. import datasets
 from .. import utils
+from . import importcache
+
+def _(text, disambiguation=None, context="Import"):
+    return qt4.QCoreApplication.translate(context, text, disambiguation)
 
 class ImportingError(RuntimeError):
     """Common error when import fails."""
@@ -254,8 +265,21 @@ class OperationDataImportBase(object):
 
             doceval.update()
 
-    def do(self, document):
-        """Do import."""
+    def readImport(self):
+        """Read the data without changing the document, setting
+        outdatasets, outinvalids and outcustoms."""
+
+        if self.readCached():
+            retn = None
+        else:
+            retn = self.doImport()
+        self.finishRead()
+        return retn
+
+    def readCached(self):
+        """Start reading, by resetting the outputs and setting them from
+        the import cache if possible. Returns True if set from the cache,
+        otherwise doImport should be called."""
 
         # list of returned dataset names
         self.outnames = []
@@ -266,15 +290,22 @@ class OperationDataImportBase(object):
         # invalid conversions
         self.outinvalids = {}
 
-        # remember datasets in document for undo
-        self.oldcustoms = None
+        self.storekey = None
+        if importcache.enabled():
+            cachekey = importcache.entryKey(self)
+            if cachekey is not None:
+                if importcache.load(cachekey, self):
+                    return True
+                self.storekey = cachekey
+        return False
 
-        # do actual import
-        retn = self.doImport()
+    def finishRead(self):
+        """Finish reading after readCached and doImport, storing the
+        outputs in the import cache and handling tagging and renaming."""
 
-        # these are custom values returned from the plugin
-        if self.outcustoms:
-            self.addCustoms(document, self.outcustoms)
+        if self.storekey is not None:
+            importcache.store(self.storekey, self)
+            self.storekey = None
 
         # handle tagging/renaming
         for name, ds in list(citems(self.outdatasets)):
@@ -284,9 +315,15 @@ class OperationDataImportBase(object):
                 del self.outdatasets[name]
                 self.outdatasets[self.params.renames[name]] = ds
 
-        # only remember the parts we need
-        self.olddatasets = [ (n, document.data.get(n))
-                             for n in self.outdatasets ]
+    def applyImport(self, document):
+        """Put the datasets and customs read into the document."""
+
+        # remember datasets in document for undo
+        self.oldcustoms = None
+
+        # these are custom values returned from the plugin
+        if self.outcustoms:
+            self.addCustoms(document, self.outcustoms)
 
         self.olddatasets = []
         for name, ds in citems(self.outdatasets):
@@ -295,6 +332,10 @@ class OperationDataImportBase(object):
 
         self.outnames = sorted(self.outdatasets)
 
+    def do(self, document):
+        """Do import."""
+        retn = self.readImport()
+        self.applyImport(document)
         return retn
 
     def undo(self, document):
@@ -315,3 +356,156 @@ class OperationDataImportBase(object):
             doceval.def_colors = self.oldcustoms[2]
             doceval.def_colormaps = self.oldcustoms[3]
             doceval.update()
+
+# processes for reading files in parallel, made when first needed
+# (False if they cannot be used)
+_readpool = None
+
+def _readPool():
+    """Get pool of worker processes for reading files, or None if
+    processes cannot be used.
+
+    The workers are started fresh (spawned) rather than forked, as
+    forking a process with running Qt threads is unsafe.
+    """
+    global _readpool
+    if _readpool is None:
+        _readpool = False
+        if hasattr(multiprocessing, 'get_context'):
+            context = multiprocessing.get_context('spawn')
+        elif sys.platform == 'win32':
+            # only method available
+            context = multiprocessing
+        else:
+            context = None
+        # frozen programs cannot start workers on all platforms
+        if context is not None and not getattr(sys, 'frozen', False):
+            try:
+                numprocs = max(multiprocessing.cpu_count(), 2)
+            except NotImplementedError:
+                numprocs = 2
+            try:
+                _readpool = context.Pool(numprocs)
+            except EnvironmentError:
+                pass
+    return _readpool or None
+
+def _doImportWorker(op):
+    """Read data for import operation in worker process."""
+    op.doImport()
+    return (op.outdatasets, op.outinvalids, op.outcustoms)
+
+def _canPickle(op):
+    """Can operation be sent to a worker process?"""
+    try:
+        pickle.dumps(op, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # e.g. plugins defined in scripts run by Veusz
+        return False
+    return True
+
+def readImports(operations):
+    """Call readImport for each of the import operations.
+
+    If there is more than one file to read, they are parsed in
+    parallel in worker processes. Operations which cannot be sent to
+    workers are read in this process while the workers run. The import
+    cache is only used from this process.
+    """
+
+    toread = [op for op in operations if not op.readCached()]
+
+    pool = _readPool() if len(toread) > 1 else None
+    remote = []
+    if pool is not None:
+        remote = [op for op in toread if _canPickle(op)]
+    results = [pool.apply_async(_doImportWorker, (op,)) for op in remote]
+
+    remoteids = set([id(op) for op in remote])
+    for op in toread:
+        if id(op) not in remoteids:
+            op.doImport()
+
+    for op, result in czip(remote, results):
+        try:
+            op.outdatasets, op.outinvalids, op.outcustoms = result.get()
+        except multiprocessing.pool.MaybeEncodingError:
+            # datasets read cannot be sent back
+            op.doImport()
+
+    for op in operations:
+        op.finishRead()
+
+def concatenateDatasets(dslist):
+    """Join a list of datasets of the same type into one dataset.
+
+    The result is not linked to a file."""
+
+    dstype = type(dslist[0])
+    if any( (type(ds) is not dstype for ds in dslist) ):
+        raise ImportingError(
+            _("Cannot concatenate datasets of different types"))
+
+    if dstype is datasets.Dataset:
+        # error bars are kept if all the datasets have them
+        cols = {}
+        for col in dstype.columns:
+            vals = [getattr(ds, col) for ds in dslist]
+            if all( (v is not None for v in vals) ):
+                cols[col] = N.concatenate(vals)
+        return datasets.Dataset(**cols)
+    elif dstype is datasets.DatasetDateTime:
+        return datasets.DatasetDateTime(
+            data=N.concatenate([ds.data for ds in dslist]))
+    elif dstype is datasets.DatasetText:
+        data = []
+        for ds in dslist:
+            data += list(ds.data)
+        return datasets.DatasetText(data=data)
+    else:
+        raise ImportingError(
+            _("Cannot concatenate datasets of type %s") % dstype.__name__)
+
+class OperationDataImportMultiple(OperationDataImportBase):
+    """Import several files as a single operation.
+
+    The files are read in parallel. If concatenate is set, datasets
+    with the same name in different files are joined into single
+    datasets, otherwise datasets from later files replace those with
+    the same names from earlier files.
+    """
+
+    descr = _('import files')
+
+    def __init__(self, operations, concatenate=False):
+        # each operation has its own parameters
+        OperationDataImportBase.__init__(self, ImportParamsBase())
+        self.operations = operations
+        self.concatenate = concatenate
+
+    def readImport(self):
+        """Read the files and combine the results."""
+
+        readImports(self.operations)
+
+        self.outnames = []
+        self.outdatasets = {}
+        self.outinvalids = {}
+        self.outcustoms = []
+
+        tojoin = {}
+        for op in self.operations:
+            self.outcustoms += op.outcustoms
+            for name, num in citems(op.outinvalids):
+                self.outinvalids[name] = self.outinvalids.get(name, 0) + num
+            for name, ds in sorted(citems(op.outdatasets)):
+                if self.concatenate:
+                    tojoin.setdefault(name, []).append(ds)
+                else:
+                    self.outdatasets[name] = ds
+
+        for name, dslist in citems(tojoin):
+            if len(dslist) == 1:
+                self.outdatasets[name] = dslist[0]
+            else:
+                self.outdatasets[name] = concatenateDatasets(dslist)
@@ -101,6 +101,38 @@ class LinkedFileCSV(base.LinkedFileBase):
             renameparams={'prefix': 'dsprefix', 'suffix': 'dssuffix'},
             relpath=relpath)
 
+def _paramsCSV(filename,
+               readrows=False,
+               delimiter=',', skipwhitespace=False, textdelimiter='"',
+               encoding='utf_8',
+               headerignore=0, rowsignore=0,
+               blanksaredata=False,
+               numericlocale='en_US',
+               dateformat='YYYY-MM-DD|T|hh:mm:ss',
+               headermode='multi',
+               dsprefix='', dssuffix='', prefix=None,
+               renames=None,
+               linked=False):
+    """Make CSV import parameters from command arguments."""
+
+    # backward compatibility
+    if prefix:
+        dsprefix = prefix + '_'
+
+    return ImportParamsCSV(
+        filename=filename, readrows=readrows,
+        delimiter=delimiter, skipwhitespace=skipwhitespace, 
+        textdelimiter=textdelimiter,
+        encoding=encoding,
+        headerignore=headerignore, rowsignore=rowsignore,
+        blanksaredata=blanksaredata,
+        numericlocale=numericlocale, dateformat=dateformat,
+        headermode=headermode,
+        prefix=dsprefix, suffix=dssuffix,
+        renames=renames,
+        linked=linked,
+        )
+
 def ImportFileCSV(comm, filename,
                   readrows=False,
                   delimiter=',', skipwhitespace=False, textdelimiter='"',
@@ -143,26 +175,21 @@ def ImportFileCSV(comm, filename,
     Returns: list of imported datasets
     """
 
-    # backward compatibility
-    if prefix:
-        dsprefix = prefix + '_'
-
     # lookup filename
     realfilename = comm.findFileOnImportPath(filename)
 
-    params = ImportParamsCSV(
-        filename=realfilename, readrows=readrows,
-        delimiter=delimiter, skipwhitespace=skipwhitespace, 
+    params = _paramsCSV(
+        realfilename, readrows=readrows,
+        delimiter=delimiter, skipwhitespace=skipwhitespace,
         textdelimiter=textdelimiter,
         encoding=encoding,
         headerignore=headerignore, rowsignore=rowsignore,
         blanksaredata=blanksaredata,
         numericlocale=numericlocale, dateformat=dateformat,
         headermode=headermode,
-        prefix=dsprefix, suffix=dssuffix,
+        dsprefix=dsprefix, dssuffix=dssuffix, prefix=prefix,
         renames=renames,
-        linked=linked,
-        )
+        linked=linked)
     op = OperationDataImportCSV(params)
     comm.document.applyOperation(op)
 
@@ -170,4 +197,35 @@ def ImportFileCSV(comm, filename,
         print("Imported datasets %s" % ' '.join(op.outnames))
     return op.outnames
 
+def ImportFilesCSV(comm, filenames, concatenate=False, **args):
+    """Read data from several CSV files in one operation.
+
+    filenames is a filename or wildcard, or a list of these. The
+    files are read in parallel.
+
+    If concatenate is True, datasets with the same name in different
+    files are joined into one dataset (which is not linked to the
+    files). Otherwise datasets from later files replace those with
+    the same name from earlier files.
+
+    Other arguments are the same as for ImportFileCSV.
+
+    Returns: list of imported datasets
+    """
+
+    realfilenames = comm.findFilesOnImportPath(filenames)
+    if not realfilenames:
+        raise base.ImportingError(_('No files found to import'))
+
+    op = base.OperationDataImportMultiple(
+        [ OperationDataImportCSV(_paramsCSV(fname, **args))
+          for fname in realfilenames ],
+        concatenate=concatenate)
+    comm.document.applyOperation(op)
+
+    if comm.verbose:
+        print("Imported datasets %s" % ' '.join(op.outnames))
+    return op.outnames
+
 document.registerImportCommand('ImportFileCSV', ImportFileCSV)
+document.registerImportCommand('ImportFilesCSV', ImportFilesCSV)
@@ -193,6 +193,10 @@ class OperationDataImportFITS(base.OperationDataImportBase):
     def readTableColumn(self, hdu, dsname, dsread):
         """Read a specific column from a FITS file."""
 
+        if fits_hdf5_helpers.hduIsEmpty(hdu):
+            # table has no rows
+            return
+
         # dsname is /hduname/colname
         colname = dsname.split('/')[-1].strip().lower()
 
@@ -207,7 +211,7 @@ class OperationDataImportFITS(base.OperationDataImportBase):
     def walkHdu(self, hdu, dsname, dsread):
         """Import everything from a table HDU."""
 
-        if hdu.data is None:
+        if fits_hdf5_helpers.hduIsEmpty(hdu):
             # ignore empty HDU
             pass
         elif hdu.is_image:
@@ -215,7 +219,7 @@ class OperationDataImportFITS(base.OperationDataImportBase):
             self.readHduImage(hdu, dsname, dsread)
         else:
             # Table HDU
-            for col in hdu.data.columns:
+            for col in hdu.columns:
                 self.readTableColumn(
                     hdu, '%s/%s' % (dsname, col.name.lower()), dsread)
 
@@ -229,7 +233,10 @@ class OperationDataImportFITS(base.OperationDataImportBase):
         """Read data from fits file and return a dict of names to data."""
 
         dsread = {}
-        with fits.open(self.params.filename, 'readonly') as fitsf:
+        # memory mapping means only the columns and slices requested
+        # are read from the file
+        with fits.open(self.params.filename, 'readonly',
+                       memmap=True) as fitsf:
             hdunames = fits_hdf5_helpers.getFITSHduNames(fitsf)
 
             for item in self.params.items:
@@ -23,7 +23,7 @@ import re
 
 import numpy as N
 from .. import qtall as qt4
-from ..compat import citems, cvalues, cbytes, cunicode, cpy3
+from ..compat import citems, cvalues, cbytes, cunicode, cpy3, crange
 from .. import document
 from .. import datasets
 from .. import utils
@@ -121,18 +121,23 @@ class OperationDataImportHDF5(base.OperationDataImportBase):
 
     descr = _("import HDF5 file")
 
-    def readDataset(self, dataset, dsattrs, dsname, dsread):
+    # maximum number of bytes of compound datasets to read at once
+    compoundchunkbytes = 64*1024*1024
+
+    def readDataset(self, dataset, dsattrs, dsname, dsread, refnode=None):
         """Given hdf5 dataset, its attributes and name, get data and
         set it in dict dsread.
 
         dsread maps names to _DataRead object
+        refnode is the node used to dereference attributes (if not dataset)
         """
 
         # store options associated with dataset
         options = {}
         for a in dsattrs:
             if a[:4] == "vsz_":
-                options[a] = auto_deref_attr(a, dsattrs, dataset)
+                options[a] = auto_deref_attr(
+                    a, dsattrs, dataset if refnode is None else refnode)
 
         # find name for dataset
         if (self.params.namemap is not None and
@@ -168,6 +173,45 @@ class OperationDataImportHDF5(base.OperationDataImportBase):
         except fits_hdf5_helpers.ConvertError:
             pass
 
+    def readCompoundColumns(self, item, names):
+        """Read the columns in names from compound dataset item.
+
+        The table is read in chunks of rows, splitting each chunk into
+        the columns, so that the file is only read once.
+        Returns dict of names to arrays.
+        """
+
+        if item.ndim == 0:
+            data = item[()]
+            return dict( (name, data[name]) for name in names )
+
+        nrows = item.shape[0]
+        allnames = len(set(names)) == len(item.dtype.names)
+        # only read the fields requested, unless all are requested
+        fieldargs = () if allnames else tuple(names)
+
+        rowbytes = max(item.dtype.itemsize * (item.size // max(nrows, 1)), 1)
+        chunkrows = max(self.compoundchunkbytes // rowbytes, 1)
+
+        columns = {}
+        for start in crange(0, nrows, chunkrows):
+            stop = min(start+chunkrows, nrows)
+            chunk = item[(slice(start, stop),) + fieldargs]
+            for name in names:
+                # h5py returns a plain array if reading a single field
+                coldata = chunk if chunk.dtype.names is None else chunk[name]
+                if name not in columns:
+                    columns[name] = N.empty(
+                        (nrows,)+coldata.shape[1:], dtype=coldata.dtype)
+                columns[name][start:stop] = coldata
+
+        if nrows == 0:
+            # get correctly typed empty columns
+            chunk = item[()]
+            for name in names:
+                columns[name] = chunk[name]
+        return columns
+
     def walkFile(self, item, dsread, names=None):
         """Walk an hdf file, adding datasets to dsread.
 
@@ -182,14 +226,15 @@ class OperationDataImportHDF5(base.OperationDataImportBase):
                 return
 
             if dtype.kind == 'V':
-                # compound dataset - walk columns
+                # compound dataset - read columns together
                 if not names:
-                    names = item.dtype.names 
+                    names = item.dtype.names
 
+                columns = self.readCompoundColumns(item, names)
                 for name in names:
                     attrs = fits_hdf5_helpers.filterAttrsByName(item.attrs, name)
-                    self.readDataset(item[name], attrs, item.name+"/"+name,
-                                     dsread)
+                    self.readDataset(columns[name], attrs, item.name+"/"+name,
+                                     dsread, refnode=item)
             else:
                 self.readDataset(item, item.attrs, item.name, dsread)
 
@@ -155,6 +155,52 @@ def ImportFile(comm, filename, descriptor, useblocks=False, linked=False,
 
     return (op.outnames, op.outinvalids)
 
+def ImportFiles(comm, filenames, descriptor, concatenate=False,
+                useblocks=False, linked=False,
+                prefix='', suffix='', ignoretext=False, encoding='utf_8',
+                renames=None):
+    """Read data from several files using descriptor, in one operation.
+
+    filenames is a filename or wildcard, or a list of these. The
+    files are read in parallel.
+
+    If concatenate is True, datasets with the same name in different
+    files are joined into one dataset (which is not linked to the
+    files). Otherwise datasets from later files replace those with
+    the same name from earlier files.
+
+    Other arguments are the same as for ImportFile.
+
+    Returned is a tuple (datasets, errors)
+     where datasets is a list of datasets read
+     errors is a dict of the datasets with the number of errors while
+     converting the data
+    """
+
+    realfilenames = comm.findFilesOnImportPath(filenames)
+    if not realfilenames:
+        raise base.ImportingError(_('No files found to import'))
+
+    ops = []
+    for fname in realfilenames:
+        params = ImportParamsSimple(
+            descriptor=descriptor, filename=fname,
+            useblocks=useblocks, linked=linked,
+            prefix=prefix, suffix=suffix,
+            ignoretext=ignoretext,
+            encoding=encoding,
+            renames=renames)
+        ops.append(OperationDataImport(params))
+    op = base.OperationDataImportMultiple(ops, concatenate=concatenate)
+    comm.document.applyOperation(op)
+
+    if comm.verbose:
+        print("Imported datasets %s" % ' '.join(op.outnames))
+        for name, num in citems(op.outinvalids):
+            print("%i errors encountered reading dataset %s" % (num, name))
+
+    return (op.outnames, op.outinvalids)
+
 def ImportString(comm, descriptor, dstring, useblocks=False):
     """Read data from the string using a descriptor.
 
@@ -183,4 +229,5 @@ def ImportString(comm, descriptor, dstring, useblocks=False):
     return (op.outnames, op.outinvalids)
 
 document.registerImportCommand('ImportFile', ImportFile)
+document.registerImportCommand('ImportFiles', ImportFiles)
 document.registerImportCommand('ImportString', ImportString)
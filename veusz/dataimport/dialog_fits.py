@@ -48,7 +48,8 @@ def loadFITSModule():
 def makeimagenode(parent, hdu, idx, name, dispname, datanodes):
     """Node for image-like HDUs."""
 
-    if hdu.data is None:
+    # use header to avoid reading data
+    if fits_hdf5_helpers.hduIsEmpty(hdu):
         return fits_hdf5_tree.EmptyDataNode(parent, name, dispname)
 
     attrs, colattrs = fits_hdf5_helpers.hduVeuszAttrs(hdu)
@@ -88,7 +89,7 @@ def constructTree(fitsfile):
 
         elif hasattr(hdu, 'columns'):
             # parent for table
-            tabshape = hdu.data.shape
+            tabshape = fits_hdf5_helpers.hduTableShape(hdu)
             childnode = fits_hdf5_tree.FileCompoundNode(
                 root, '/%s' % hduname, dispname, tabshape)
             root.children.append(childnode)
@@ -157,7 +158,7 @@ class ImportTabFITS(importdialog.ImportTab):
             # check can be opened first
             with open(filename, "r") as f:
                 pass
-            with fits.open(filename, "readonly") as f:
+            with fits.open(filename, "readonly", memmap=True) as f:
                 self.rootnode, self.datanodes = constructTree(f)
         except IOError:
             self.showError(_("Cannot open file"))
@@ -23,6 +23,7 @@ import re
 import numpy as N
 
 from .. import qtall as qt
+from ..compat import crange
 
 def _(text, disambiguation=None, context="Import_FITS_HDF5"):
     return qt.QCoreApplication.translate(context, text, disambiguation)
@@ -134,6 +135,45 @@ def applySlices(data, slices):
         data = N.array([], dtype=N.float64)
     return data
 
+# maximum number of bytes of output to convert in one step
+convertchunkbytes = 16*1024*1024
+
+def convertToFloat64(data):
+    """Convert numpy/hdf dataset to a native float64 numpy array.
+
+    The conversion is done in chunks along the first axis, so that
+    reading file-backed data (e.g. HDF5 datasets or memory mapped FITS
+    files), or changing byte order, does not need a temporary copy of
+    all the data.
+    """
+
+    shape = data.shape
+    if len(shape) == 0 or shape[0] == 0:
+        return N.array(data, dtype=N.float64)
+
+    out = N.empty(shape, dtype=N.float64)
+    rowbytes = max(out.itemsize * (out.size // shape[0]), 1)
+    step = max(convertchunkbytes // rowbytes, 1)
+    for i in crange(0, shape[0], step):
+        out[i:i+step] = data[i:i+step]
+    return out
+
+def hduIsEmpty(hdu):
+    """Does HDU contain no data (no axes, or an axis of zero length)?
+    This uses the header to avoid reading the data."""
+    header = hdu.header
+    naxis = header.get('NAXIS', 0)
+    if naxis == 0:
+        return True
+    for i in crange(1, naxis+1):
+        if header.get('NAXIS%i' % i, 0) == 0:
+            return True
+    return False
+
+def hduTableShape(hdu):
+    """Get the shape of a table HDU from its header."""
+    return (hdu.header.get('NAXIS2', 0),)
+
 class ConvertError(RuntimeError):
     pass
 
@@ -158,7 +198,7 @@ def convertDatasetToObject(data, slices):
         raise ConvertError(_("Could not get data type of dataset"))
 
     if kind in ('b', 'i', 'u', 'f'):
-        data = N.array(data, dtype=N.float64)
+        data = convertToFloat64(data)
         if data.ndim == 0:
             raise ConvertError(_("Dataset has no dimensions"))
         return data
@@ -0,0 +1,294 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""Cache of datasets imported from linked files.
+
+When enabled, the datasets read by an import of a linked file are
+written to a cache directory. Later imports of the same file, with the
+same parameters and Veusz version, read the datasets from the cache
+rather than parsing the file again.
+
+Each entry has a script file, containing commands to set the
+datasets, and a binary sidecar file (see document.datasidecar)
+containing the values of numerical datasets. Entries are named by a
+hash of the file path, size, modification time, contents, import
+parameters and Veusz version.
+"""
+
+from __future__ import division, print_function
+import os
+import os.path
+import sys
+import hashlib
+import io
+
+from ..compat import citems, crepr, cstr, CStringIO
+from .. import qtall as qt4
+from .. import datasets
+from .. import setting
+from .. import utils
+from ..document import datasidecar
+
+def _(text, disambiguation=None, context="ImportCache"):
+    """Translate text."""
+    return qt4.QCoreApplication.translate(context, text, disambiguation)
+
+# extensions of script and data files of entries
+scriptext = '.vszcache'
+dataext = '.vszdata'
+
+# dataset types which can be stored in the cache
+_cachedtypes = (
+    datasets.Dataset, datasets.DatasetDateTime, datasets.DatasetText,
+    datasets.Dataset2D, datasets.DatasetND)
+
+def enabled():
+    """Is the import cache enabled?"""
+    return setting.settingdb['importcache_enable']
+
+def cacheDirectory():
+    """Get directory to store cache entries."""
+    dirname = setting.settingdb['importcache_dir']
+    if not dirname:
+        if sys.platform == 'win32':
+            base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+            dirname = os.path.join(base, 'Veusz', 'importcache')
+        else:
+            base = os.environ.get(
+                'XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+            dirname = os.path.join(base, 'veusz', 'importcache')
+    return dirname
+
+def _fileHash(filename):
+    """Return hash of contents of file."""
+    h = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        while True:
+            buf = f.read(1 << 20)
+            if not buf:
+                break
+            h.update(buf)
+    return h.hexdigest()
+
+def entryKey(op):
+    """Return key for cache entry of import operation, or None if the
+    import cannot be cached."""
+
+    params = op.params
+    if not params.linked or not params.filename:
+        return None
+    try:
+        filename = os.path.abspath(params.filename)
+        st = os.stat(filename)
+        contenthash = _fileHash(filename)
+    except EnvironmentError:
+        # let the import report the error
+        return None
+
+    pars = sorted( [ (k, getattr(params, k)) for k in
+                     list(params.defaults) + params._extras ] )
+    parts = (
+        utils.version(), op.__class__.__module__, op.__class__.__name__,
+        filename, st.st_size, st.st_mtime, contenthash, pars)
+    return hashlib.sha1(crepr(parts).encode('utf-8')).hexdigest()
+
+def load(key, op):
+    """Set outputs of import operation from cache entry with key.
+    Returns True if successful."""
+
+    dirname = cacheDirectory()
+    scriptfilename = os.path.join(dirname, key + scriptext)
+    try:
+        with io.open(scriptfilename, 'r', encoding='utf-8') as f:
+            script = f.read()
+    except EnvironmentError:
+        return False
+
+    # the script only uses these commands, which are implemented here
+    # rather than by a document, so that no QObjects are made
+    info = {}
+    read = {}
+    def CacheInfo(**args):
+        info.update(args)
+    def SetDataBinary(name, filename, datatype, **parts):
+        read[name] = datasidecar.readSidecarDataset(
+            os.path.join(dirname, filename), datatype, parts)
+    def SetDataText(name, val):
+        read[name] = datasets.DatasetText(val)
+    env = {'CacheInfo': CacheInfo, 'SetDataBinary': SetDataBinary,
+           'SetDataText': SetDataText}
+
+    try:
+        compiled = utils.compileChecked(
+            script, mode='exec', filename=scriptfilename)
+        exec(compiled, env)
+
+        linked = None
+        if info['linkedclass']:
+            modname, clsname = info['linkedclass']
+            linked = getattr(sys.modules[modname], clsname)(op.params)
+        outdatasets = {}
+        for name in info['names']:
+            ds = read[name]
+            if name in info['linkednames']:
+                ds.linked = linked
+            outdatasets[name] = ds
+    except Exception as e:
+        # broken or old entry
+        print(_("Removing invalid import cache entry %s: %s") % (
+            key, cstr(e)), file=sys.stderr)
+        removeEntry(dirname, key)
+        return False
+
+    op.outdatasets = outdatasets
+    op.outinvalids = info['invalids']
+    op.outcustoms = info['customs']
+
+    # mark entry as recently used
+    try:
+        os.utime(scriptfilename, None)
+    except EnvironmentError:
+        pass
+    return True
+
+def store(key, op):
+    """Write outputs of import operation to cache entry with key."""
+
+    linkedclass = None
+    linkednames = []
+    for name, ds in citems(op.outdatasets):
+        if type(ds) not in _cachedtypes:
+            # cannot store this type of dataset
+            return
+        if ds.linked is not None:
+            cls = ds.linked.__class__
+            linkedclass = (cls.__module__, cls.__name__)
+            linkednames.append(name)
+
+    dirname = cacheDirectory()
+    try:
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        scriptfilename = os.path.join(dirname, key + scriptext)
+        sidecar = datasidecar.SidecarWriter(
+            os.path.join(dirname, key + dataext))
+        try:
+            script = CStringIO()
+            script.write('CacheInfo(names=%s, linkednames=%s, '
+                         'linkedclass=%s, invalids=%s, customs=%s)\n' % (
+                crepr(sorted(op.outdatasets)), crepr(sorted(linkednames)),
+                crepr(linkedclass), crepr(op.outinvalids),
+                crepr(op.outcustoms)))
+            for name, ds in sorted(citems(op.outdatasets)):
+                ds.saveDataDumpToBinary(script, name, sidecar)
+        except Exception:
+            sidecar.abort()
+            raise
+        sidecar.close()
+
+        tempfilename = scriptfilename + '.temp'
+        with io.open(tempfilename, 'w', encoding='utf-8') as f:
+            f.write(cstr(script.getvalue()))
+        try:
+            os.rename(tempfilename, scriptfilename)
+        except OSError:
+            # windows cannot rename over existing files
+            os.remove(scriptfilename)
+            os.rename(tempfilename, scriptfilename)
+
+    except EnvironmentError as e:
+        print(_("Could not write import cache entry: %s") % cstr(e),
+              file=sys.stderr)
+        return
+
+    evict(dirname, setting.settingdb['importcache_maxsize']*1024*1024)
+
+def _splitName(fname):
+    """Split cache filename into (key, ext), or return None if not a
+    cache file.
+
+    Sidecar files which could not be overwritten are written as
+    key.vszdata.N, so these are included with the data files.
+    """
+    key, ext = os.path.splitext(fname)
+    if ext in (scriptext, dataext):
+        return key, ext
+    key2, ext2 = os.path.splitext(key)
+    if ext2 == dataext and ext[1:].isdigit():
+        return key2, dataext
+    return None
+
+def removeEntry(dirname, key):
+    """Remove files of cache entry."""
+    try:
+        filenames = os.listdir(dirname)
+    except EnvironmentError:
+        return
+    for fname in filenames:
+        split = _splitName(fname)
+        if split is None or split[0] != key:
+            continue
+        try:
+            os.unlink(os.path.join(dirname, fname))
+        except EnvironmentError:
+            pass
+
+def _entries(dirname):
+    """Get list of (last used time, total size, key) for entries."""
+    sizes = {}
+    times = {}
+    try:
+        filenames = os.listdir(dirname)
+    except EnvironmentError:
+        return []
+    for fname in filenames:
+        split = _splitName(fname)
+        if split is None:
+            continue
+        key, ext = split
+        try:
+            st = os.stat(os.path.join(dirname, fname))
+        except EnvironmentError:
+            continue
+        sizes[key] = sizes.get(key, 0) + st.st_size
+        if ext == scriptext:
+            times[key] = st.st_mtime
+    # data files without scripts are treated as oldest
+    return [ (times.get(key, 0), size, key) for key, size in citems(sizes) ]
+
+def evict(dirname, maxsize):
+    """Remove least recently used entries until cache is below maxsize
+    bytes."""
+    entries = sorted(_entries(dirname))
+    total = sum([e[1] for e in entries])
+    for mtime, size, key in entries:
+        if total <= maxsize:
+            break
+        removeEntry(dirname, key)
+        total -= size
+
+def cacheSize():
+    """Return total size of cache in bytes."""
+    return sum([e[1] for e in _entries(cacheDirectory())])
+
+def clear():
+    """Remove all entries in the cache."""
+    dirname = cacheDirectory()
+    for mtime, size, key in _entries(dirname):
+        removeEntry(dirname, key)
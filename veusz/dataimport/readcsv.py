@@ -23,7 +23,7 @@ from __future__ import division
 import re
 import numpy as N
 
-from ..compat import crange, cnext, CIterator
+from ..compat import crange, cnext, cbasestr, CIterator
 from .. import datasets
 from .. import utils
 from .. import qtall as qt4
@@ -98,6 +98,9 @@ typecodes = (
     ('(number)', 'float'),
     )
 
+# date format which can be converted in bulk
+isodateformat = 'YYYY-MM-DD|T|hh:mm:ss'
+
 class _NextValue(Exception):
     """A class to be raised to move to next value."""
 
@@ -297,8 +300,11 @@ class ReadCSV(object):
                 if not ok:
                     raise ValueError
             elif ctype == 'date':
+                # strings are converted to dates in bulk in setData
                 m = self.datere.match(col)
-                v = utils.dateREMatchToDate(m)
+                if m is None or m.lastindex is None:
+                    raise ValueError
+                v = col
             elif ctype == 'string':
                 v = col
             else:
@@ -311,6 +317,23 @@ class ReadCSV(object):
             # conversion succeeded - append number to data
             self.data[self.colnames[colnum]].append(v)
 
+    def _convertDates(self, vals):
+        """Convert list of date strings (or NaN values) to date values."""
+
+        def convert(v):
+            if isinstance(v, cbasestr):
+                try:
+                    return utils.dateREMatchToDate(self.datere.match(v))
+                except ValueError:
+                    return N.nan
+            return v
+
+        if self.params.dateformat == isodateformat:
+            # ISO dates can be converted much faster by numpy
+            return utils.dateStringsToFloats(vals, fallback=convert)
+        else:
+            return N.array([convert(v) for v in vals], dtype=N.float64)
+
     def readData(self):
         """Read the data into the document."""
 
@@ -377,6 +400,10 @@ class ReadCSV(object):
             for k in (name, name+'\0+-', name+'\0+', name+'\0-'):
                 data.append( self.data.get(k, None) )
 
+            dstype = self.nametypes[name]
+            if dstype == 'date':
+                data[0] = self._convertDates(data[0])
+
             # make them have a maximum length by adding NaNs
             maxlen = max([len(x) for x in data if x is not None])
             for i in crange(len(data)):
@@ -385,7 +412,6 @@ class ReadCSV(object):
                         ( data[i], N.zeros(maxlen-len(data[i]))*N.nan ) )
 
             # create dataset
-            dstype = self.nametypes[name]
             if dstype == 'string':
                 ds = datasets.DatasetText(data=data[0], linked=linkedfile)
             elif dstype == 'date':
@@ -214,7 +214,9 @@ class DescriptorPart(object):
         self.columns = tuple(columns)
 
         self.errorcount = 0
-        
+        # number of values converted to dates in each dataset
+        self.datesconverted = {}
+
         self.single = idxrange is None
         if self.single:
             self.startindex = self.stopindex = 1
@@ -279,11 +281,25 @@ class DescriptorPart(object):
                         dat = val
 
                 elif self.datatype == 'date':
-                    dat = utils.dateStringToDate(val)
+                    # converted in bulk when output
+                    dat = val
 
                 # add data into dataset
                 dataset.append(dat)
 
+    def _convertDates(self, name, vals, tail):
+        """Convert date strings in vals to date values.
+
+        Values converted previously (e.g. when capturing) are not
+        converted again.
+        """
+        start = min(self.datesconverted.get(name, 0), len(vals))
+        if tail is not None:
+            start = max(start, len(vals)-tail)
+        if start < len(vals):
+            vals[start:] = utils.dateStringsToFloats(vals[start:]).tolist()
+        self.datesconverted[name] = len(vals)
+
     def setOutput(self, thedatasets, outmap, block=None,
                   linkedfile=None,
                   prefix="", suffix="", tail=None):
@@ -321,6 +337,9 @@ class DescriptorPart(object):
                     if ds is not None and len(ds) != minlength:
                         del ds[minlength:]
 
+                if self.datatype == 'date':
+                    self._convertDates(name, vals, tail)
+
                 # only remember last N values
                 if tail is not None:
                     vals = vals[-tail:]
@@ -20,7 +20,7 @@
 
 from __future__ import division
 
-from ..compat import cbasestr
+from ..compat import cbasestr, crepr
 from .commonfn import _
 
 class DatasetException(Exception):
@@ -34,6 +34,9 @@ class DatasetExpressionException(DatasetException):
 class DatasetBase(object):
     """Base class for all datasets."""
 
+    def loadDeferred(self):
+        """Read any values of the dataset which are loaded on demand."""
+
 class DatasetConcreteBase(DatasetBase):
     """A base dataset class for datasets which are real, and not proxies,
     etc."""
@@ -89,7 +92,8 @@ class DatasetConcreteBase(DatasetBase):
             savedlinks[self.linked] = True
             self.linked.saveToFile(fileobj, relpath=relpath)
 
-    def saveToFile(self, fileobj, name, mode='text', hdfgroup=None):
+    def saveToFile(self, fileobj, name, mode='text', hdfgroup=None,
+                   sidecar=None):
         """Save dataset to file."""
         self.saveDataRelationToText(fileobj, name)
         if self.linked is None:
@@ -97,6 +101,8 @@ class DatasetConcreteBase(DatasetBase):
                 self.saveDataDumpToText(fileobj, name)
             elif mode == 'hdf5':
                 self.saveDataDumpToHDF5(hdfgroup, name)
+            elif mode == 'binary':
+                self.saveDataDumpToBinary(fileobj, name, sidecar)
 
     def saveDataRelationToText(self, fileobj, name):
         """Save a dataset relation to a text stream fileobj.
@@ -112,6 +118,22 @@ class DatasetConcreteBase(DatasetBase):
         group is the group to save it in (h5py group)
         """
 
+    def saveDataDumpToBinary(self, fileobj, name, sidecar):
+        """Save dumped dataset values to a binary sidecar file.
+        sidecar is the SidecarWriter to write the arrays to.
+        By default datasets are saved as text.
+        """
+        self.saveDataDumpToText(fileobj, name)
+
+    def writeBinaryDumpCommand(self, fileobj, name, sidecar, datatype, parts):
+        """Write arrays in parts (dict of part: array) to the sidecar
+        and the command to load them to fileobj."""
+        args = [ '%s=%s' % (part, crepr(sidecar.addArray(parts[part])))
+                 for part in sorted(parts) if parts[part] is not None ]
+        fileobj.write("SetDataBinary(%s, %s, %s, %s)\n" % (
+                crepr(name), crepr(sidecar.scriptFilename()),
+                crepr(datatype), ', '.join(args)))
+
     def userSize(self):
         """Return dimensions of dataset for user."""
         return ""
@@ -99,6 +99,11 @@ class DatasetDateTime(DatasetDateTimeBase):
         data.attrs['vsz_convert_datetime'] = 1
         data.attrs['vsz_name'] = name.encode('utf-8')
 
+    def saveDataDumpToBinary(self, fileobj, name, sidecar):
+        """Save date data to binary sidecar."""
+        self.writeBinaryDumpCommand(
+            fileobj, name, sidecar, 'date', {'data': self.data})
+
     def deleteRows(self, row, numrows):
         """Delete numrows rows starting from row.
         Returns deleted rows as a dict of {column:data, ...}
@@ -340,7 +340,8 @@ class DatasetExpression(Dataset1DBase):
             for part in self.columns:
                 expr = self.expr[part]
                 if expr is not None and expr.strip() != '':
-                    ok = ok and self._evaluatePart(expr, part)
+                    with utils.profiler.timer(expr, 'expression'):
+                        ok = ok and self._evaluatePart(expr, part)
 
         return ok
 
@@ -24,10 +24,20 @@ import numpy as N
 from .base import DatasetBase
 from .oned import Dataset
 from .twod import Dataset2D
+from .nd import DatasetND
 from .text import DatasetText
+from .date import DatasetDateTime
 
 from ..compat import cstr
 
+# datasets which hold their own values (subclasses may calculate them)
+_storedtypes = (Dataset, DatasetDateTime, DatasetText, Dataset2D, DatasetND)
+
+def isStoredDataset(ds):
+    """Does dataset hold its own values, so that it only changes when
+    it is modified, rather than when other parts of the document do?"""
+    return type(ds) in _storedtypes
+
 def valsToDataset(vals, datatype, dimensions):
     """Return a dataset given a numpy array of values."""
 
@@ -102,3 +102,8 @@ class DatasetND(DatasetNDBase):
         group[escname] = self.data
         group[escname].attrs['vsz_datatype'] = 'nd'
         group[escname].attrs['vsz_name'] = name.encode('utf-8')
+
+    def saveDataDumpToBinary(self, fileobj, name, sidecar):
+        """Save dataset to binary sidecar."""
+        self.writeBinaryDumpCommand(
+            fileobj, name, sidecar, 'nd', {'data': self.data})
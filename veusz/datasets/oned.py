@@ -221,6 +221,13 @@ class Dataset(Dataset1DBase):
                 odgrp[key] = getattr(self, key)
                 odgrp[key].attrs['vsz_name'] = (name + suffix).encode('utf-8')
 
+    def saveDataDumpToBinary(self, fileobj, name, sidecar):
+        """Save dataset to binary sidecar."""
+        self.writeBinaryDumpCommand(
+            fileobj, name, sidecar, '1d',
+            {'data': self.data, 'serr': self.serr,
+             'perr': self.perr, 'nerr': self.nerr})
+
     def deleteRows(self, row, numrows):
         """Delete numrows rows starting from row.
         Returns deleted rows as a dict of {column:data, ...}
@@ -287,6 +287,14 @@ class Dataset2D(Dataset2DBase):
         # unicode text not stored properly unless encoded
         tdgrp['data'].attrs['vsz_name'] = name.encode('utf-8')
 
+    def saveDataDumpToBinary(self, fileobj, name, sidecar):
+        """Save 2D data to binary sidecar."""
+        self.writeBinaryDumpCommand(
+            fileobj, name, sidecar, '2d',
+            dict((v, getattr(self, v)) for v in (
+                'data', 'xcent', 'xedge', 'ycent', 'yedge',
+                'xrange', 'yrange')))
+
 class Dataset2DXYFunc(Dataset2DBase):
     """Given a range of x and y, this is a dataset which is a function of
     this.
@@ -36,6 +36,16 @@ def _(text, disambiguation=None, context="DataEditDialog"):
     """Translate text."""
     return qt4.QCoreApplication.translate(context, text, disambiguation)
 
+def _dependentChanged(doc, names, ranges):
+    """Could datasets with names have changed because other datasets
+    were edited in the ranges given?"""
+    edited = set([r[0] for r in ranges])
+    for name in names:
+        if ( name not in edited and
+             not datasets.isStoredDataset(doc.data.get(name)) ):
+            return True
+    return False
+
 class DatasetTableModel1D(qt4.QAbstractTableModel):
     """Provides access to editing and viewing of datasets."""
 
@@ -60,7 +70,19 @@ class DatasetTableModel1D(qt4.QAbstractTableModel):
 
     def slotDocumentModified(self):
         """Called when document modified."""
-        self.layoutChanged.emit()
+        ranges = self.document.changedDataRanges()
+        ds = self.document.data.get(self.dsname)
+        if ( ranges is None or ds is None or
+             _dependentChanged(self.document, [self.dsname], ranges) ):
+            self.layoutChanged.emit()
+            return
+
+        # only values were changed, so update those cells
+        for name, column, start, stop in ranges:
+            if name == self.dsname and column in ds.columns:
+                col = ds.columns.index(column)
+                self.dataChanged.emit(
+                    self.index(start, col), self.index(stop-1, col))
 
     def columnCount(self, parent):
         """Return number of columns."""
@@ -233,8 +255,21 @@ class DatasetTableModelMulti(qt4.QAbstractTableModel):
         return len(self.colattrs)
 
     def slotDocumentModified(self):
-        self.updateCounts()
-        self.layoutChanged.emit()
+        ranges = self.document.changedDataRanges()
+        if ( ranges is None or
+             _dependentChanged(self.document, self.dsnames, ranges) ):
+            self.updateCounts()
+            self.layoutChanged.emit()
+            return
+
+        # only values were changed, so update those cells
+        self.changeset = self.document.changeset
+        for name, column, start, stop in ranges:
+            for col, (dsname, colname, dsidx, colidx) in enumerate(
+                    self.colattrs):
+                if dsname == name and colname == column:
+                    self.dataChanged.emit(
+                        self.index(start, col), self.index(stop-1, col))
 
     def data(self, index, role):
         """Return data for index."""
@@ -432,8 +467,22 @@ class DatasetTableModel2D(qt4.QAbstractTableModel):
 
     def slotDocumentModified(self):
         """Called when document modified."""
-        self.updatePixelCoords()
-        self.layoutChanged.emit()
+        ranges = self.document.changedDataRanges()
+        ds = self.document.data.get(self.dsname)
+        if ( ranges is None or ds is None or ds.dimensions != 2 or
+             _dependentChanged(self.document, [self.dsname], ranges) ):
+            self.updatePixelCoords()
+            self.layoutChanged.emit()
+            return
+
+        # only values were changed, so update those rows (which are
+        # shown upside down)
+        nrows, ncols = ds.data.shape
+        for name, column, start, stop in ranges:
+            if name == self.dsname:
+                self.dataChanged.emit(
+                    self.index(nrows-stop, 0),
+                    self.index(nrows-start-1, ncols-1))
 
     def setData(self, index, value, role):
         """Called to set the data."""
@@ -101,6 +101,10 @@ class ImportDialog(VeuszDialog):
         # whether file import looks likely to work
         self.filepreviewokay = False
 
+        # tabs are registered when their modules are first imported
+        from .. import dataimport
+        dataimport.loadDialogs()
+
         # tabs loaded currently in dialog
         self.tabs = {}
         for tabname, tabclass in importtabs:
@@ -21,6 +21,7 @@ from .. import qtall as qt4
 from .. import setting
 from .. import utils
 from .. import document
+from ..dataimport import importcache
 from .veuszdialog import VeuszDialog
 
 def _(text, disambiguation=None, context="PrefsDialog"):
@@ -72,6 +73,15 @@ class PreferencesDialog(VeuszDialog):
         # use cwd for file dialogs
         (self.dirDocCWDRadio if setdb['dirname_usecwd'] else self.dirDocPrevRadio).click()
 
+        # saving documents
+        self.saveBinaryDataCheck.setChecked(setdb['save_binarydata'])
+
+        # import cache
+        self.importCacheCheck.setChecked(setdb['importcache_enable'])
+        self.importCacheSizeSpin.setValue(setdb['importcache_maxsize'])
+        self.importCacheClearButton.clicked.connect(self.importCacheClearClicked)
+        self.updateImportCacheButton()
+
         # exporting documents
         {
             'doc': self.dirExportDocRadio,
@@ -186,6 +196,9 @@ class PreferencesDialog(VeuszDialog):
 
         # use cwd
         setdb['dirname_usecwd'] = self.dirDocCWDRadio.isChecked()
+        setdb['save_binarydata'] = self.saveBinaryDataCheck.isChecked()
+        setdb['importcache_enable'] = self.importCacheCheck.isChecked()
+        setdb['importcache_maxsize'] = self.importCacheSizeSpin.value()
 
         for radio, val in (
                 (self.dirExportDocRadio, 'doc'),
@@ -260,3 +273,15 @@ class PreferencesDialog(VeuszDialog):
         sel = self.pluginList.selectionModel().currentIndex()
         if sel.isValid():
             self.pluginmodel.removeRow( sel.row() )
+
+    def updateImportCacheButton(self):
+        """Show size of import cache on clear button."""
+        size = importcache.cacheSize()
+        self.importCacheClearButton.setText(
+            _('Clear cache (%.1f MB)') % (size/1024/1024))
+        self.importCacheClearButton.setEnabled(size > 0)
+
+    def importCacheClearClicked(self):
+        """Remove entries in import cache."""
+        importcache.clear()
+        self.updateImportCacheButton()
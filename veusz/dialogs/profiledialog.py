@@ -0,0 +1,77 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""Dialog showing times recorded when profiling drawing."""
+
+from __future__ import division
+
+from .. import qtall as qt4
+from .. import utils
+from .veuszdialog import VeuszDialog
+
+def _(text, disambiguation=None, context="ProfileDialog"):
+    """Translate text."""
+    return qt4.QCoreApplication.translate(context, text, disambiguation)
+
+class ProfileDialog(VeuszDialog):
+    """Show a sortable table of times taken to draw widgets."""
+
+    def __init__(self, parent, plotwindow):
+        VeuszDialog.__init__(self, parent, 'profile.ui')
+        self.plotwindow = plotwindow
+
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels([
+            _('Name'), _('Phase'), _('Time (ms)'), _('Calls'),
+            _('Mean (ms)')])
+        self.table.verticalHeader().hide()
+
+        self.enableCheck.setChecked(utils.profiler.enabled)
+        self.enableCheck.clicked.connect(self.slotEnable)
+        self.resetButton.clicked.connect(self.slotReset)
+        self.refreshButton.clicked.connect(self.updateTable)
+
+        self.updateTable()
+
+    def slotEnable(self, enabled):
+        """Turn on or off profiling, redrawing to get times."""
+        utils.profiler.enable(enabled)
+        self.plotwindow.actionForceUpdate()
+        self.updateTable()
+
+    def slotReset(self):
+        """Forget times."""
+        utils.profiler.reset()
+        self.updateTable()
+
+    def updateTable(self):
+        """Show latest times in table."""
+
+        rows = utils.profiler.report()
+
+        table = self.table
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for i, (name, phase, total, count, mean) in enumerate(rows):
+            for col, val in enumerate((name, phase, total*1e3, count, mean*1e3)):
+                item = qt4.QTableWidgetItem()
+                # numeric values are sorted numerically
+                item.setData(qt4.Qt.DisplayRole, val)
+                table.setItem(i, col, item)
+        table.setSortingEnabled(True)
+        table.resizeColumnsToContents()
@@ -26,9 +26,10 @@ external programs.
 
 from __future__ import division, print_function
 import os.path
+import glob
 import numpy as N
 
-from ..compat import cbasestr
+from ..compat import cbasestr, citems
 from .. import qtall as qt4
 from .. import setting
 from .. import embed
@@ -39,6 +40,7 @@ from .. import datasets
 from . import operations
 from . import mime
 from . import export
+from . import datasidecar
 
 def _(text, disambiguation=None, context='CommandInterface'):
     """Translate text."""
@@ -47,7 +49,8 @@ def _(text, disambiguation=None, context='CommandInterface'):
 def registerImportCommand(name, method):
     """Add command to command interface."""
     setattr(CommandInterface, name, method)
-    CommandInterface.safe_commands.append(name)
+    if name not in CommandInterface.safe_commands:
+        CommandInterface.safe_commands.append(name)
 
 class CommandInterface(qt4.QObject):
     """Class provides command interface."""
@@ -72,6 +75,8 @@ class CommandInterface(qt4.QObject):
         'List',
         'NodeChildren',
         'NodeType',
+        'Profile',
+        'ProfileReport',
         'ReloadData',
         'Remove',
         'RemoveCustom',
@@ -84,6 +89,7 @@ class CommandInterface(qt4.QObject):
         'SetData2DExpression',
         'SetData2DExpressionXYZ',
         'SetData2DXYFunc',
+        'SetDataBinary',
         'SetDataDateTime',
         'SetDataExpression',
         'SetDataND',
@@ -98,6 +104,7 @@ class CommandInterface(qt4.QObject):
 
     # commands which can modify disk, etc
     unsafe_commands = (
+        'ClearImportCache',
         'Export',        
         'Print',
         'Save',
@@ -135,6 +142,23 @@ class CommandInterface(qt4.QObject):
                 pass
         return filename
 
+    def findFilesOnImportPath(self, filenames):
+        """Expand a filename or wildcard, or a list of these, to a list
+        of filenames, looking for files on the path."""
+        if isinstance(filenames, cbasestr):
+            filenames = [filenames]
+        out = []
+        for filename in filenames:
+            if not glob.has_magic(filename):
+                out.append(self.findFileOnImportPath(filename))
+                continue
+            for path in self.importpath + ['']:
+                found = sorted(glob.glob(os.path.join(path, filename)))
+                if found:
+                    out += found
+                    break
+        return out
+
     def SetVerbose(self, v=True):
         """Specify whether we want verbose output after operations."""
         self.verbose = v
@@ -394,6 +418,7 @@ class CommandInterface(qt4.QObject):
 
         mode can be:
          'vsz': standard veusz text format
+         'vszbin': veusz text format, with data in binary sidecar file
          'hdf5': HDF5 format
         """
         self.document.save(filename, mode)
@@ -436,6 +461,24 @@ class CommandInterface(qt4.QObject):
                       str(data.nerr), str(data.perr))
             )
 
+    def SetDataBinary(self, name, filename, datatype, **parts):
+        """Set dataset from arrays in a binary sidecar file.
+
+        filename: sidecar file written when saving document
+        datatype: '1d', '2d', 'date' or 'nd'
+        parts: parts of dataset (e.g. data, serr, xrange), giving the
+         (offset, dtype, shape) of each array in the file
+        """
+
+        realfilename = self.findFileOnImportPath(filename)
+        ds = datasidecar.readSidecarDataset(realfilename, datatype, parts)
+        op = operations.OperationDatasetSet(name, ds)
+        self.document.applyOperation(op)
+
+        if self.verbose:
+            print(_("Set dataset '%s' from binary file '%s'") % (
+                    name, filename))
+
     def SetDataDateTime(self, name, vals):
         """Set datetime dataset to be values given.
         vals is a list of python datetime objects
@@ -728,6 +771,33 @@ class CommandInterface(qt4.QObject):
 
         return self.document.reloadLinkedDatasets()
 
+    def Profile(self, enable=True, reset=True):
+        """Turn on or off profiling of document drawing.
+
+        If reset is True, forget any previously recorded times.
+        """
+        if reset:
+            utils.profiler.reset()
+        utils.profiler.enable(enable)
+
+    def ProfileReport(self, sortby='time', text=False):
+        """Return times recorded by profiling.
+
+        sortby is 'time', 'count', 'mean', 'name' or 'phase'
+        If text is False, a list of tuples
+          (name, phase, totaltime, count, meantime)
+        is returned, where times are in seconds. Otherwise a text
+        table is returned.
+        """
+        if text:
+            return utils.profiler.reportText(sortby=sortby)
+        return utils.profiler.report(sortby=sortby)
+
+    def ClearImportCache(self):
+        """Remove all entries in the import cache."""
+        from ..dataimport import importcache
+        importcache.clear()
+
     def Action(self, action, widget='.'):
         """Performs action on current widget."""
 
@@ -0,0 +1,168 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""Binary sidecar files for storing dataset values of vsz documents.
+
+A sidecar file starts with a magic string, followed by the raw values
+of each array, aligned to a fixed boundary. The document script
+records the offset, numpy dtype and shape of each array, so that the
+arrays can be memory mapped when the document is loaded.
+"""
+
+from __future__ import division
+import os
+import os.path
+
+import numpy as N
+
+from ..compat import citems
+from .. import datasets
+
+# start of sidecar files
+magic = b'VSZDATA1'
+
+# arrays start at multiples of this offset
+alignment = 64
+
+def sidecarFilename(docfilename):
+    """Get filename of sidecar for document filename."""
+    return os.path.splitext(docfilename)[0] + '.vszdata'
+
+def _canReplace(filename):
+    """Can an existing file be replaced?
+
+    On Windows, files which are memory mapped cannot be renamed or
+    deleted, so this checks whether the file can be moved.
+    """
+    if os.name != 'nt':
+        return True
+    moved = filename + '.move'
+    try:
+        os.rename(filename, moved)
+    except OSError:
+        return False
+    os.rename(moved, filename)
+    return True
+
+def _writableFilename(filename):
+    """Return filename if it can be written, or else an alternative
+    name (filename.1, filename.2...) which can be."""
+    name = filename
+    num = 0
+    while os.path.exists(name) and not _canReplace(name):
+        num += 1
+        name = '%s.%i' % (filename, num)
+    return name
+
+class SidecarWriter(object):
+    """Write arrays to a sidecar file.
+
+    The data are written to a temporary file, which replaces the
+    sidecar file when close() is called. This means that arrays
+    memory mapped from an existing sidecar remain valid. If the
+    sidecar cannot be replaced because it is mapped (on Windows), an
+    alternative filename is used.
+    """
+
+    def __init__(self, filename):
+        self.filename = _writableFilename(filename)
+        self.tempfilename = filename + '.temp'
+        self.fileobj = open(self.tempfilename, 'wb')
+        self.fileobj.write(magic)
+        self.numarrays = 0
+
+    def scriptFilename(self):
+        """Filename to write in document script (relative to document)."""
+        return os.path.basename(self.filename)
+
+    def addArray(self, arr):
+        """Write array to the sidecar.
+
+        Returns (offset, dtype, shape) to locate array in file.
+        """
+        arr = N.ascontiguousarray(arr)
+        f = self.fileobj
+        offset = f.tell()
+        pad = -offset % alignment
+        if pad:
+            f.write(b'\0'*pad)
+            offset += pad
+        arr.tofile(f)
+        self.numarrays += 1
+        return (int(offset), arr.dtype.str, arr.shape)
+
+    def close(self):
+        """Finish writing, replacing the sidecar file.
+
+        If no arrays were written, the sidecar is not created.
+        """
+        self.fileobj.close()
+        if self.numarrays == 0:
+            os.unlink(self.tempfilename)
+            return
+        try:
+            os.rename(self.tempfilename, self.filename)
+        except OSError:
+            # windows cannot rename over existing files
+            os.remove(self.filename)
+            os.rename(self.tempfilename, self.filename)
+
+    def abort(self):
+        """Stop writing, removing temporary file."""
+        self.fileobj.close()
+        os.unlink(self.tempfilename)
+
+def readSidecarArray(filename, spec):
+    """Return array from sidecar file given (offset, dtype, shape).
+
+    The array is memory mapped as copy-on-write, so that changes
+    are not written back to the file.
+    """
+
+    offset, dtype, shape = spec
+    shape = tuple(shape)
+
+    with open(filename, 'rb') as f:
+        if f.read(len(magic)) != magic:
+            raise ValueError("'%s' is not a Veusz data file" % filename)
+
+    if N.prod(shape) == 0:
+        # cannot map zero length arrays
+        return N.zeros(shape, dtype=dtype)
+
+    arr = N.memmap(filename, dtype=dtype, mode='c', offset=offset,
+                   shape=shape)
+    # avoid memmap subclass propagating to derived arrays
+    return arr.view(N.ndarray)
+
+def readSidecarDataset(filename, datatype, parts):
+    """Make dataset from arrays in sidecar file.
+
+    datatype: '1d', '2d', 'date' or 'nd'
+    parts: dict of parts of dataset (e.g. data, serr, xrange) to the
+     (offset, dtype, shape) of each array in the file
+    """
+
+    args = dict( (part, readSidecarArray(filename, spec))
+                 for part, spec in citems(parts) )
+    return {
+        '1d': datasets.Dataset,
+        '2d': datasets.Dataset2D,
+        'date': datasets.DatasetDateTime,
+        'nd': datasets.DatasetND,
+    }[datatype](**args)
@@ -26,23 +26,21 @@ import codecs
 import os.path
 import traceback
 import datetime
+import threading
 from collections import defaultdict
 
-try:
-    import h5py
-except ImportError:
-    h5py = None
-
 from ..compat import citems, cvalues, cstr, CStringIO, cexecfile
 from .. import qtall as qt4
 
 from . import widgetfactory
 from . import painthelper
 from . import evaluate
+from . import datasidecar
 
 from .. import datasets
 from .. import utils
 from .. import setting
+from .. import startupprofile
 
 def _(text, disambiguation=None, context="Document"):
     """Translate text."""
@@ -69,6 +67,26 @@ class DocSuspend(object):
     def __exit__(self, type, value, traceback):
         self.doc.enableUpdates()
 
+class DocModifyLock(object):
+    """Hold the paint lock of the document while modifying it.
+
+    If the lock is held by drawing in another thread, the drawing is
+    asked to stop (if it can), rather than waiting for it to finish.
+    """
+    def __init__(self, doc):
+        self.doc = doc
+    def __enter__(self):
+        doc = self.doc
+        if not doc.paintlock.acquire(False):
+            doc.abortpaint += 1
+            try:
+                doc.paintlock.acquire()
+            finally:
+                doc.abortpaint -= 1
+        return self
+    def __exit__(self, type, value, traceback):
+        self.doc.paintlock.release()
+
 class Document(qt4.QObject):
     """Document class for holding the graph data.
     """
@@ -88,13 +106,29 @@ class Document(qt4.QObject):
         """Initialise the document."""
         qt4.QObject.__init__( self )
 
+        # Plugins are loaded before the first document is made, rather
+        # than when they are first used, as they can run any code, such
+        # as registering widget types, which the stylesheet made by
+        # wipe() needs to know about.
         if not Document.pluginsloaded:
-            Document.loadPlugins()
+            with startupprofile.phase('plugins'):
+                Document.loadPlugins()
             Document.pluginsloaded = True
 
         # change tracking of document as a whole
         self.changeset = 0            # increased when the document changes
 
+        # ranges of dataset values changed since last notification
+        # (None if other parts of the document changed)
+        self.changedranges = []
+        # changed ranges sent with last notification
+        self.lastchangedranges = None
+        # names of datasets set, deleted, renamed or modified since last
+        # notification (None if not known)
+        self.changeddatasets = set()
+        # changed dataset names sent with last notification
+        self.lastchangeddatasets = None
+
         # map tags to dataset names
         self.datasettags = defaultdict(list)
 
@@ -105,6 +139,13 @@ class Document(qt4.QObject):
         # default document locale
         self.locale = qt4.QLocale()
 
+        # held while drawing, as widgets store state when drawn
+        # (plots may be drawn in other threads)
+        self.paintlock = threading.RLock()
+        # number of threads waiting for paintlock to modify the document
+        # (abortable drawing stops if this is non-zero)
+        self.abortpaint = 0
+
         # evaluation context
         self.evaluate = evaluate.Evaluate(self)
 
@@ -113,13 +154,15 @@ class Document(qt4.QObject):
 
     def wipe(self):
         """Wipe out any stored data."""
-        self.data = {}
-        self.basewidget = widgetfactory.thefactory.makeWidget(
-            'document', None, None)
-        self.basewidget.document = self
-        self.setModified(False)
-        self.filename = ""
-        self.evaluate.wipe()
+        with DocModifyLock(self):
+            self.data = {}
+            self.changeddatasets = None
+            self.basewidget = widgetfactory.thefactory.makeWidget(
+                'document', None, None)
+            self.basewidget.document = self
+            self.setModified(False)
+            self.filename = ""
+            self.evaluate.wipe()
         self.sigWiped.emit()
 
     def clearHistory(self):
@@ -140,7 +183,7 @@ class Document(qt4.QObject):
         if not self.suspendupdates and changeset != self.changeset:
             # bump this up as some watchers might ignore this otherwise
             self.changeset += 1
-            self.setModified()
+            self._notifyModified(True)
 
     def suspend(self):
         """Return context manager for suspending updates."""
@@ -168,8 +211,9 @@ class Document(qt4.QObject):
         """
 
         with DocSuspend(self):
-            retn = operation.do(self)
-            self.changeset += 1
+            with DocModifyLock(self):
+                retn = operation.do(self)
+                self.changeset += 1
 
         if self.historybatch:
             # in batch mode, create an OperationMultiple for all changes
@@ -201,8 +245,9 @@ class Document(qt4.QObject):
 
         operation = self.historyundo.pop()
         with DocSuspend(self):
-            operation.undo(self)
-            self.changeset += 1
+            with DocModifyLock(self):
+                operation.undo(self)
+                self.changeset += 1
         self.historyredo.append(operation)
 
     def canUndo(self):
@@ -268,18 +313,60 @@ class Document(qt4.QObject):
         dataset.username = name
 
         # update the change tracking
+        self._addChangedDatasets(name)
         self.setModified()
 
     def deleteData(self, name):
         """Remove a dataset"""
         if name in self.data:
             del self.data[name]
+            self._addChangedDatasets(name)
             self.setModified()
 
     def modifiedData(self, dataset):
         """Notify dataset was modified"""
-        if dataset in self.data.values():
-            self.setModified()
+        try:
+            name = self.datasetName(dataset)
+        except ValueError:
+            return
+        self._addChangedDatasets(name)
+        self.setModified()
+
+    def _addChangedDatasets(self, *names):
+        """Record names of datasets changed for next notification."""
+        if self.changeddatasets is not None:
+            self.changeddatasets.update(names)
+
+    def changedDatasets(self):
+        """Return set of names of datasets set, deleted, renamed or
+        modified for the current modification notification, or None if
+        this is not known.
+
+        Datasets which are not stored (see datasets.isStoredDataset)
+        may change whenever the document changes, so are not included.
+        """
+        return self.lastchangeddatasets
+
+    def modifiedDataRange(self, dataset, column, start, stop):
+        """Notify values in column of dataset were changed in place,
+        for rows start to stop-1 (first dimension for 2D datasets).
+
+        Views can use changedDataRanges() to update only these values.
+        """
+        try:
+            name = self.datasetName(dataset)
+        except ValueError:
+            return
+        if self.changedranges is not None:
+            self.changedranges.append((name, column, start, stop))
+        self._addChangedDatasets(name)
+        self._notifyModified(True)
+
+    def changedDataRanges(self):
+        """Return list of (dataset name, column, start, stop) changed
+        in place for the current modification notification, or None
+        if other changes were made to the document."""
+        return self.lastchangedranges
 
     def getLinkedFiles(self, filenames=None):
         """Get a list of LinkedFile objects used by the document.
@@ -332,6 +419,7 @@ class Document(qt4.QObject):
         self.data[newname] = d
         d.username = newname
 
+        self._addChangedDatasets(oldname, newname)
         self.setModified()
 
     def getData(self, name):
@@ -345,10 +433,22 @@ class Document(qt4.QObject):
         # import traceback
         # traceback.print_stack()
 
+        self.changedranges = None
+        self._notifyModified(ismodified)
+
+    def _notifyModified(self, ismodified):
+        """Update modified flag and inform views if not suspended."""
+
         self.modified = ismodified
         self.changeset += 1
 
         if len(self.suspendupdates) == 0:
+            ranges = self.changedranges
+            self.changedranges = []
+            # only tell views about in place changes if there were some
+            self.lastchangedranges = ranges if ranges else None
+            self.lastchangeddatasets = self.changeddatasets
+            self.changeddatasets = set()
             self.signalModified.emit(ismodified)
 
     def isModified(self):
@@ -371,7 +471,28 @@ class Document(qt4.QObject):
 
     def paintTo(self, painthelper, page):
         """Paint page specified to the paint helper."""
-        self.basewidget.draw(painthelper, page)
+        with self.paintlock:
+            with utils.profiler.timer(self.basewidget.getPage(page), 'page'):
+                try:
+                    self.basewidget.draw(painthelper, page)
+                finally:
+                    # coordinates are only cached while drawing
+                    painthelper.coordcache.clear()
+
+    def callWithPaintLock(self, func):
+        """Call func holding paintlock.
+
+        If a page is being drawn in another thread, func is called
+        later from the event loop instead, so that the user interface
+        does not wait for drawing to finish.
+        """
+        if self.paintlock.acquire(False):
+            try:
+                func()
+            finally:
+                self.paintlock.release()
+        else:
+            qt4.QTimer.singleShot(20, lambda: self.callWithPaintLock(func))
 
     def getNumberPages(self):
         """Return the number of pages in the document."""
@@ -409,7 +530,7 @@ class Document(qt4.QObject):
             fileobj.write('TagDatasets(%s, %s)\n' %
                           (repr(tag), repr(val)))
 
-    def saveToFile(self, fileobj):
+    def saveToFile(self, fileobj, sidecar=None):
         """Save the text representing a document to a file.
 
         The ordering can be important, as some things override
@@ -419,6 +540,9 @@ class Document(qt4.QObject):
            already defined.
          - Loading from files may bring in new datasets which
            override defined datasets, so save links first
+
+        If sidecar is a SidecarWriter, dataset values are written to
+        it in binary form, rather than as text.
         """
 
         self._writeFileHeader(fileobj, 'saved document')
@@ -438,7 +562,11 @@ class Document(qt4.QObject):
 
         # save the remaining datasets
         for name, dataset in sorted(self.data.items()):
-            dataset.saveToFile(fileobj, name)
+            if sidecar is None:
+                dataset.saveToFile(fileobj, name)
+            else:
+                dataset.saveToFile(fileobj, name, mode='binary',
+                                   sidecar=sidecar)
 
         # save tags of datasets
         self.saveDatasetTags(fileobj)
@@ -509,13 +637,32 @@ class Document(qt4.QObject):
     def save(self, filename, mode='vsz'):
         """Save to output file.
 
-        mode is 'vsz' or 'hdf5'
+        mode is 'vsz', 'vszbin' (vsz with data in a binary sidecar
+        file) or 'hdf5'
         """
+
+        # datasets may be read on demand from the file being replaced
+        for dataset in cvalues(self.data):
+            dataset.loadDeferred()
+
         if mode == 'vsz':
             with codecs.open(filename, 'w', 'utf-8') as f:
                 self.saveToFile(f)
+        elif mode == 'vszbin':
+            sidecar = datasidecar.SidecarWriter(
+                datasidecar.sidecarFilename(filename))
+            try:
+                with codecs.open(filename, 'w', 'utf-8') as f:
+                    self.saveToFile(f, sidecar=sidecar)
+            except:
+                sidecar.abort()
+                raise
+            sidecar.close()
         elif mode == 'hdf5':
-            if h5py is None:
+            try:
+                # imported here as h5py is slow to import
+                import h5py
+            except ImportError:
                 raise RuntimeError('Missing h5py module')
             with h5py.File(filename, 'w') as f:
                 self.saveToHDF5File(f)
@@ -27,6 +27,7 @@ import re
 
 from ..compat import crange
 from .. import qtall as qt4
+from .. import setting
 from .. import utils
 
 try:
@@ -234,11 +235,14 @@ class Export(object):
         else:
             raise RuntimeError("File type '%s' not supported" % ext)
 
-    def renderPage(self, page, size, dpi, painter):
+    def renderPage(self, page, size, dpi, painter, spritemarkers=False):
         """Render page using paint helper to painter.
         This first renders to the helper, then to the painter
+        spritemarkers: draw markers as bitmaps (only for bitmap output)
         """
-        helper = painthelper.PaintHelper(self.doc, size, dpi=dpi, directpaint=painter)
+        helper = painthelper.PaintHelper(
+            self.doc, size, dpi=dpi, directpaint=painter,
+            spritemarkers=spritemarkers, spriteantialias=self.antialias)
         painter.setClipRect( qt4.QRectF(
                 qt4.QPointF(0,0), qt4.QPointF(*size)) )
         painter.save()
@@ -294,7 +298,9 @@ class Export(object):
         painter = painthelper.DirectPainter(image)
         painter.setRenderHint(qt4.QPainter.Antialiasing, self.antialias)
         painter.setRenderHint(qt4.QPainter.TextAntialiasing, self.antialias)
-        self.renderPage(page, size, (dpi,dpi), painter)
+        self.renderPage(
+            page, size, (dpi,dpi), painter,
+            spritemarkers=setting.settingdb['export_spritemarkers'])
 
         # write image to disk
         writer = qt4.QImageWriter()
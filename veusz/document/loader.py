@@ -20,6 +20,7 @@
 
 import sys
 import os.path
+import threading
 import traceback
 import io
 import numpy as N
@@ -123,34 +124,152 @@ def executeScript(thedoc, filename, script, callbackunsafe=None):
         except Exception as e:
             raise genexception(e)
 
-def loadHDF5Dataset1D(datagrp):
-    args = {}
+class HDF5LazyReader(object):
+    """Read parts of datasets from a HDF5 document when needed.
+
+    The file is only opened while reading, so that no handles are
+    kept open.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.lock = threading.Lock()
+
+    def read(self, grouppath, parts):
+        """Read parts (list of dataset names) in group, returning dict."""
+        with self.lock:
+            with h5py.File(self.filename, 'r') as hdffile:
+                grp = hdffile[grouppath]
+                return dict( (p, N.array(grp[p])) for p in parts )
+
+class _LazyHDF5Mixin(object):
+    """Mixin for datasets where some parts are read from the HDF5
+    document when they are first accessed.
+
+    lazyclass is the dataset class used to convert the values read.
+    """
+
+    lazyclass = None
+
+    def initLazy(self, reader, grouppath, lazyparts, shape):
+        self._lazy = (reader, grouppath, lazyparts)
+        self._lazyshape = shape
+
+    def __getattr__(self, attr):
+        # only called if attribute has not been set yet
+        lazy = self.__dict__.get('_lazy')
+        if lazy is not None and attr in lazy[2]:
+            self.loadDeferred()
+            return self.__dict__[attr]
+        raise AttributeError(attr)
+
+    def loadDeferred(self):
+        """Read the parts of the dataset not yet read."""
+        lazy = self.__dict__.get('_lazy')
+        if lazy is None:
+            return
+        reader, grouppath, lazyparts = lazy
+        vals = reader.read(grouppath, lazyparts)
+        converted = self.lazyclass(**vals)
+        for part in lazyparts:
+            setattr(self, part, getattr(converted, part))
+        self._lazy = None
+
+    def isLazy(self):
+        """Are there data not yet read?"""
+        return self.__dict__.get('_lazy') is not None
+
+class LazyHDF5Dataset1D(_LazyHDF5Mixin, datasets.Dataset):
+    """1D dataset read from HDF5 document when first used."""
+
+    lazyclass = datasets.Dataset
+
+    def __init__(self, reader, grouppath, parts, shape):
+        datasets.Dataset.__init__(self, data=[])
+        # parts set by the constructor are read when needed
+        for col in parts:
+            delattr(self, col)
+        self.initLazy(reader, grouppath, parts, shape)
+
+    def userSize(self):
+        if self.isLazy():
+            return str(self._lazyshape[0])
+        return datasets.Dataset.userSize(self)
+
+    def description(self):
+        if self.isLazy():
+            # do not read data just to describe dataset
+            if 'serr' in self._lazy[2]:
+                templ = _("1D (length %i, symmetric errors)")
+            elif 'perr' in self._lazy[2] or 'nerr' in self._lazy[2]:
+                templ = _("1D (length %i, asymmetric errors)")
+            else:
+                templ = _("1D (length %i)")
+            return templ % self._lazyshape[0]
+        return datasets.Dataset.description(self)
+
+class LazyHDF5Dataset2D(_LazyHDF5Mixin, datasets.Dataset2D):
+    """2D dataset where the data are read from the HDF5 document when
+    first used. The coordinates are read immediately."""
+
+    lazyclass = datasets.Dataset2D
+
+    def __init__(self, reader, grouppath, shape, **coords):
+        datasets.Dataset2D.__init__(self, **coords)
+        # data set to None by the constructor are read when needed
+        del self.data
+        self.initLazy(reader, grouppath, ['data'], shape)
+
+    def userSize(self):
+        if self.isLazy():
+            return u'%i\u00d7%i' % self._lazyshape
+        return datasets.Dataset2D.userSize(self)
+
+class LazyHDF5DatasetDate(_LazyHDF5Mixin, datasets.DatasetDateTime):
+    """Date dataset read from HDF5 document when first used."""
+
+    lazyclass = datasets.DatasetDateTime
+
+    def __init__(self, reader, grouppath, shape):
+        datasets.DatasetDateTime.__init__(self)
+        del self.data
+        self.initLazy(reader, grouppath, ['data'], shape)
+
+    def userSize(self):
+        if self.isLazy():
+            return str(self._lazyshape[0])
+        return datasets.DatasetDateTime.userSize(self)
+
+def loadHDF5Dataset1D(datagrp, reader):
     # this weird usage of sets is to work around some sort of weird
     # error where h5py gives an error when doing 'a' in datagrp
     # this gives error: 'perr' in datagrp
-    parts = set(datagrp) & set(('data', 'serr', 'perr', 'nerr'))
-    for v in parts:
-        args[v] = N.array(datagrp[v])
-    return datasets.Dataset(**args)
+    parts = sorted(set(datagrp) & set(('data', 'serr', 'perr', 'nerr')))
+    return LazyHDF5Dataset1D(
+        reader, datagrp.name, parts, datagrp['data'].shape)
 
-def loadHDF5Dataset2D(datagrp):
+def loadHDF5Dataset2D(datagrp, reader):
     args = {}
     parts = set(datagrp) & set(
-        ('data', 'xcent', 'xedge', 'ycent', 'yedge', 'xrange', 'yrange'))
+        ('xcent', 'xedge', 'ycent', 'yedge', 'xrange', 'yrange'))
     for v in parts:
         args[v] = N.array(datagrp[v])
-    return datasets.Dataset2D(**args)
+    return LazyHDF5Dataset2D(
+        reader, datagrp.name, datagrp['data'].shape, **args)
 
-def loadHDF5DatasetDate(datagrp):
-    return datasets.DatasetDateTime(data=datagrp['data'])
+def loadHDF5DatasetDate(datagrp, reader):
+    return LazyHDF5DatasetDate(reader, datagrp.name, datagrp['data'].shape)
 
-def loadHDF5DatasetText(datagrp):
+def loadHDF5DatasetText(datagrp, reader):
     data = [d.decode('utf-8') for d in datagrp['data']]
     return datasets.DatasetText(data=data)
 
-def loadHDF5Datasets(thedoc, hdffile):
-    """Load all the Veusz datasets in the HDF5 file."""
+def loadHDF5Datasets(thedoc, hdffile, filename):
+    """Load all the Veusz datasets in the HDF5 file.
+
+    Numerical values are not read until they are used."""
     alldatagrp = hdffile['Veusz']['Data']
+    reader = HDF5LazyReader(filename)
 
     datafuncs = {
         '1d': loadHDF5Dataset1D,
@@ -164,7 +283,7 @@ def loadHDF5Datasets(thedoc, hdffile):
         datatype = bconv(datagrp.attrs['vsz_datatype'])
         veuszname = utils.unescapeHDFDataName(bconv(name))
 
-        dataset = datafuncs[datatype](datagrp)
+        dataset = datafuncs[datatype](datagrp, reader)
         thedoc.setData(veuszname, dataset)
 
 def tagHDF5Datasets(thedoc, hdffile):
@@ -212,7 +331,7 @@ def loadHDF5Doc(thedoc, filename, callbackunsafe=None):
         executeScript(thedoc, filename, script, callbackunsafe=callbackunsafe)
 
         # then load datasets
-        loadHDF5Datasets(thedoc, hdffile)
+        loadHDF5Datasets(thedoc, hdffile, filename)
         # and then tag
         tagHDF5Datasets(thedoc, hdffile)
 
@@ -37,6 +37,7 @@ from . import widgetfactory
 
 from .. import datasets
 from .. import plugins
+from .. import setting
 from .. import qtall as qt4
 
 def _(text, disambiguation=None, context="Operations"):
@@ -357,6 +358,7 @@ class OperationWidgetMove(Operation):
                 self.oldname = child.name
                 child.name = child.chooseName()
 
+        setting.settingsChanged()
         self.newchildpath = child.path
 
     def undo(self, document):
@@ -376,6 +378,8 @@ class OperationWidgetMove(Operation):
         if self.oldname is not None:
             child.name = self.oldname
 
+        setting.settingsChanged()
+
 class OperationWidgetAdd(Operation):
     """Add a widget of specified type to parent."""
 
@@ -551,10 +555,12 @@ class OperationDatasetUnlinkFile(Operation):
         dataset = document.data[self.datasetname]
         self.oldfilelink = dataset.linked
         dataset.linked = None
+        document.modifiedData(dataset)
         
     def undo(self, document):
         dataset = document.data[self.datasetname]
         dataset.linked = self.oldfilelink
+        document.modifiedData(dataset)
 
 class OperationDatasetUnlinkRelation(Operation):
     """Remove association between dataset and another dataset.
@@ -877,14 +883,17 @@ class OperationDatasetUnlinkByFile(Operation):
             if ds.linked is not None and ds.linked.filename == self.filename:
                 self.oldlinks[name] = ds.linked
                 ds.linked = None
+                document.modifiedData(ds)
 
     def undo(self, document):
         """Restore links."""
         for name, link in citems(self.oldlinks):
             try:
-                document.data[name].linked = link
+                ds = document.data[name]
             except KeyError:
-                pass
+                continue
+            ds.linked = link
+            document.modifiedData(ds)
 
 class OperationDatasetDeleteByFile(Operation):
     """Delete all datasets associated with file."""
@@ -925,15 +934,18 @@ class OperationDataTag(Operation):
         """Add new tags, if required."""
         self.removetags = []
         for name in self.datasetnames:
-            existing = document.data[name].tags
-            if self.tag not in existing:
-                existing.add(self.tag)
+            ds = document.data[name]
+            if self.tag not in ds.tags:
+                ds.tags.add(self.tag)
                 self.removetags.append(name)
+                document.modifiedData(ds)
 
     def undo(self, document):
         """Remove tags, if not previously present."""
         for name in self.removetags:
-            document.data[name].tags.remove(self.tag)
+            ds = document.data[name]
+            ds.tags.remove(self.tag)
+            document.modifiedData(ds)
 
 class OperationDataUntag(Operation):
     """Add a tag to a list of datasets."""
@@ -948,12 +960,16 @@ class OperationDataUntag(Operation):
     def do(self, document):
         """Add new tags, if required."""
         for name in self.datasetnames:
-            document.data[name].tags.remove(self.tag)
+            ds = document.data[name]
+            ds.tags.remove(self.tag)
+            document.modifiedData(ds)
 
     def undo(self, document):
         """Remove tags, if not previously present."""
         for name in self.datasetnames:
-            document.data[name].tags.add(self.tag)
+            ds = document.data[name]
+            ds.tags.add(self.tag)
+            document.modifiedData(ds)
 
 ###############################################################################
 # Alter dataset
@@ -1006,14 +1022,16 @@ class OperationDatasetSetVal(Operation):
         datacol = getattr(ds, self.columnname)
         self.oldval = datacol[self.row]
         datacol[self.row] = self.val
-        ds.changeValues(self.columnname, datacol)
+        document.modifiedDataRange(
+            ds, self.columnname, self.row, self.row+1)
 
     def undo(self, document):
         """Restore the value."""
         ds = document.data[self.datasetname]
         datacol = getattr(ds, self.columnname)
         datacol[self.row] = self.oldval
-        ds.changeValues(self.columnname, datacol)
+        document.modifiedDataRange(
+            ds, self.columnname, self.row, self.row+1)
     
 class OperationDatasetSetVal2D(Operation):
     """Set a value in a 2D dataset."""
@@ -1032,13 +1050,13 @@ class OperationDatasetSetVal2D(Operation):
         ds = document.data[self.datasetname]
         self.oldval = ds.data[self.row, self.col]
         ds.data[self.row, self.col] = self.val
-        document.modifiedData(ds)
+        document.modifiedDataRange(ds, 'data', self.row, self.row+1)
 
     def undo(self, document):
         """Restore the value."""
         ds = document.data[self.datasetname]
         ds.data[self.row, self.col] = self.oldval
-        document.modifiedData(ds)
+        document.modifiedDataRange(ds, 'data', self.row, self.row+1)
 
 class OperationDatasetDeleteRow(Operation):
     """Delete a row or several in the dataset."""
@@ -20,8 +20,10 @@
 """
 
 from __future__ import division
+from ..compat import crange
 from .. import qtall as qt4
 from .. import setting
+from .. import utils
 
 try:
     from ..helpers.recordpaint import RecordPaintDevice
@@ -30,6 +32,10 @@ except ImportError:
     def RecordPaintDevice(width, height, dpix, dpiy):
         return qt4.QPicture()
 
+class PaintAborted(Exception):
+    """Raised when abortable painting is stopped, as the document is
+    waiting to be modified."""
+
 class DrawState(object):
     """Each widget plotted has a recorded state in this object."""
 
@@ -51,9 +57,63 @@ class DrawState(object):
         # list of child widgets states
         self.children = []
 
+class _StateIndex(object):
+    """Index of the bounding rectangles of drawn states, to find which
+    states may have drawn at a point.
+
+    The page is split into a grid of cells, each listing the states
+    whose bounds overlap it, in drawing order.
+    """
+
+    # size of cells in pixels
+    cellsize = 64
+
+    def __init__(self, rootstate):
+        # states in drawing order with their bounds
+        self.states = []
+        self.bounds = []
+        self.cells = {}
+
+        stack = [rootstate] if rootstate is not None else []
+        while stack:
+            state = stack.pop()
+            stack += state.children[::-1]
+
+            r = qt4.QRectF(state.record.boundingRect())
+            if state.clip is not None:
+                r = r.intersected(state.clip)
+            if r.isEmpty():
+                # nothing visible drawn
+                continue
+
+            num = len(self.states)
+            self.states.append(state)
+            self.bounds.append(r)
+            for cell in self._cellsOverlapping(r):
+                self.cells.setdefault(cell, []).append(num)
+
+    def _cellsOverlapping(self, r):
+        """Return cells overlapping rectangle."""
+        c = self.cellsize
+        x1, x2 = int(r.left()//c), int(r.right()//c)
+        y1, y2 = int(r.top()//c), int(r.bottom()//c)
+        return [ (cx, cy) for cx in crange(x1, x2+1)
+                 for cy in crange(y1, y2+1) ]
+
+    def candidates(self, rect):
+        """Return states which may have drawn in rect, last drawn first."""
+        nums = set()
+        for cell in self._cellsOverlapping(rect):
+            nums.update(self.cells.get(cell, []))
+        return [ self.states[n] for n in sorted(nums, reverse=True)
+                 if self.bounds[n].intersects(rect) ]
+
 class PainterRoot(qt4.QPainter):
     """Base class for painting of widgets."""
 
+    # widget being painted
+    widget = None
+
     def updateMetaData(self, helper):
         """Update metadeta from helper
 
@@ -67,6 +127,7 @@ class PainterRoot(qt4.QPainter):
         self.dpi = helper.dpi[1]
         self.pagesize = helper.pagesize
         self.maxdim = max(*self.pagesize)
+        self.spritemarkers = helper.spritemarkers
 
     def docColor(self, name):
         """Return color from document."""
@@ -77,9 +138,14 @@ class PainterRoot(qt4.QPainter):
         return self.colors.getIndex(index+1)
 
     def __enter__(self):
-        pass
+        if self.helper.abortable and self.document.abortpaint:
+            # document is waiting to be modified
+            raise PaintAborted()
+        # time painting of the widget if profiling
+        self.helper.painttimers.push(self.widget, 'paint')
+
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        self.helper.painttimers.pop()
 
 class DirectPainter(PainterRoot):
     """Painter class for direct painting with PaintHelper below.
@@ -95,9 +161,11 @@ class RecordPainter(PainterRoot):
 
     def __enter__(self):
         #print ' '*len(self.helper.widgetstack), self.widget
+        PainterRoot.__enter__(self)
         self.helper.widgetstack.append(self.widget)
 
     def __exit__(self, exc_type, exc_value, traceback):
+        PainterRoot.__exit__(self, exc_type, exc_value, traceback)
         self.helper.widgetstack.pop()
 
 class PaintHelper(object):
@@ -112,7 +180,8 @@ class PaintHelper(object):
     """
 
     def __init__(self, document, pagesize,
-                 scaling=1., dpi=(100, 100), directpaint=None):
+                 scaling=1., dpi=(100, 100), directpaint=None,
+                 spritemarkers=False, spriteantialias=True):
         """Initialise using page size (tuple of pixelw, pixelh).
 
         If directpaint is set to a painter, use this directly rather
@@ -120,6 +189,11 @@ class PaintHelper(object):
         case the painter must be a DirectPainter object, and
         save()/restore() must be placed around doing the rendering to
         the painter.
+
+        If spritemarkers is set, markers may be drawn as bitmap
+        sprites rather than vector paths. This should only be used if
+        the output is a bitmap. spriteantialias sets whether these
+        sprites are antialiased.
         """
 
         self.document = document
@@ -145,10 +219,30 @@ class PaintHelper(object):
         # keep track of last widget being plotted
         self.widgetstack = []
 
+        # whether painting stops (raising PaintAborted) if the document
+        # is waiting to be modified
+        self.abortable = False
+
+        # profiling times for widgets being painted (excluding children)
+        self.painttimers = utils.ExclusiveTimerStack(utils.profiler)
+
+        # whether to draw markers as sprites and cache of sprites
+        self.spritemarkers = spritemarkers
+        self.spriteantialias = spriteantialias
+        self.spritecache = {}
+
         # current index for each plotter (if wanting automatic colors)
         self.autoplottercount = 0
         self.autoplottermap = {}
 
+        # index of bounds of states, made when first needed
+        self.stateindex = None
+
+        # data converted to plotter coordinates while drawing, so that
+        # data shared between widgets are converted once
+        # maps (id(data), axis, bounds, axis range) to (data, coords)
+        self.coordcache = {}
+
     @property
     def maxdim(self):
         """Return maximum page dimension (using PaintHelper's DPI)."""
@@ -174,6 +268,7 @@ class PaintHelper(object):
                 layer += 1
 
         s = self.states[(widget, layer)] = DrawState(widget, bounds, clip, self)
+        self.stateindex = None
 
         if self.widgetstack:
             self.states[(self.widgetstack[-1], 0)].children.append(s)
@@ -186,6 +281,7 @@ class PaintHelper(object):
         else:
             # only paint to one output painter
             p = self.directpaint
+            p.widget = widget
             # make sure we get the same state each time
             p.restore()
             p.save()
@@ -197,6 +293,25 @@ class PaintHelper(object):
 
         return p
 
+    def dataToPlotterCoords(self, axis, bounds, data):
+        """Convert data array to plotter coordinates using axis.
+
+        The result is cached until drawing finishes, so it must not
+        be modified.
+        """
+        key = (id(data), axis, tuple(bounds), tuple(axis.plottedrange))
+        try:
+            cacheddata, coords = self.coordcache[key]
+            if cacheddata is data:
+                return coords
+        except KeyError:
+            pass
+
+        coords = axis.dataToPlotterCoords(bounds, data)
+        # keep reference to data so that its id is not reused
+        self.coordcache[key] = (data, coords)
+        return coords
+
     def setControlGraph(self, widget, cgis):
         """Records the control graph list for the widget given."""
         self.states[(widget,0)].cgis = cgis
@@ -216,9 +331,10 @@ class PaintHelper(object):
     def _renderState(self, state, painter, indent=0):
         """Render state to painter."""
 
-        painter.save()
-        state.record.play(painter)
-        painter.restore()
+        with utils.profiler.timer(state.widget, 'playback'):
+            painter.save()
+            state.record.play(painter)
+            painter.restore()
 
         for child in state.children:
             #print '  '*indent, child.widget
@@ -229,26 +345,26 @@ class PaintHelper(object):
 
         Returns the widget drawn last on the point, or None if it is
         an empty part of the page.
-        root is the root widget to recurse from
         if antialias is true, do test for antialiased drawing
+
+        Only the states whose bounds overlap the point are replayed,
+        starting with the last drawn.
         """
-        
+
+        if self.stateindex is None:
+            self.stateindex = _StateIndex(self.rootstate)
+
         # make a small image filled with a specific color
         box = 3
         specialcolor = qt4.QColor(254, 255, 254)
         origpix = qt4.QPixmap(2*box+1, 2*box+1)
         origpix.fill(specialcolor)
         origimg = origpix.toImage()
-        # store most recent widget here
-        lastwidget = [None]
-        
-        def rendernextstate(state):
-            """Recursively draw painter.
-
-            Checks whether drawing a widgetchanges the small image
-            around the point given.
-            """
 
+        rect = qt4.QRectF(x-box, y-box, box*2+1, box*2+1)
+        for state in self.stateindex.candidates(rect):
+            # check whether drawing the state changes the small image
+            # around the point given
             pixmap = qt4.QPixmap(origpix)
             painter = qt4.QPainter(pixmap)
             painter.setRenderHint(qt4.QPainter.Antialiasing, antialias)
@@ -261,13 +377,9 @@ class PaintHelper(object):
             newimg = pixmap.toImage()
 
             if newimg != origimg:
-                lastwidget[0] = state.widget
-
-            for child in state.children:
-                rendernextstate(child)
+                return state.widget
 
-        rendernextstate(self.rootstate)
-        return lastwidget[0]
+        return None
 
     def pointInWidgetBounds(self, x, y, widgettype):
         """Which graph widget plots at point x,y?
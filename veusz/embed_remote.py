@@ -56,6 +56,7 @@ class EmbeddedClient(object):
         self.ci.addCommand('MoveToPage', self.cmdMoveToPage)
         self.ci.addCommand('IsClosed', self.cmdIsClosed)
         self.ci.addCommand('SetAntiAliasing', self.cmdSetAntiAliasing)
+        self.ci.addCommand('ProfileOverlay', self.cmdProfileOverlay)
         self.ci.addCommand('Wipe', self.cmdWipe)
         self.ci.addCommand('_apiVersion', self.cmd_apiVersion)
 
@@ -106,6 +107,14 @@ class EmbeddedClient(object):
         """
         self.window.setAntiAliasing(ison)
 
+    def cmdProfileOverlay(self, show=True):
+        """ProfileOverlay(show=True)
+
+        Show or hide the time taken to draw each widget on the plot.
+        This enables profiling if showing.
+        """
+        self.plot.setProfileOverlay(show)
+
     def cmdEnableToolbar(self, enable=True):
         """EnableToolbar(enable=True)
 
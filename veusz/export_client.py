@@ -0,0 +1,145 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""Client for submitting export jobs to a Veusz export server.
+
+The server is started with "veusz --export-server SOCKET". Jobs are
+sent over the UNIX domain socket as lines of JSON, of the form
+ {"id": 1, "document": "/path/doc.vsz",
+  "exports": [{"filename": "/path/out.png", "dpi": 200}]}
+where the items in each export are arguments to the Export command.
+The server replies with a line of JSON for each job, which may not be
+in the order the jobs were sent:
+ {"id": 1, "status": "ok", "worker": 1234,
+  "times": {"load": 0.01, "export": 0.05, "total": 0.07}}
+If the job failed, status is "error" and "error" gives the message.
+
+This module does not import Qt, so that submitting jobs is fast.
+"""
+
+from __future__ import division, print_function
+import sys
+import os.path
+import json
+import socket
+import optparse
+
+def encodeMessage(msg):
+    """Convert message to line of bytes to send."""
+    return (json.dumps(msg) + '\n').encode('utf-8')
+
+def decodeMessage(line):
+    """Convert line of bytes received to message."""
+    return json.loads(line.decode('utf-8'))
+
+def submitJobs(socketname, jobs):
+    """Send jobs to the export server listening on socketname.
+
+    jobs is a list of (document filename, list of export argument
+    dicts). Filenames are made absolute before sending.
+
+    Returns a list of replies from the server, in the order of jobs.
+    """
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socketname)
+    try:
+        # send all the jobs so that they can run in parallel
+        for i, (docfilename, exports) in enumerate(jobs):
+            exports = [dict(e) for e in exports]
+            for e in exports:
+                e['filename'] = os.path.abspath(e['filename'])
+            sock.sendall(encodeMessage({
+                'id': i,
+                'document': os.path.abspath(docfilename),
+                'exports': exports}))
+        sock.shutdown(socket.SHUT_WR)
+
+        replies = [None]*len(jobs)
+        rfile = sock.makefile('rb')
+        for line in rfile:
+            reply = decodeMessage(line)
+            if reply.get('id') in range(len(jobs)):
+                replies[reply['id']] = reply
+        rfile.close()
+    finally:
+        sock.close()
+
+    for i, reply in enumerate(replies):
+        if reply is None:
+            replies[i] = {'id': i, 'status': 'error',
+                          'error': 'No reply from server'}
+    return replies
+
+def run():
+    """Run command line client."""
+
+    parser = optparse.OptionParser(
+        usage='%prog [options] SOCKET DOCUMENT OUTPUT [DOCUMENT OUTPUT...]',
+        description='Export Veusz documents to the output files using a'
+        ' server started with "veusz --export-server SOCKET".')
+    parser.add_option('--dpi', type='int', metavar='DPI',
+                      help='dots per inch for bitmap output files')
+    parser.add_option('--page', type='int', metavar='PAGE',
+                      help='page number to export (starting from 0)')
+    parser.add_option('--quiet', action='store_true',
+                      help='do not write times of successful jobs')
+    options, args = parser.parse_args()
+
+    if len(args) < 3 or len(args) % 2 != 1:
+        parser.error('need socket and pairs of documents and output files')
+
+    extra = {}
+    if options.dpi is not None:
+        extra['dpi'] = options.dpi
+    if options.page is not None:
+        extra['page'] = options.page
+
+    socketname = args[0]
+    jobs = []
+    for docfilename, outfilename in zip(args[1::2], args[2::2]):
+        exportargs = dict(extra)
+        exportargs['filename'] = outfilename
+        jobs.append( (docfilename, [exportargs]) )
+
+    try:
+        replies = submitJobs(socketname, jobs)
+    except socket.error as e:
+        sys.stderr.write('Cannot connect to export server %s: %s\n' % (
+            socketname, e))
+        sys.exit(2)
+
+    failed = False
+    for (docfilename, exports), reply in zip(jobs, replies):
+        outfilename = exports[0]['filename']
+        if reply['status'] == 'ok':
+            if not options.quiet:
+                times = reply['times']
+                print('%s -> %s: load %.1f ms, export %.1f ms, total %.1f ms' % (
+                    docfilename, outfilename, times['load']*1e3,
+                    times['export']*1e3, times['total']*1e3))
+        else:
+            failed = True
+            sys.stderr.write('%s -> %s: %s\n' % (
+                docfilename, outfilename, reply['error']))
+
+    if failed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,357 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+##############################################################################
+
+"""Server which exports documents, run with veusz --export-server.
+
+The server listens on a UNIX domain socket for jobs to load a document
+and export it (see export_client for the protocol). Each job is run
+with a new document in a pool of worker processes. The Veusz modules
+are imported before the workers are started, and each worker creates
+its Qt application once, so that the time taken by a job is mostly
+the time to load and render the document.
+
+Workers report when they start a job, so that if a worker dies (for
+example if killed when out of memory) the job fails with an error,
+rather than the client waiting forever.
+"""
+
+from __future__ import division, print_function
+import sys
+import os
+import errno
+import signal
+import socket
+import threading
+import time
+import optparse
+import multiprocessing
+import multiprocessing.queues
+
+from .compat import cexceptionuser
+from .export_client import encodeMessage, decodeMessage
+
+# use the most precise clock available
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+# application in each worker process
+_app = None
+# queue to tell server which worker is running each job
+_startqueue = None
+
+def _initWorker(unsafemode, startqueue):
+    """Set up a worker process."""
+    global _app, _startqueue
+    _startqueue = startqueue
+
+    # the server handles interrupts
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from . import qtall as qt4
+    from . import document
+    from . import setting
+
+    _app = qt4.QApplication([])
+    setting.transient_settings['unsafe_mode'] = unsafemode
+
+    # loads plugins
+    document.Document()
+
+def _runJob(jobkey, job):
+    """Load and export document in worker, returning reply."""
+
+    from . import document
+
+    _startqueue.put( (jobkey, os.getpid()) )
+    reply = {'id': job.get('id'), 'worker': os.getpid()}
+    try:
+        start = _clock()
+        filename = job['document']
+        doc = document.Document()
+        mode = 'hdf5' if os.path.splitext(filename)[1] == '.vszh5' else 'vsz'
+        doc.load(filename, mode=mode)
+        loaded = _clock()
+
+        interface = document.CommandInterface(doc)
+        for exportargs in job['exports']:
+            interface.Export(**exportargs)
+        done = _clock()
+
+    except Exception as e:
+        reply['status'] = 'error'
+        reply['error'] = cexceptionuser(e)
+    else:
+        reply['status'] = 'ok'
+        reply['times'] = {'load': loaded-start, 'export': done-loaded}
+    return reply
+
+def _processExists(pid):
+    """Is there a process with pid?"""
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno != errno.ESRCH
+    return True
+
+class _JobTracker(object):
+    """Submit jobs to the pool, checking that they finish.
+
+    A job fails if its worker dies or, if timeout is set, it takes
+    longer than timeout seconds (when its worker is killed).
+    """
+
+    def __init__(self, pool, startqueue, timeout):
+        self.pool = pool
+        self.startqueue = startqueue
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.lastkey = 0
+        # running jobs: key -> [connection, job id, submit time,
+        #                       worker pid, worker start time,
+        #                       async result, worker missing]
+        self.jobs = {}
+
+        for target in (self.readStarted, self.monitor):
+            thread = threading.Thread(target=target)
+            thread.daemon = True
+            thread.start()
+
+    def submit(self, conn, job):
+        """Start job for connection."""
+        with self.lock:
+            self.lastkey += 1
+            key = self.lastkey
+            self.jobs[key] = [
+                conn, job.get('id'), _clock(), None, None, None, False]
+
+        args = {'callback': lambda r: self.finish(key, r)}
+        if sys.version_info[0] >= 3:
+            args['error_callback'] = lambda e: self.fail(key, cexceptionuser(e))
+        result = self.pool.apply_async(_runJob, (key, job), **args)
+        with self.lock:
+            if key in self.jobs:
+                self.jobs[key][5] = result
+
+    def finish(self, key, reply):
+        """Send reply to job, unless it has already failed."""
+        with self.lock:
+            if key not in self.jobs:
+                return
+            conn, jobid, start = self.jobs.pop(key)[:3]
+        conn.reply(reply, start)
+
+    def fail(self, key, message):
+        """Make job fail with message."""
+        with self.lock:
+            if key not in self.jobs:
+                return
+            conn, jobid, start = self.jobs.pop(key)[:3]
+        conn.reply({'id': jobid, 'status': 'error', 'error': message}, start)
+
+    def readStarted(self):
+        """Record which worker has started each job."""
+        while True:
+            key, pid = self.startqueue.get()
+            with self.lock:
+                if key in self.jobs:
+                    self.jobs[key][3:5] = [pid, _clock()]
+
+    def monitor(self):
+        """Check running jobs have not failed."""
+        while True:
+            time.sleep(0.5)
+            now = _clock()
+            with self.lock:
+                running = [ (key, info[3], info[4], info[5], info[6])
+                            for key, info in self.jobs.items() ]
+            for key, pid, runstart, result, missing in running:
+                if pid is None:
+                    continue
+                if not _processExists(pid):
+                    # workers exit normally after max-jobs, so only
+                    # fail if the result has not arrived by next poll
+                    if result is not None and result.ready():
+                        continue
+                    if missing:
+                        self.fail(key, 'Worker process %i died' % pid)
+                    else:
+                        with self.lock:
+                            if key in self.jobs:
+                                self.jobs[key][6] = True
+                elif ( self.timeout is not None and
+                       now-runstart > self.timeout ):
+                    self.fail(key, 'Job took longer than %g s' % self.timeout)
+                    # the pool replaces the worker
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+
+class _Connection(object):
+    """Read jobs from a client, sending replies when they finish."""
+
+    def __init__(self, sock, tracker):
+        self.sock = sock
+        self.tracker = tracker
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.finished = False
+
+    def run(self):
+        """Read jobs until the client stops sending."""
+        rfile = self.sock.makefile('rb')
+        try:
+            for line in rfile:
+                self.submit(line)
+        except socket.error:
+            pass
+        rfile.close()
+
+        with self.lock:
+            self.finished = True
+            if self.pending == 0:
+                self.close()
+
+    def close(self):
+        """Close connection to client."""
+        try:
+            # workers forked while the connection is open have a copy
+            # of the socket, so close needs shutdown to end connection
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self.sock.close()
+
+    def submit(self, line):
+        """Start job given by line sent by client."""
+        try:
+            job = decodeMessage(line)
+            if not isinstance(job, dict):
+                raise ValueError('Job is not an object')
+        except ValueError as e:
+            self.reply({'id': None, 'status': 'error',
+                        'error': 'Invalid job: %s' % cexceptionuser(e)},
+                       None)
+            return
+
+        with self.lock:
+            self.pending += 1
+        self.tracker.submit(self, job)
+
+    def reply(self, reply, start):
+        """Send reply to client."""
+        if start is not None and reply['status'] == 'ok':
+            # include time spent waiting for a worker
+            reply['times']['total'] = _clock()-start
+
+        with self.lock:
+            try:
+                self.sock.sendall(encodeMessage(reply))
+            except socket.error:
+                # client has gone away
+                pass
+            if start is not None:
+                self.pending -= 1
+                if self.finished and self.pending == 0:
+                    self.close()
+
+def runserver(args):
+    """Run export server with command line arguments given."""
+
+    parser = optparse.OptionParser(
+        usage='%prog --export-server [options] SOCKET',
+        description='Listen on the UNIX domain socket SOCKET for jobs to'
+        ' export documents, submitted with veusz_export_client.')
+    parser.add_option('--workers', type='int', metavar='N',
+                      default=multiprocessing.cpu_count(),
+                      help='number of worker processes [default: %default]')
+    parser.add_option('--max-jobs', type='int', metavar='N',
+                      help='restart each worker after this many jobs')
+    parser.add_option('--job-timeout', type='float', metavar='SECONDS',
+                      help='fail jobs taking longer than this, killing'
+                      ' their worker')
+    parser.add_option('--unsafe-mode', action='store_true',
+                      help='disable safety checks when loading documents')
+    options, args = parser.parse_args(args)
+    if len(args) != 1:
+        parser.error('need socket filename')
+    if not hasattr(socket, 'AF_UNIX'):
+        parser.error('UNIX domain sockets are not supported on this platform')
+    socketname = args[0]
+
+    # import modules so that workers start with them loaded
+    from . import document
+    from . import widgets
+    from . import dataimport
+    dataimport.loadImporters()
+
+    # workers are forked, so they start with the modules loaded
+    # (spawned workers would also run the main script again)
+    # SimpleQueue is used as it sends without a thread, which would
+    # be lost if a worker dies
+    try:
+        context = multiprocessing.get_context('fork')
+        startqueue = context.SimpleQueue()
+    except AttributeError:
+        # python 2 always forks
+        context = multiprocessing
+        startqueue = multiprocessing.queues.SimpleQueue()
+    pool = context.Pool(
+        processes=max(options.workers, 1), initializer=_initWorker,
+        initargs=(bool(options.unsafe_mode), startqueue),
+        maxtasksperchild=options.max_jobs)
+    tracker = _JobTracker(pool, startqueue, options.job_timeout)
+
+    if os.path.exists(socketname):
+        # remove socket left by previous server
+        os.unlink(socketname)
+    listensock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # only allow current user to submit jobs, creating the socket
+    # with these permissions so it is never accessible to others
+    oldumask = os.umask(0o077)
+    try:
+        listensock.bind(socketname)
+    finally:
+        os.umask(oldumask)
+    os.chmod(socketname, 0o600)
+    listensock.listen(16)
+
+    # stop nicely when terminated
+    def handleterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handleterm)
+
+    print('Veusz export server listening on %s with %i workers' % (
+        socketname, max(options.workers, 1)), file=sys.stderr)
+
+    try:
+        while True:
+            sock, addr = listensock.accept()
+            conn = _Connection(sock, tracker)
+            thread = threading.Thread(target=conn.run)
+            thread.daemon = True
+            thread.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listensock.close()
+        os.unlink(socketname)
+        pool.terminate()
+        pool.join()
@@ -1478,6 +1478,7 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points, long nchunk)
     long ntotal = 0;
     long nparts2 = 0;
     long ntotal2 = 0;
+    const char *errmsg = NULL;
 
     site->zlevel[0] = levels[0];
     site->zlevel[1] = levels[0];
@@ -1486,6 +1487,11 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points, long nchunk)
         site->zlevel[1] = levels[1];
     }
     site->n = site->count = 0;
+
+    /* the tracing does not touch any Python objects, so other
+       threads can run while it happens */
+    Py_BEGIN_ALLOW_THREADS
+
     data_init (site, 0, nchunk);
 
     /* make first pass to compute required sizes for second pass */
@@ -1505,6 +1511,9 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points, long nchunk)
             ntotal -= n;
         }
     }
+
+    Py_END_ALLOW_THREADS
+
     xp0 = (double *) PyMem_Malloc(ntotal * sizeof(double));
     yp0 = (double *) PyMem_Malloc(ntotal * sizeof(double));
     nseg0 = (long *) PyMem_Malloc(nparts * sizeof(long));
@@ -1518,14 +1527,16 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points, long nchunk)
     site->xcp = xp0;
     site->ycp = yp0;
     iseg = 0;
+
+    Py_BEGIN_ALLOW_THREADS
+
     for (;;iseg++)
     {
         n = curve_tracer (site, 1);
         if (ntotal2 + n > ntotal)
         {
-            PyErr_SetString(PyExc_RuntimeError,
-                "curve_tracer: ntotal2, pass 2 exceeds ntotal, pass 1");
-            goto error;
+            errmsg = "curve_tracer: ntotal2, pass 2 exceeds ntotal, pass 1";
+            break;
         }
         if (n == 0)
             break;
@@ -1540,12 +1551,19 @@ cntr_trace(Csite *site, double levels[], int nlevels, int points, long nchunk)
         }
         else
         {
-            PyErr_SetString(PyExc_RuntimeError,
-                "Negative n from curve_tracer in pass 2");
-            goto error;
+            errmsg = "Negative n from curve_tracer in pass 2";
+            break;
         }
     }
 
+    Py_END_ALLOW_THREADS
+
+    if (errmsg != NULL)
+    {
+        PyErr_SetString(PyExc_RuntimeError, errmsg);
+        goto error;
+    }
+
 
     if (points)
     {
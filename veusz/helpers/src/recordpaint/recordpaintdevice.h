@@ -20,6 +20,7 @@
 #define RECORD_PAINT_DEVICE__H
 
 #include <QPaintDevice>
+#include <QRectF>
 #include <QVector>
 #include "paintelement.h"
 #include "recordpaintengine.h"
@@ -38,6 +39,9 @@ public:
 
   int drawItemCount() const { return _engine->drawItemCount(); }
 
+  // bounding rectangle of painting in device coordinates
+  QRectF boundingRect() const { return _bounds; }
+
 public:
   friend class RecordPaintEngine;
 
@@ -48,10 +52,24 @@ private:
     _elements.push_back(el);
   }
 
+  // remove and delete the last element added
+  void removeLastElement()
+  {
+    delete _elements.last();
+    _elements.pop_back();
+  }
+
+  // extend bounding rectangle to include rect
+  void addBounds(const QRectF& rect)
+  {
+    _bounds |= rect;
+  }
+
 private:
   int _width, _height, _dpix, _dpiy;
   RecordPaintEngine* _engine;
   QVector<PaintElement*> _elements;
+  QRectF _bounds;
 };
 
 #endif
@@ -22,6 +22,9 @@
 #include <QLineF>
 #include <QVector>
 #include <QPaintEngine>
+#include <QPolygonF>
+#include <QPolygon>
+#include <QFontMetricsF>
 
 #include "paintelement.h"
 #include "recordpaintengine.h"
@@ -94,18 +97,51 @@ namespace {
   typedef lineElement<QLineF> LineFElement;
 
   // draw QPainterPath
+  // The same path can be drawn again at other positions, where the
+  // transform only differs from the first by its translation (as
+  // for plot markers). These are stored as a list of translations,
+  // rather than as separate elements for the transform and path.
   class PathElement : public PaintElement {
   public:
-    PathElement(const QPainterPath& path)
-      : _path(path) {}
+    PathElement(const QPainterPath& path, const QTransform& t)
+      : _path(path), _t(t) {}
 
-    void paint(QPainter& painter, const QTransform&)
+    void paint(QPainter& painter, const QTransform& origtransform)
     {
+      // the first is drawn with the transform already set
       painter.drawPath(_path);
+
+      const int num = _translations.size();
+      for(int i = 0; i < num; ++i)
+	{
+	  const QPointF& d = _translations[i];
+	  painter.setWorldTransform( QTransform(_t.m11(), _t.m12(),
+						_t.m21(), _t.m22(),
+						d.x(), d.y()) * origtransform );
+	  painter.drawPath(_path);
+	}
+    }
+
+    // can path be added as another position with transform t?
+    bool canRepeat(const QPainterPath& path, const QTransform& t) const
+    {
+      return t.isAffine() && _t.isAffine() &&
+	t.m11() == _t.m11() && t.m12() == _t.m12() &&
+	t.m21() == _t.m21() && t.m22() == _t.m22() &&
+	path.elementCount() == _path.elementCount() &&
+	path == _path;
+    }
+
+    // draw path again using translation of transform t
+    void addRepeat(const QTransform& t)
+    {
+      _translations << QPointF(t.dx(), t.dy());
     }
 
   private:
     QPainterPath _path;
+    QTransform _t;
+    QVector<QPointF> _translations;
   };
 
   // draw Pixmap
@@ -442,6 +478,43 @@ namespace {
   };
 
 
+  ///////////////////////////////////////////////////////////////////
+  // Bounds of drawing
+
+  // bounding rectangle of points (QPoint and QPointF)
+  template <class T>
+  QRectF pointsBounds(const T* points, int pointcount)
+  {
+    qreal minx = points[0].x(), maxx = minx;
+    qreal miny = points[0].y(), maxy = miny;
+    for(int i=1; i<pointcount; ++i)
+      {
+	minx = qMin(minx, qreal(points[i].x()));
+	maxx = qMax(maxx, qreal(points[i].x()));
+	miny = qMin(miny, qreal(points[i].y()));
+	maxy = qMax(maxy, qreal(points[i].y()));
+      }
+    return QRectF(QPointF(minx, miny), QPointF(maxx, maxy));
+  }
+
+  // bounding rectangle of lines (QLine and QLineF)
+  template <class T>
+  QRectF linesBounds(const T* lines, int linecount)
+  {
+    qreal minx = qMin(lines[0].x1(), lines[0].x2());
+    qreal maxx = qMax(lines[0].x1(), lines[0].x2());
+    qreal miny = qMin(lines[0].y1(), lines[0].y2());
+    qreal maxy = qMax(lines[0].y1(), lines[0].y2());
+    for(int i=1; i<linecount; ++i)
+      {
+	minx = qMin(minx, qreal(qMin(lines[i].x1(), lines[i].x2())));
+	maxx = qMax(maxx, qreal(qMax(lines[i].x1(), lines[i].x2())));
+	miny = qMin(miny, qreal(qMin(lines[i].y1(), lines[i].y2())));
+	maxy = qMax(maxy, qreal(qMax(lines[i].y1(), lines[i].y2())));
+      }
+    return QRectF(QPointF(minx, miny), QPointF(maxx, maxy));
+  }
+
   // end anonymous block
 }
 
@@ -451,7 +524,9 @@ namespace {
 RecordPaintEngine::RecordPaintEngine()
   : QPaintEngine(QPaintEngine::AllFeatures),
     _drawitemcount(0),
-    _pdev(0)
+    _pdev(0),
+    _lastpath(0),
+    _lasttransform(0)
 {
 }
 
@@ -459,23 +534,47 @@ bool RecordPaintEngine::begin(QPaintDevice* pdev)
 {
   // old style C cast - probably should use dynamic_cast
   _pdev = (RecordPaintDevice*)(pdev);
+  _transform.reset();
+  _pen = QPen();
+  _lastpath = _lasttransform = 0;
 
   // signal started ok
   return 1;
 }
 
+void RecordPaintEngine::addBounds(const QRectF& rect, bool stroked)
+{
+  QRectF r(rect);
+  // extra pixel in device coordinates for antialiasing
+  qreal devmargin = 1;
+  if( stroked && _pen.style() != Qt::NoPen )
+    {
+      // use the full pen width to allow for caps and miter joins
+      const qreal w = _pen.widthF();
+      if( w <= 0 || _pen.isCosmetic() )
+	devmargin += qMax(w, qreal(1));
+      else
+	r.adjust(-w, -w, w, w);
+    }
+  _pdev->addBounds( _transform.mapRect(r).adjusted(-devmargin, -devmargin,
+						   devmargin, devmargin) );
+}
+
 // for each type of drawing command we add a new element
 // to the list maintained by the device
+// the bounds of the drawing are added to the device
 
 void RecordPaintEngine::drawEllipse(const QRectF& rect)
 {
   _pdev->addElement( new EllipseFElement(rect) );
+  addBounds(rect);
   _drawitemcount++;
 }
 
 void RecordPaintEngine::drawEllipse(const QRect& rect)
 {
   _pdev->addElement( new EllipseElement(rect) );
+  addBounds(rect);
   _drawitemcount++;
 }
 
@@ -485,24 +584,48 @@ void RecordPaintEngine::drawImage(const QRectF& rectangle,
 				  Qt::ImageConversionFlags flags)
 {
   _pdev->addElement( new ImageElement(rectangle, image, sr, flags) );
+  addBounds(rectangle, false);
   _drawitemcount++;
 }
 
 void RecordPaintEngine::drawLines(const QLineF* lines, int lineCount)
 {
   _pdev->addElement( new LineFElement(lines, lineCount) );
+  if( lineCount > 0 )
+    addBounds(linesBounds(lines, lineCount));
   _drawitemcount += lineCount;
 }
 
 void RecordPaintEngine::drawLines(const QLine* lines, int lineCount)
 {
   _pdev->addElement( new LineElement(lines, lineCount) );
+  if( lineCount > 0 )
+    addBounds(linesBounds(lines, lineCount));
   _drawitemcount += lineCount;
 }
 
 void RecordPaintEngine::drawPath(const QPainterPath& path)
 {
-  _pdev->addElement( new PathElement(path) );
+  // if the same path was drawn before the last change of transform,
+  // and only the translation has changed, store the new position
+  // in that element, dropping the transform element
+  const QVector<PaintElement*>& els = _pdev->_elements;
+  const int num = els.size();
+  if( _lastpath != 0 && _lasttransform != 0 && num >= 2 &&
+      els[num-1] == _lasttransform && els[num-2] == _lastpath &&
+      static_cast<PathElement*>(_lastpath)->canRepeat(path, _transform) )
+    {
+      _pdev->removeLastElement();
+      _lasttransform = 0;
+      static_cast<PathElement*>(_lastpath)->addRepeat(_transform);
+    }
+  else
+    {
+      _lastpath = new PathElement(path, _transform);
+      _pdev->addElement(_lastpath);
+    }
+
+  addBounds(path.controlPointRect());
   _drawitemcount++;
 }
 
@@ -510,18 +633,23 @@ void RecordPaintEngine::drawPixmap(const QRectF& r,
 				   const QPixmap& pm, const QRectF& sr)
 {
   _pdev->addElement( new PixmapElement(r, pm, sr) );
+  addBounds(r, false);
   _drawitemcount++;
 }
 
 void RecordPaintEngine::drawPoints(const QPointF* points, int pointCount)
 {
   _pdev->addElement( new PointFElement(points, pointCount) );
+  if( pointCount > 0 )
+    addBounds(pointsBounds(points, pointCount));
   _drawitemcount += pointCount;
 }
 
 void RecordPaintEngine::drawPoints(const QPoint* points, int pointCount)
 {
   _pdev->addElement( new PointElement(points, pointCount) );
+  if( pointCount > 0 )
+    addBounds(pointsBounds(points, pointCount));
   _drawitemcount += pointCount;
 }
 
@@ -529,6 +657,8 @@ void RecordPaintEngine::drawPolygon(const QPointF* points, int pointCount,
 				    QPaintEngine::PolygonDrawMode mode)
 {
   _pdev->addElement( new PolygonFElement(points, pointCount, mode) );
+  if( pointCount > 0 )
+    addBounds(pointsBounds(points, pointCount));
   _drawitemcount += pointCount;
 }
 
@@ -536,18 +666,24 @@ void RecordPaintEngine::drawPolygon(const QPoint* points, int pointCount,
 				    QPaintEngine::PolygonDrawMode mode)
 {
   _pdev->addElement( new PolygonElement(points, pointCount, mode) );
+  if( pointCount > 0 )
+    addBounds(pointsBounds(points, pointCount));
   _drawitemcount += pointCount;
 }
 
 void RecordPaintEngine::drawRects(const QRectF* rects, int rectCount)
 {
   _pdev->addElement( new RectFElement( rects, rectCount ) );
+  for(int i = 0; i < rectCount; i++)
+    addBounds(rects[i]);
   _drawitemcount += rectCount;
 }
 
 void RecordPaintEngine::drawRects(const QRect* rects, int rectCount)
 {
   _pdev->addElement( new RectElement( rects, rectCount ) );
+  for(int i = 0; i < rectCount; i++)
+    addBounds(QRectF(rects[i]));
   _drawitemcount += rectCount;
 }
 
@@ -555,6 +691,8 @@ void RecordPaintEngine::drawTextItem(const QPointF& p,
 				     const QTextItem& textItem)
 {
   _pdev->addElement( new TextElement(p, textItem) );
+  QFontMetricsF fm(textItem.font(), _pdev);
+  addBounds(fm.boundingRect(textItem.text()).translated(p), false);
   _drawitemcount += textItem.text().length();
 }
 
@@ -563,6 +701,7 @@ void RecordPaintEngine::drawTiledPixmap(const QRectF& rect,
 					      const QPointF& p)
 {
   _pdev->addElement( new TiledPixmapElement(rect, pixmap, p) );
+  addBounds(rect, false);
   _drawitemcount += 1;
 }
 
@@ -602,11 +741,18 @@ void RecordPaintEngine::updateState(const QPaintEngineState& state)
   if( flags & QPaintEngine::DirtyFont )
     _pdev->addElement( new FontElement( state.font(), _pdev->_dpiy ) );
   if( flags & QPaintEngine::DirtyTransform )
-    _pdev->addElement( new TransformElement( state.transform() ) );
+    {
+      _lasttransform = new TransformElement( state.transform() );
+      _pdev->addElement( _lasttransform );
+      _transform = state.transform();
+    }
   if( flags & QPaintEngine::DirtyClipEnabled )
     _pdev->addElement( new ClipEnabledElement( state.isClipEnabled() ) );
   if( flags & QPaintEngine::DirtyPen )
-    _pdev->addElement( new PenElement( state.pen() ) );
+    {
+      _pdev->addElement( new PenElement( state.pen() ) );
+      _pen = state.pen();
+    }
   if( flags & QPaintEngine::DirtyHints )
     _pdev->addElement( new HintsElement( state.renderHints() ) );
 }
@@ -29,8 +29,11 @@
 #include <QRectF>
 #include <QRect>
 #include <QPixmap>
+#include <QPen>
+#include <QTransform>
 
 class RecordPaintDevice;
+class PaintElement;
 
 class RecordPaintEngine : public QPaintEngine
 {
@@ -67,9 +70,22 @@ public:
   // return an estimate of number of items drawn
   int drawItemCount() const { return _drawitemcount; }
 
+private:
+  // add rectangle in painter coordinates to bounds of device
+  // if stroked, allow for the width of the pen
+  void addBounds(const QRectF& rect, bool stroked=true);
+
 private:
   int _drawitemcount;
   RecordPaintDevice* _pdev;
+
+  // current transform and pen, for computing bounds
+  QTransform _transform;
+  QPen _pen;
+
+  // last path and transform elements added, for repeating paths
+  PaintElement* _lastpath;
+  PaintElement* _lasttransform;
 };
 
 #endif
@@ -48,9 +48,15 @@ class DatasetPluginException(RuntimeError):
 
 def numpyCopyOrNone(data):
     """If data is None return None
-    Otherwise return a numpy array corresponding to data."""
+    Otherwise return a numpy array corresponding to data.
+
+    Copy-on-write memory mapped float64 arrays are not copied, so
+    that they are not read until used."""
     if data is None:
         return None
+    if ( isinstance(data, N.memmap) and data.dtype == N.float64 and
+         data.mode == 'c' ):
+        return data
     return N.array(data, dtype=N.float64)
 
 class _DatasetBase(object):
@@ -127,7 +133,7 @@ class Dataset2D(_DatasetBase):
     def update(self, data=[[]], rangex=None, rangey=None,
                xedge=None, yedge=None,
                xcent=None, ycent=None):
-        self.data = N.array(data, dtype=N.float64)
+        self.data = numpyCopyOrNone(data)
         self.rangex = rangex
         self.rangey = rangey
         self.xedge = xedge
@@ -164,7 +170,7 @@ class DatasetND(_DatasetBase):
         self.update(data=data)
 
     def update(self, data=[]):
-        self.data = N.array(data, dtype=N.float64)
+        self.data = numpyCopyOrNone(data)
 
     def _null(self):
         """Empty data contents."""
@@ -20,6 +20,8 @@
 
 from __future__ import division
 import os.path
+import struct
+import zipfile
 import numpy as N
 
 from ..compat import crange, cstr, cstrerror
@@ -442,16 +444,84 @@ class ImportPluginQdp(ImportPlugin):
 
         return rqdp.retndata
 
+def loadNpy(filename):
+    """Load a NPY file, memory mapping the array if possible.
+
+    Mapped arrays are copy-on-write, so they are only read when used
+    and changes are not written back to the file.
+    """
+    try:
+        return N.load(filename, mmap_mode='c')
+    except ValueError:
+        # object arrays cannot be mapped
+        return N.load(filename)
+
+def readNpyHeader(fileobj):
+    """Read NPY header from file, returning (shape, fortran, dtype)."""
+    version = N.lib.format.read_magic(fileobj)
+    if version == (1, 0):
+        return N.lib.format.read_array_header_1_0(fileobj)
+    elif version == (2, 0):
+        return N.lib.format.read_array_header_2_0(fileobj)
+    raise ValueError('Unsupported NPY version')
+
+def npzMemberHeader(filename, npzfile, name):
+    """Read header of array in NPZ file without reading its data.
+
+    Returns (shape, fortran, dtype, offset), where offset is the
+    position of the data in the file if the array is stored without
+    compression, or None otherwise.
+    """
+
+    info = npzfile.zip.getinfo(name + '.npy')
+    with open(filename, 'rb') as f:
+        # skip over zip local file header
+        f.seek(info.header_offset)
+        hdr = f.read(30)
+        if hdr[:4] != b'PK\x03\x04':
+            raise ValueError('Invalid zip file header')
+        fnlen, extralen = struct.unpack('<HH', hdr[26:30])
+        f.seek(info.header_offset + 30 + fnlen + extralen)
+
+        if info.compress_type == zipfile.ZIP_STORED:
+            shape, fortran, dtype = readNpyHeader(f)
+            offset = f.tell()
+        else:
+            with npzfile.zip.open(name + '.npy') as mf:
+                shape, fortran, dtype = readNpyHeader(mf)
+            offset = None
+    return shape, fortran, dtype, offset
+
+def npzMemberArray(filename, npzfile, name):
+    """Get array from NPZ file.
+
+    Arrays stored without compression are memory mapped (copy-on-write).
+    """
+    try:
+        shape, fortran, dtype, offset = npzMemberHeader(
+            filename, npzfile, name)
+    except (ValueError, KeyError, EnvironmentError, struct.error):
+        return npzfile[name]
+
+    if offset is None or dtype.hasobject or N.prod(shape) == 0:
+        return npzfile[name]
+    return N.memmap(filename, dtype=dtype, mode='c', offset=offset,
+                    shape=shape, order='F' if fortran else 'C')
+
 def cnvtImportNumpyArray(name, val, errorsin2d=True):
-    """Convert a numpy array to plugin returns."""
+    """Convert a numpy array to plugin returns.
+
+    Memory mapped float64 arrays are not copied."""
 
     try:
         val.shape
     except AttributeError:
         raise ImportPluginException(_("Not the correct format file"))
     try:
-        val + 0.
-        val = val.astype(N.float64)
+        if val.dtype.kind not in 'biuf':
+            # check values can be treated as numbers
+            val + 0.
+        val = val.astype(N.float64, copy=False)
     except TypeError:
         raise ImportPluginException(_("Unsupported array type"))
 
@@ -497,7 +567,8 @@ class ImportPluginNpy(ImportPlugin):
         Returns (text, okaytoimport)
         """
         try:
-            retn = N.load(params.filename)
+            # only the parts of the array shown are read
+            retn = loadNpy(params.filename)
         except Exception:
             return _("Cannot read file"), False
 
@@ -519,7 +590,7 @@ class ImportPluginNpy(ImportPlugin):
             raise ImportPluginException(_("Please provide a name for the dataset"))
 
         try:
-            retn = N.load(params.filename)
+            retn = loadNpy(params.filename)
         except Exception as e:
             raise ImportPluginException(_("Error while reading file: %s") %
                                         cstr(e))
@@ -561,11 +632,18 @@ class ImportPluginNpz(ImportPlugin):
 
         text = []
         for f in sorted(retn.files):
-            a = retn[f]
+            try:
+                # avoid reading the array if possible
+                shape, fortran, dtype, offset = npzMemberHeader(
+                    params.filename, retn, f)
+            except Exception:
+                a = retn[f]
+                shape, dtype = a.shape, a.dtype
             text.append(_('Name: %s') % f)
-            text.append(_(' Shape: %s') % str(a.shape))
-            text.append(_(' Datatype: %s (%s)') % (a.dtype.str, str(a.dtype)))
+            text.append(_(' Shape: %s') % str(shape))
+            text.append(_(' Datatype: %s (%s)') % (dtype.str, str(dtype)))
             text.append('')
+        retn.close()
         return '\n'.join(text), True
 
     def doImport(self, params):
@@ -587,7 +665,9 @@ class ImportPluginNpz(ImportPlugin):
         out = []
         for f in sorted(retn.files):
             out.append( cnvtImportNumpyArray(
-                    f, retn[f], errorsin2d=params.field_results["errorsin2d"]) )
+                    f, npzMemberArray(params.filename, retn, f),
+                    errorsin2d=params.field_results["errorsin2d"]) )
+        retn.close()
 
         return out
 
@@ -610,9 +690,14 @@ class ImportPluginBinary(ImportPlugin):
             field.FieldCombo("endian", descr=_("Endian (byte order)"),
                              items = ("little", "big"), editable=False),
             field.FieldInt("offset", descr=_("Offset (bytes)"), default=0, minval=0),
-            field.FieldInt("length", descr=_("Length (values)"), default=-1)
+            field.FieldInt("length", descr=_("Length (values)"), default=-1),
+            field.FieldInt("stride", descr=_("Stride (values)"), default=1,
+                           minval=1),
             ]
 
+    # maximum number of bytes to show in preview
+    previewbytes = 65536
+
     def getNumpyDataType(self, params):
         """Convert params to numpy datatype."""
         t = N.dtype(str(params.field_results["datatype"]))
@@ -622,26 +707,27 @@ class ImportPluginBinary(ImportPlugin):
     def getPreview(self, params):
         """Preview of data files."""
         try:
-            f = open(params.filename, "rb")
-            data = f.read()
-            f.close()
+            with open(params.filename, "rb") as f:
+                # only read the start of the file
+                data = bytearray(f.read(self.previewbytes))
+            length = os.path.getsize(params.filename)
         except EnvironmentError as e:
             return _("Cannot read file (%s)") % cstrerror(e), False
 
-        text = [_('File length: %i bytes') % len(data)]
+        text = [_('File length: %i bytes') % length]
 
         def filtchr(c):
             """Filtered character to ascii range."""
-            if ord(c) <= 32 or ord(c) > 127:
+            if c <= 32 or c > 127:
                 return '.'
             else:
-                return c
+                return chr(c)
 
         # do a hex dump (like in CP/M)
-        for i in crange(0, min(65536, len(data)), 16):
+        for i in crange(0, len(data), 16):
             hdr = '%04X  ' % i
             subset = data[i:i+16]
-            hexdata = ('%02X '*len(subset)) % tuple([ord(x) for x in subset])
+            hexdata = ('%02X '*len(subset)) % tuple(subset)
             chrdata = ''.join([filtchr(c) for c in subset])
 
             text.append(hdr+hexdata + '  ' + chrdata)
@@ -655,23 +741,32 @@ class ImportPluginBinary(ImportPlugin):
         if not name:
             raise ImportPluginException(_("Please provide a name for the dataset"))
 
+        dtype = self.getNumpyDataType(params)
+        offset = params.field_results["offset"]
+        length = params.field_results["length"]
+        stride = params.field_results.get("stride", 1)
+
         try:
-            f = open(params.filename, "rb")
-            f.seek( params.field_results["offset"] )
-            retn = f.read()
-            f.close()
+            # number of values available in file after offset
+            avail = max(os.path.getsize(params.filename) - offset, 0) // (
+                dtype.itemsize)
+            count = avail if length < 0 else min(length, avail)
+
+            if count == 0:
+                data = N.array([], dtype=dtype)
+            else:
+                # map file, so that skipped values are not read
+                data = N.memmap(params.filename, dtype=dtype, mode='c',
+                                offset=offset, shape=(count,))
         except EnvironmentError as e:
             raise ImportPluginException(_("Error while reading file '%s'\n\n%s") %
                                         (params.filename, cstrerror(e)))
-
-        try:
-            data = N.fromstring(retn, dtype=self.getNumpyDataType(params),
-                                count=params.field_results["length"])
         except ValueError as e:
             raise ImportPluginException(_("Error converting data for file '%s'\n\n%s") %
                                         (params.filename, cstr(e)))
 
-        data = data.astype(N.float64)
+        # native float64 data are left mapped
+        data = data[::stride].astype(N.float64, copy=False)
         return [ datasetplugin.Dataset1D(name, data) ]
 
 class ImportPluginGnuplot2D(ImportPlugin):
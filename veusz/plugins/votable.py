@@ -20,15 +20,19 @@ from __future__ import division, print_function
 from ..compat import CStringIO, CBytesIO, curlrequest
 from .importplugin import ImportPlugin, importpluginregistry
 from .datasetplugin import Dataset1D, DatasetText
+from .. import utils
 
-try:
+def _parse(*args, **argsv):
+    """Parse a VO table, importing astropy when first needed, as it is
+    slow to import."""
     import astropy.version
-    if [int(x) for x in astropy.version.version.split('.')] >= [0, 2]:
+    if [int(x) for x in astropy.version.version.split('.')[:2]] >= [0, 2]:
         from astropy.io.votable.table import parse
     else:
         from astropy.io.vo.table import parse
+    return parse(*args, **argsv)
 
-except ImportError:
+if not utils.moduleAvailable('astropy'):
     print('VO table import: astropy module not available')
 
 else:
@@ -45,9 +49,9 @@ else:
                 except TypeError:
                     buff = CBytesIO(curlrequest.urlopen(
                             params.field_results['url']).read())
-                return parse(buff, filename=params.filename)
+                return _parse(buff, filename=params.filename)
             else:
-                return parse(params.filename)
+                return _parse(params.filename)
 
         def doImport(self, params):
             result = []
@@ -21,13 +21,18 @@
 
 from __future__ import division
 import os.path
-import numpy as N
+import sys
 import textwrap
+import threading
+import traceback
+import weakref
+import numpy as N
 
-from ..compat import crange, citems, czip, cbasestr, cstr
+from ..compat import crange, citems, cvalues, czip, cbasestr, cstr
 from .. import qtall as qt4
 from .. import setting
 from .. import document
+from .. import datasets
 from .. import utils
 
 from .lineeditwithclear import LineEditWithClear
@@ -47,10 +52,168 @@ def wrap(text, width):
     out = [textwrap.fill(l, width).strip() for l in lines]
     return "\n\n".join(out)
 
+def _drawPreview(y, size):
+    """Draw a preview of values y as an image, returning html text or
+    None if there is nothing to draw.
+
+    This is called in the preview thread, so only uses QImage.
+    """
+
+    img = qt4.QImage(size[0], size[1], qt4.QImage.Format_ARGB32_Premultiplied)
+    img.fill(0)
+    p = qt4.QPainter(img)
+    p.setRenderHint(qt4.QPainter.Antialiasing)
+
+    # calculate data points
+    try:
+        x = N.arange(len(y))
+
+        # plot data points on image
+        minval, maxval = N.nanmin(y), N.nanmax(y)
+        y = (y-minval) / (maxval-minval) * size[1]
+        finite = N.isfinite(y)
+        x, y = x[finite], y[finite]
+        x = x * (1./len(x)) * size[0]
+
+        poly = qt4.QPolygonF()
+        utils.addNumpyToPolygonF(poly, x, size[1]-y)
+        p.setPen( qt4.QPen(qt4.Qt.blue) )
+        p.drawPolyline(poly)
+
+        # draw x axis if span 0
+        p.setPen( qt4.QPen(qt4.Qt.black) )
+        if minval <= 0 and maxval > 0:
+            y0 = size[1] - (0-minval)/(maxval-minval)*size[1]
+            p.drawLine(x[0], y0, x[-1], y0)
+        else:
+            p.drawLine(x[0], size[1], x[-1], size[1])
+        p.drawLine(x[0], 0, x[0], size[1])
+
+    except (ValueError, ZeroDivisionError):
+        # zero sized array after filtering or min == max, so return None
+        p.end()
+        return None
+
+    p.end()
+    return utils.imageAsHtml(img)
+
+class DatasetPreviews(qt4.QObject):
+    """Draw previews of 1D datasets in a background thread.
+
+    Previews are cached for each dataset until its data array is
+    replaced or invalidate() is called.
+    """
+
+    size = (140, 70)
+
+    # emitted with dataset when its preview has been drawn
+    sigPreviewReady = qt4.pyqtSignal(object)
+    # emitted by thread with (dataset weakref, (job, html))
+    sigDrawn = qt4.pyqtSignal(object, object)
+
+    def __init__(self):
+        qt4.QObject.__init__(self)
+        # dataset -> (weakref to data, html)
+        self.previews = weakref.WeakKeyDictionary()
+        # dataset -> (weakref to data, values) for previews being drawn
+        self.pending = weakref.WeakKeyDictionary()
+        self.jobs = []
+        self.lock = threading.Lock()
+        self.sem = threading.Semaphore(0)
+        self.thread = None
+        self.sigDrawn.connect(self.slotDrawn)
+
+    def preview(self, ds):
+        """Return html preview of dataset if ready. Otherwise, start
+        drawing the preview and return None."""
+
+        if ds.dimensions != 1 or ds.datatype != "numeric":
+            return None
+        data = ds.data
+        try:
+            dataref = weakref.ref(data)
+        except TypeError:
+            return None
+
+        entry = self.previews.get(ds)
+        if entry is not None and entry[0]() is data:
+            return entry[1]
+        job = self.pending.get(ds)
+        if job is not None and job[0]() is data:
+            # already being drawn
+            return None
+
+        # the thread gets a copy of the values to plot
+        size = self.size
+        if len(data) < size[1]:
+            y = N.array(data, dtype=N.float64)
+        else:
+            y = N.array(data[::len(data)//size[1]+1], dtype=N.float64)
+
+        job = (dataref, y)
+        self.pending[ds] = job
+        with self.lock:
+            self.jobs.append( (weakref.ref(ds), job) )
+        self.sem.release()
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run)
+            self.thread.daemon = True
+            self.thread.start()
+        return None
+
+    def invalidate(self, ds):
+        """Forget preview of dataset, e.g. if values changed in place."""
+        self.previews.pop(ds, None)
+        self.pending.pop(ds, None)
+
+    def run(self):
+        """Draw previews in thread."""
+        while True:
+            self.sem.acquire()
+            with self.lock:
+                dsref, job = self.jobs.pop(0)
+            try:
+                html = _drawPreview(job[1], self.size)
+            except Exception:
+                sys.stderr.write(_("Error drawing dataset preview\n"))
+                traceback.print_exc(file=sys.stderr)
+                html = None
+            self.sigDrawn.emit(dsref, (job, html))
+
+    def slotDrawn(self, dsref, result):
+        """Store drawn preview (called in main thread)."""
+        job, html = result
+        ds = dsref()
+        if ds is None or self.pending.get(ds) is not job:
+            # dataset deleted or values changed since job started
+            return
+        del self.pending[ds]
+        self.previews[ds] = (job[0], html)
+        self.sigPreviewReady.emit(ds)
+
+_previews = None
+def datasetPreviews():
+    """Get DatasetPreviews object shared by dataset browsers."""
+    global _previews
+    if _previews is None:
+        _previews = DatasetPreviews()
+    return _previews
+
 class DatasetNode(TMNode):
     """Node for a dataset."""
 
-    def __init__(self, model, dsname, cols, parent):
+    def __init__(self, model, dsname, cols, parent, data=None):
+        if data is None:
+            data = DatasetNode.makeData(model, dsname, cols)
+        TMNode.__init__(self, data, parent)
+        self.model = model
+        self.cols = cols
+        self.dsname = dsname
+
+    @staticmethod
+    def makeData(model, dsname, cols):
+        """Make tuple of data shown for dataset in columns."""
         ds = model.doc.data[dsname]
         data = []
         assert cols[0] == "name"
@@ -65,60 +228,7 @@ class DatasetNode(TMNode):
                 data.append( os.path.basename(datasetLinkFile(ds)) )
             elif c == "check":
                 data.append( dsname in model.checked_datasets )
-
-        TMNode.__init__(self, tuple(data), parent)
-        self.model = model
-        self.cols = cols
-        self.dsname = dsname
-
-    def getPreviewPixmap(self, ds):
-        """Get a preview pixmap for a dataset."""
-        size = (140, 70)
-        if ds.dimensions != 1 or ds.datatype != "numeric":
-            return None
-
-        pixmap = qt4.QPixmap(*size)
-        pixmap.fill(qt4.Qt.transparent)
-        p = qt4.QPainter(pixmap)
-        p.setRenderHint(qt4.QPainter.Antialiasing)
-
-        # calculate data points
-        try:
-            if len(ds.data) < size[1]:
-                y = ds.data
-            else:
-                intvl = len(ds.data)//size[1]+1
-                y = ds.data[::intvl]
-            x = N.arange(len(y))
-
-            # plot data points on image
-            minval, maxval = N.nanmin(y), N.nanmax(y)
-            y = (y-minval) / (maxval-minval) * size[1]
-            finite = N.isfinite(y)
-            x, y = x[finite], y[finite]
-            x = x * (1./len(x)) * size[0]
-
-            poly = qt4.QPolygonF()
-            utils.addNumpyToPolygonF(poly, x, size[1]-y)
-            p.setPen( qt4.QPen(qt4.Qt.blue) )
-            p.drawPolyline(poly)
-
-            # draw x axis if span 0
-            p.setPen( qt4.QPen(qt4.Qt.black) )
-            if minval <= 0 and maxval > 0:
-                y0 = size[1] - (0-minval)/(maxval-minval)*size[1]
-                p.drawLine(x[0], y0, x[-1], y0)
-            else:
-                p.drawLine(x[0], size[1], x[-1], size[1])
-            p.drawLine(x[0], 0, x[0], size[1])
-
-        except (ValueError, ZeroDivisionError):
-            # zero sized array after filtering or min == max, so return None
-            p.end()
-            return None
-
-        p.end()
-        return pixmap
+        return tuple(data)
 
     def toolTip(self, column):
         """Return tooltip for column."""
@@ -138,10 +248,13 @@ class DatasetNode(TMNode):
         elif c == "size" or (c == 'type' and 'size' not in self.cols):
             text = ds.userPreview()
             # add preview of dataset if possible
-            pix = self.getPreviewPixmap(ds)
-            if pix:
+            img = datasetPreviews().preview(ds)
+            if img:
                 text = text.replace("\n", "<br>")
-                text = "<html>%s<br>%s</html>" % (text, utils.pixmapAsHtml(pix))
+                text = "<html>%s<br>%s</html>" % (text, img)
+            else:
+                # show tooltip again when preview is ready
+                self.model.tooltipnode = (self, column)
             return text
         elif c == "linkfile" or c == "type":
             return wrap(ds.linkedInformation(), 40)
@@ -161,7 +274,7 @@ class DatasetNode(TMNode):
     def cloneTo(self, newroot):
         """Make a clone of self at the root given."""
         return self.__class__(
-            self.model, self.dsname, self.cols, newroot)
+            self.model, self.dsname, self.cols, newroot, data=self.data)
 
 class FilenameNode(TMNode):
     """A special node for holding filenames of files."""
@@ -185,15 +298,12 @@ class FilenameNode(TMNode):
             return self.data[0]
         return None
 
-def treeFromList(nodelist, rootdata):
-    """Construct a tree from a list of nodes."""
-    tree = TMNode( rootdata, None )
-    for node in nodelist:
-        tree.insertChildSorted(node)
-    return tree
-
 class DatasetRelationModel(TreeModel):
     """A model to show how the datasets are related to each file."""
+
+    # rebuild tree rather than updating if more datasets change
+    maxupdates = 100
+
     def __init__(self, doc, grouping="filename", readonly=False,
                  filterdims=None, filterdtype=None,
                  checkable=False):
@@ -215,12 +325,18 @@ class DatasetRelationModel(TreeModel):
         self.filterdtype = filterdtype
         self.checkable = checkable
         self.checked_datasets = set()
+
+        # node waiting for preview to show tooltip, and column
+        self.tooltipnode = None
+        self.treegrouping = None
         self.refresh()
 
-        doc.signalModified.connect(self.refresh)
+        doc.signalModified.connect(self.slotDocModified)
+        datasetPreviews().sigPreviewReady.connect(self.slotPreviewReady)
 
-    def datasetFilterOut(self, ds, node):
-        """Should dataset be filtered out by filter options."""
+    def datasetFilterOut(self, ds, data):
+        """Should dataset be filtered out by filter options.
+        data is the tuple of data for the dataset node."""
         filterout = False
 
         # is filter text not in node text or text
@@ -230,7 +346,7 @@ class DatasetRelationModel(TreeModel):
             if any([t.find(self.filter) >= 0 for t in ds.tags
                     if isinstance(t, cbasestr)]):
                 keep = True
-            if any([t.find(self.filter) >= 0 for t in node.data
+            if any([t.find(self.filter) >= 0 for t in data
                     if isinstance(t, cbasestr)]):
                 keep = True
         # check dimensions haven't been filtered
@@ -246,94 +362,154 @@ class DatasetRelationModel(TreeModel):
             return True
         return not keep
 
-    def makeGrpTreeNone(self):
-        """Make tree with no grouping."""
+    def groupingSpec(self):
+        """Get how datasets are grouped in the tree.
 
-        heads = [_("Dataset"), _("Size"), _("Type"), _("File")]
-        cols = ["name", "size", "type", "linkfile"]
-        if self.checkable:
-            heads += [_('Select')]
-            cols += [_('check')]
-
-        tree = TMNode(heads , None)
-        for name, ds in citems(self.doc.data):
-            child = DatasetNode(self, name, cols, None)
-
-            # add if not filtered for filtering
-            if not self.datasetFilterOut(ds, child):
-                tree.insertChildSorted(child)
-        return tree
-
-    def makeGrpTree(self, coltitles, colitems, grouper, GrpNodeClass):
-        """Make a tree grouping with function:
-        coltitles: tuple of titles of columns for user
-        colitems: tuple of items to lookup in DatasetNode
-        grouper: function of dataset to return text for grouping
-        GrpNodeClass: class for creating grouping nodes
+        Returns (column titles, items to lookup in DatasetNode,
+        function of dataset to return texts for grouping, class for
+        grouping nodes). The function and class are None if the
+        datasets are not grouped.
         """
 
-        if self.checkable:
-            coltitles = coltitles + [_('Select')]
-            colitems = colitems + [_('check')]
-
-        grpnodes = {}
-        for name, ds in citems(self.doc.data):
-            child = DatasetNode(self, name, colitems, None)
-
-            # check whether filtered out
-            if not self.datasetFilterOut(ds, child):
-                # get group
-                grps = grouper(ds)
-                for grp in grps:
-                    if grp not in grpnodes:
-                        grpnodes[grp] = GrpNodeClass( (grp,), None )
-                    # add to group
-                    grpnodes[grp].insertChildSorted(child)
-
-        return treeFromList(list(grpnodes.values()), coltitles)
-
-    def makeGrpTreeFilename(self):
-        """Make a tree of datasets grouped by linked file."""
-        return self.makeGrpTree(
-            [_("Dataset"), _("Size"), _("Type")],
-            ["name", "size", "type"],
-            lambda ds: (datasetLinkFile(ds),),
-            FilenameNode
-            )
-
-    def makeGrpTreeSize(self):
-        """Make a tree of datasets grouped by dataset size."""
-        return self.makeGrpTree(
-            [_("Dataset"), _("Type"), _("Filename")],
-            ["name", "type", "linkfile"],
-            lambda ds: (ds.userSize(),),
-            TMNode
-            )
-
-    def makeGrpTreeType(self):
-        """Make a tree of datasets grouped by dataset type."""
-        return self.makeGrpTree(
-            [_("Dataset"), _("Size"), _("Filename")],
-            ["name", "size", "linkfile"],
-            lambda ds: (ds.dstype,),
-            TMNode
-            )
-
-    def makeGrpTreeTags(self):
-        """Make a tree of datasets grouped by tags."""
-
-        def getgrp(ds):
+        def tagsgrp(ds):
             if ds.tags:
                 return sorted(ds.tags)
             else:
                 return [_("None")]
 
-        return self.makeGrpTree(
-            [_("Dataset"), _("Size"), _("Type"), _("Filename")],
-            ["name", "size", "type", "linkfile"],
-            getgrp,
-            TMNode
-            )
+        coltitles, colitems, grouper, GrpNodeClass = {
+            "none": (
+                [_("Dataset"), _("Size"), _("Type"), _("File")],
+                ["name", "size", "type", "linkfile"],
+                None, None),
+            "filename": (
+                [_("Dataset"), _("Size"), _("Type")],
+                ["name", "size", "type"],
+                lambda ds: (datasetLinkFile(ds),), FilenameNode),
+            "size": (
+                [_("Dataset"), _("Type"), _("Filename")],
+                ["name", "type", "linkfile"],
+                lambda ds: (ds.userSize(),), TMNode),
+            "type": (
+                [_("Dataset"), _("Size"), _("Filename")],
+                ["name", "size", "linkfile"],
+                lambda ds: (ds.dstype,), TMNode),
+            "tags": (
+                [_("Dataset"), _("Size"), _("Type"), _("Filename")],
+                ["name", "size", "type", "linkfile"],
+                tagsgrp, TMNode),
+            }[self.grouping]
+
+        if self.checkable:
+            coltitles = coltitles + [_('Select')]
+            colitems = colitems + [_('check')]
+        return coltitles, colitems, grouper, GrpNodeClass
+
+    def datasetGroupData(self, name, colitems, grouper):
+        """Get dict of groups containing dataset to data for its
+        nodes. This is empty if the dataset is missing or filtered out.
+        """
+        ds = self.doc.data.get(name)
+        if ds is None:
+            return {}
+        data = DatasetNode.makeData(self, name, colitems)
+        if self.datasetFilterOut(ds, data):
+            return {}
+        grps = (None,) if grouper is None else grouper(ds)
+        return dict( [(grp, data) for grp in grps] )
+
+    def makeTree(self):
+        """Make tree of datasets for the grouping, returning root node."""
+
+        coltitles, colitems, grouper, GrpNodeClass = self.groupingSpec()
+        root = TMNode(tuple(coltitles), None)
+
+        # nodes for each dataset name, indexed by group
+        self.dsnodes = {}
+        # nodes for groups (None is used for the root)
+        self.grpnodes = {None: root}
+
+        for name in self.doc.data:
+            groupdata = self.datasetGroupData(name, colitems, grouper)
+            if not groupdata:
+                continue
+            nodes = self.dsnodes[name] = {}
+            for grp, data in citems(groupdata):
+                if grp not in self.grpnodes:
+                    self.grpnodes[grp] = GrpNodeClass( (grp,), root )
+                    root.childnodes.append(self.grpnodes[grp])
+                parent = self.grpnodes[grp]
+                node = nodes[grp] = DatasetNode(
+                    self, name, colitems, parent, data=data)
+                parent.childnodes.append(node)
+
+        # sorting once is much faster than inserting each node sorted
+        for node in cvalues(self.grpnodes):
+            node.childnodes.sort(key=lambda n: n.data)
+
+        self.treegrouping = self.grouping
+        return root
+
+    def updateDatasets(self, names=None):
+        """Update tree for added, removed and changed datasets, rather
+        than rebuilding it.
+
+        If names is given, only datasets with these names, and those
+        which are not stored (which may change whenever the document
+        changes), are checked for changes.
+        """
+
+        coltitles, colitems, grouper, GrpNodeClass = self.groupingSpec()
+
+        if names is None:
+            check = set(self.doc.data) | set(self.dsnodes)
+        else:
+            check = set(names)
+            for name, ds in citems(self.doc.data):
+                if not datasets.isStoredDataset(ds):
+                    check.add(name)
+
+        # find datasets which have changed
+        changes = []
+        for name in check:
+            groupdata = self.datasetGroupData(name, colitems, grouper)
+            nodes = self.dsnodes.get(name, {})
+            if groupdata != dict([(g, n.data) for g, n in citems(nodes)]):
+                changes.append( (name, groupdata) )
+
+        if len(changes) > self.maxupdates:
+            # quicker to rebuild if there are many changes
+            self.setRoot(self.makeTree())
+            return
+
+        for name, groupdata in changes:
+            nodes = self.dsnodes.setdefault(name, {})
+
+            # remove or update existing nodes
+            for grp, node in list(citems(nodes)):
+                if grp not in groupdata:
+                    del nodes[grp]
+                    self.removeNode(node)
+                    grpnode = self.grpnodes[grp]
+                    if grp is not None and not grpnode.childnodes:
+                        del self.grpnodes[grp]
+                        self.removeNode(grpnode)
+                elif node.data != groupdata[grp]:
+                    # name is unchanged, so this does not alter sorting
+                    self.setNodeData(node, groupdata[grp])
+
+            # add new nodes
+            for grp, data in citems(groupdata):
+                if grp not in nodes:
+                    if grp not in self.grpnodes:
+                        self.grpnodes[grp] = GrpNodeClass( (grp,), None )
+                        self.insertNodeSorted(self.root, self.grpnodes[grp])
+                    node = nodes[grp] = DatasetNode(
+                        self, name, colitems, None, data=data)
+                    self.insertNodeSorted(self.grpnodes[grp], node)
+
+            if not nodes:
+                del self.dsnodes[name]
 
     def flags(self, idx):
         """Return model flags for index."""
@@ -373,22 +549,40 @@ class DatasetRelationModel(TreeModel):
             else:
                 self.checked_datasets.remove(name)
             # emitted by refresh: self.dataChanged.emit(idx, idx)
-            self.refresh()
+            self.refresh(names=(name,))
             return True
 
+    def slotDocModified(self):
+        """Update tree when document modified."""
+        ranges = self.doc.changedDataRanges()
+        if ranges is None:
+            self.refresh(names=self.doc.changedDatasets())
+        else:
+            # values changed in place do not alter the tree, but
+            # previews need to be redrawn
+            previews = datasetPreviews()
+            for name, column, start, stop in ranges:
+                if name in self.doc.data:
+                    previews.invalidate(self.doc.data[name])
+
+    def slotPreviewReady(self, ds):
+        """Show tooltip again if it was waiting for dataset preview."""
+        if self.tooltipnode is None:
+            return
+        node, column = self.tooltipnode
+        if node.dataset() is ds and qt4.QToolTip.isVisible():
+            self.tooltipnode = None
+            qt4.QToolTip.showText(qt4.QCursor.pos(), node.toolTip(column))
+
     @qt4.pyqtSlot()
-    def refresh(self):
-        """Update tree of datasets when document changes."""
-
-        tree = {
-            "none": self.makeGrpTreeNone,
-            "filename": self.makeGrpTreeFilename,
-            "size": self.makeGrpTreeSize,
-            "type": self.makeGrpTreeType,
-            "tags": self.makeGrpTreeTags,
-            }[self.grouping]()
-
-        self.syncTree(tree)
+    def refresh(self, names=None):
+        """Update tree of datasets, rebuilding if grouping changed.
+        names optionally gives the datasets which could have changed
+        (see updateDatasets)."""
+        if self.grouping != self.treegrouping:
+            self.setRoot(self.makeTree())
+        else:
+            self.updateDatasets(names=names)
 
 class DatasetsNavigatorTree(qt4.QTreeView):
     """Tree view for dataset names."""
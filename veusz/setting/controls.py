@@ -22,6 +22,10 @@
 
     These widgets emit settingChanged(control, setting, val) when the setting is
     changed. The creator should use this to change the setting.
+
+    Controls which have a setSetting(setting) method can be reused for
+    another setting copied from the same template (with the same type
+    and options), rather than making a new control.
 """
 
 from __future__ import division
@@ -47,6 +51,13 @@ def styleError(widget):
     widget.setStyleSheet("background-color: " +
                          settingdb.color('error').name() )
 
+def _changeSetting(control, setting):
+    """Make control edit and listen to setting rather than its
+    existing setting."""
+    control.setting.removeOnModified(control.onModified)
+    control.setting = setting
+    setting.setOnModified(control.onModified)
+
 class DotDotButton(qt4.QPushButton):
     """A button for opening up more complex editor."""
     def __init__(self, tooltip=None, checkable=True):
@@ -91,6 +102,12 @@ class Edit(qt4.QLineEdit):
         """called when the setting is changed remotely"""
         self.setText( self.setting.toText() )
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        styleClear(self)
+        self.onModified()
+
 class _EditBox(qt4.QTextEdit):
     """A popup edit box to support editing long text sections.
 
@@ -230,6 +247,12 @@ class String(qt4.QWidget):
         """called when the setting is changed remotely"""
         self.edit.setText( self.setting.toText() )
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        styleClear(self.edit)
+        self.onModified()
+
 class Int(qt4.QSpinBox):
     """A control for changing an integer."""
 
@@ -263,6 +286,11 @@ class Int(qt4.QSpinBox):
         self.setValue( self.setting.val )
         self.ignorechange = False
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        self.onModified()
+
 class Bool(qt4.QCheckBox):
     """A check box for changing a bool setting."""
 
@@ -299,6 +327,11 @@ class Bool(qt4.QCheckBox):
         self.setChecked( self.setting.val )
         self.ignorechange = False
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        self.onModified()
+
 class BoolSwitch(Bool):
     """Bool for switching off/on other settings."""
 
@@ -400,6 +433,12 @@ class Choice(qt4.QComboBox):
         if self.isEditable():
             self.setEditText(text)
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        styleClear(self)
+        self.onModified()
+
 class ChoiceSwitch(Choice):
     """Show or hide other settings based on value."""
 
@@ -526,6 +565,12 @@ class MultiLine(qt4.QTextEdit):
         """called when the setting is changed remotely"""
         self.setPlainText( self.setting.toText() )
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        styleClear(self)
+        self.onModified()
+
 class Notes(MultiLine):
     """For editing notes."""
 
@@ -668,8 +713,19 @@ class Dataset(qt4.QWidget):
     @qt4.pyqtSlot(int)          
     def slotModified(self, modified):
         """Update the list of datasets if the document is modified."""
+        # hidden controls are updated when shown
+        if self.isVisible():
+            self._populateEntries()
+
+    def showEvent(self, event):
+        """Update the list of datasets when shown."""
+        qt4.QWidget.showEvent(self, event)
         self._populateEntries()
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        self.choice.setSetting(setting)
+
     def slotButtonToggled(self, on):
         """Bring up list of datasets."""
         if on:
@@ -963,6 +1019,11 @@ class Color(qt4.QWidget):
         """called when the setting is changed remotely"""
         self.setColor( self.setting.toText() )
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        self.onModified()
+
 class WidgetSelector(Choice):
     """For choosing from a list of widgets."""
 
@@ -979,6 +1040,19 @@ class WidgetSelector(Choice):
     @qt4.pyqtSlot(int)          
     def slotModified(self, modified):
         """Update list of axes."""
+        # hidden controls are updated when shown
+        if self.isVisible():
+            self._populateEntries()
+
+    def showEvent(self, event):
+        """Update list when shown."""
+        Choice.showEvent(self, event)
+        self._populateEntries()
+
+    def setSetting(self, setting):
+        """Edit another setting of the same type, updating the list
+        for its widget."""
+        Choice.setSetting(self, setting)
         self._populateEntries()
 
 class WidgetChoice(WidgetSelector):
@@ -1746,6 +1820,12 @@ class Filename(qt4.QWidget):
         """called when the setting is changed remotely"""
         self.edit.setText( self.setting.toText() )
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        styleClear(self.edit)
+        self.onModified()
+
 class FontFamily(qt4.QFontComboBox):
     """List the font families, showing each font."""
 
@@ -1785,6 +1865,11 @@ class FontFamily(qt4.QFontComboBox):
         """Make control reflect chosen setting."""
         self.setCurrentFont( qt4.QFont(self.setting.toText()) )
 
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        _changeSetting(self, setting)
+        self.onModified()
+
 class ErrorStyle(Choice):
     """Choose different error bar styles."""
     
@@ -1817,7 +1902,8 @@ class Colormap(Choice):
     size = (32, 12)
 
     def __init__(self, setn, document, parent):
-        names = sorted(document.evaluate.colormaps)
+        self.document = document
+        names = self.names = sorted(document.evaluate.colormaps)
 
         icons = Colormap._generateIcons(document, names)
         Choice.__init__(self, setn, True,
@@ -1825,6 +1911,18 @@ class Colormap(Choice):
                         icons=icons)
         self.setIconSize( qt4.QSize(*self.size) )
 
+    def setSetting(self, setting):
+        """Edit another setting, updating the list of colormaps, which
+        may have been defined since the control was made."""
+        names = sorted(self.document.evaluate.colormaps)
+        if names != self.names:
+            self.names = names
+            self.clear()
+            icons = Colormap._generateIcons(self.document, names)
+            for icon, text in czip(icons, names):
+                self.addItem(icon, text)
+        Choice.setSetting(self, setting)
+
     @classmethod
     def _generateIcons(kls, document, names):
         """Generate a list of icons for drop down menu."""
@@ -1876,3 +1974,9 @@ class AxisBound(Choice):
 
         if self.currentText().lower() != 'auto':
             self.setEditText( self.setting.toText() )
+
+    def setSetting(self, setting):
+        """Edit another setting of the same type."""
+        self.setting.parent.get('mode').removeOnModified(self.modeChange)
+        Choice.setSetting(self, setting)
+        setting.parent.get('mode').setOnModified(self.modeChange)
@@ -18,6 +18,15 @@
 
 from __future__ import division
 
+# increased when settings or the widget tree are modified, so that
+# cached reference lookups and frozen settings are made again
+generation = 0
+
+def settingsChanged():
+    """Forget cached reference lookups, as settings or widgets changed."""
+    global generation
+    generation += 1
+
 class ReferenceBase(object):
     """Reference objects are inherited from this base class.
 
@@ -55,6 +64,8 @@ class Reference(ReferenceBase):
         ReferenceBase.__init__(self, value)
         self.split = value.split('/')
         self.resolved = None
+        # (generation, setting, resolved setting) of last lookup
+        self.cached = None
 
     def getPaths(self):
         """Path linked by setting."""
@@ -67,6 +78,11 @@ class Reference(ReferenceBase):
         if self.resolved:
             return self.resolved
 
+        cached = self.cached
+        if ( cached is not None and cached[0] == generation and
+             cached[1] is thissetting ):
+            return cached[2]
+
         item = thissetting.parent
         parts = list(self.split)
         if parts[0] == '':
@@ -102,6 +118,8 @@ class Reference(ReferenceBase):
         # hopefully this won't ever change
         if len(self.split) > 2 and self.split[1] == 'StyleSheet':
             self.resolved = item
+        else:
+            self.cached = (generation, thissetting, item)
 
         return item
 
@@ -122,6 +140,8 @@ class ReferenceMultiple(ReferenceBase):
         """Initialise with a list of paths."""
         ReferenceBase.__init__(self, paths)
         self.refs = [Reference(p) for p in paths]
+        # (generation, setting, resolved setting) of last lookup
+        self.cached = None
 
     def getPaths(self):
         """List of paths linked by setting."""
@@ -134,9 +154,14 @@ class ReferenceMultiple(ReferenceBase):
          - To the right of the list of paths
          - Which are closer in terms of the number of reference jumps
 
-        Hopefully this algorithm isn't too slow...
+        The result is cached until settings or widgets are modified.
         """
 
+        cached = self.cached
+        if ( cached is not None and cached[0] == generation and
+             cached[1] is thissetting ):
+            return cached[2]
+
         retn = None
         minjumps = 99999
         for ref in self.refs:
@@ -160,6 +185,7 @@ class ReferenceMultiple(ReferenceBase):
         if retn is None:
             raise self.ResolveException("Not linked to any settings")
 
+        self.cached = (generation, thissetting, retn)
         return retn
 
     def setOnModified(self, setn, fn):
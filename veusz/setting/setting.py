@@ -29,6 +29,7 @@ s.fromText('42')
 from __future__ import division
 import re
 import sys
+import weakref
 
 import numpy as N
 
@@ -36,17 +37,81 @@ from ..compat import cbasestr, cstr, crepr
 from .. import qtall as qt4
 from . import controls
 from .settingdb import settingdb, uilocale, ui_floattostring, ui_stringtofloat
-from .reference import ReferenceBase, Reference
+from .reference import ReferenceBase, Reference, settingsChanged
 
 from .. import utils
 from .. import datasets
 
-class OnModified(qt4.QObject):
-    """onmodified is emitted from an object contained in each setting."""
-    onModified = qt4.pyqtSignal()
+# shared (descr, usertext, formatting, hidden) tuples of settings
+_infocache = {}
+
+def _sharedInfo(descr, usertext, formatting, hidden):
+    """Return tuple of setting information, sharing identical tuples
+    between settings."""
+    info = (descr, usertext, formatting, hidden)
+    return _infocache.setdefault(info, info)
+
+# names of slots for each setting class
+_slotnamecache = {}
+
+def _slotNames(cls):
+    """Return names of all slots for setting class."""
+    try:
+        return _slotnamecache[cls]
+    except KeyError:
+        names = []
+        for klass in cls.__mro__:
+            names += klass.__dict__.get('__slots__', ())
+        _slotnamecache[cls] = names
+        return names
+
+class _WeakCallback(object):
+    """Call a function, or a method without keeping its object alive.
+
+    Methods of deleted Qt objects are not called."""
+
+    __slots__ = ('ref', 'func')
+
+    def __init__(self, fn):
+        obj = getattr(fn, '__self__', None)
+        if obj is None:
+            self.ref = None
+            self.func = fn
+        else:
+            self.ref = weakref.ref(obj)
+            self.func = fn.__func__
+
+    def isFor(self, fn):
+        """Does this call fn?"""
+        obj = getattr(fn, '__self__', None)
+        if obj is None:
+            return self.ref is None and self.func is fn
+        return ( self.ref is not None and self.ref() is obj and
+                 self.func is fn.__func__ )
+
+    def __call__(self):
+        """Call function. Returns False if the object has gone."""
+        if self.ref is None:
+            self.func()
+            return True
+        obj = self.ref()
+        if obj is None or (
+                isinstance(obj, qt4.QObject) and qt4.isdeleted(obj)):
+            return False
+        self.func(obj)
+        return True
 
 class Setting(object):
-    """A class to store a value with a particular type."""
+    """A class to store a value with a particular type.
+
+    Settings are kept small, as there are many of them in a
+    document. The description, user text and flags are stored in a
+    tuple shared with other settings, and functions to call on
+    modification are only stored if there are any.
+    """
+
+    __slots__ = ('readonly', 'parent', 'name', '_info', 'default',
+                 '_val', '_listeners')
 
     # differentiate widgets, settings and setting
     nodetype = 'setting'
@@ -67,61 +132,71 @@ class Setting(object):
         self.readonly = False
         self.parent = None
         self.name = name
-        self.descr = descr
-        self.usertext = usertext
-        self.formatting = formatting
-        self.hidden = hidden
+        self._info = _sharedInfo(descr, usertext, formatting, hidden)
         self.default = value
-        self.onmodified = OnModified()
+        self._listeners = None
         self._val = None
 
         # calls the set function for the val property
         self.val = value
 
+    def _setInfo(self, idx, val):
+        """Update item in shared information tuple."""
+        info = list(self._info)
+        info[idx] = val
+        self._info = _sharedInfo(*info)
+
+    descr = property(
+        lambda self: self._info[0],
+        lambda self, v: self._setInfo(0, v), None,
+        'Description of the setting')
+    usertext = property(
+        lambda self: self._info[1],
+        lambda self, v: self._setInfo(1, v), None,
+        'Name of setting for user')
+    formatting = property(
+        lambda self: self._info[2],
+        lambda self, v: self._setInfo(2, v), None,
+        'Whether the setting applies to formatting')
+    hidden = property(
+        lambda self: self._info[3],
+        lambda self, v: self._setInfo(3, v), None,
+        'Whether the setting is hidden from the user')
+
     def isWidget(self):
         """Is this object a widget?"""
         return False
 
-    def _copyHelper(self, before, after, optional):
-        """Help copy an object.
+    def copy(self):
+        """Make a setting which has its values copied from this one.
 
-        before are arguments before val
-        after are arguments after val
-        optinal as optional arguments
+        The copy has no parent and no functions to call on
+        modification.
         """
 
-        if isinstance(self._val, ReferenceBase):
-            val = self._val
-        else:
-            val = self.val
-
-        args = (self.name,) + before + (val,) + after
-
-        opt = optional.copy()
-        opt['descr'] = self.descr
-        opt['usertext'] = self.usertext
-        opt['formatting'] = self.formatting
-        opt['hidden'] = self.hidden
+        cls = self.__class__
+        obj = cls.__new__(cls)
+        for attr in _slotNames(cls):
+            setattr(obj, attr, getattr(self, attr))
+        if hasattr(self, '__dict__'):
+            # subclasses without slots
+            obj.__dict__.update(self.__dict__)
 
-        obj = self.__class__(*args, **opt)
-        obj.readonly = self.readonly
-        obj.default = self.default
+        obj.parent = None
+        obj._listeners = None
+        if isinstance(self._val, ReferenceBase):
+            # references cache what they resolve to, so cannot be shared
+            obj._val = self._val.__class__(self._val.value)
         return obj
 
-    def copy(self):
-        """Make a setting which has its values copied from this one.
-
-        This needs to be overridden if the constructor changes
-        """
-        return self._copyHelper((), (), {})
-
     def get(self):
         """Get the value."""
 
-        if isinstance(self._val, ReferenceBase):
-            return self._val.resolve(self).get()
+        val = self._val
+        if isinstance(val, ReferenceBase):
+            return val.resolve(self).get()
         else:
-            return self.convertFrom(self._val)
+            return self.convertFrom(val)
 
     def set(self, v):
         """Set the value."""
@@ -131,8 +206,10 @@ class Setting(object):
         else:
             # this also removes the linked value if there is one set
             self._val = self.convertTo(v)
+        settingsChanged()
 
-        self.onmodified.onModified.emit()
+        if self._listeners:
+            self._notifyModified()
 
     val = property(get, set, None,
                    'Get or modify the value of the setting')
@@ -268,8 +345,10 @@ class Setting(object):
             return ''
 
     def setOnModified(self, fn):
-        """Set the function to be called on modification (passing True)."""
-        self.onmodified.onModified.connect(fn)
+        """Set the function to be called on modification."""
+        if self._listeners is None:
+            self._listeners = []
+        self._listeners.append(_WeakCallback(fn))
 
         if isinstance(self._val, ReferenceBase):
             # tell references to notify us if they are modified
@@ -277,7 +356,17 @@ class Setting(object):
 
     def removeOnModified(self, fn):
         """Remove the function from the list of function to be called."""
-        self.onmodified.onModified.disconnect(fn)
+        if self._listeners:
+            self._listeners = [
+                l for l in self._listeners if not l.isFor(fn)]
+
+    def _notifyModified(self):
+        """Call the functions to be called on modification, forgetting
+        those of deleted objects."""
+        # copy, as functions may add or remove functions
+        dead = [l for l in list(self._listeners) if not l()]
+        if dead:
+            self._listeners = [l for l in self._listeners if l not in dead]
 
     def newDefault(self, value):
         """Update the default and the value."""
@@ -306,7 +395,12 @@ class Setting(object):
         This shouldn't often be used as it defeats the automatic updation.
         Used for temporary modifications."""
 
-        self._val = self.convertTo(val)
+        val = self.convertTo(val)
+        # this is called while drawing, so only forget cached values
+        # (references and frozen settings) if the value changes
+        if type(val) is not type(self._val) or val != self._val:
+            self._val = val
+            settingsChanged()
 
     def convertTo(self, val):
         """Convert for storage."""
@@ -360,6 +454,8 @@ class SettingBackwardCompat(Setting):
     This is used for backward-compatibility.
     """
 
+    __slots__ = ('translatefn', 'relpath')
+
     typename = 'backward-compat'
 
     def __init__(self, name, newrelpath, val, translatefn = None,
@@ -398,10 +494,6 @@ class SettingBackwardCompat(Setting):
     def get(self):
         return self.getForward().get()
 
-    def copy(self):
-        return self._copyHelper(('/'.join(self.relpath),), (),
-                                {'translatefn': self.translatefn})
-
     def makeControl(self, *args):
         return None
 
@@ -416,6 +508,8 @@ class SettingBackwardCompat(Setting):
 class Str(Setting):
     """String setting."""
 
+    __slots__ = ()
+
     typename = 'str'
 
     def convertTo(self, val):
@@ -435,6 +529,8 @@ class Str(Setting):
 class Notes(Str):
     """String for making notes."""
 
+    __slots__ = ()
+
     typename = 'str-notes'
 
     def makeControl(self, *args):
@@ -444,6 +540,8 @@ class Notes(Str):
 class Bool(Setting):
     """Bool setting."""
 
+    __slots__ = ()
+
     typename = 'bool'
 
     def convertTo(self, val):
@@ -473,6 +571,8 @@ class Bool(Setting):
 class Int(Setting):
     """Integer settings."""
 
+    __slots__ = ('minval', 'maxval')
+
     typename = 'int'
 
     def __init__(self, name, value, minval=-1000000, maxval=1000000,
@@ -487,14 +587,6 @@ class Int(Setting):
         self.maxval = maxval
         Setting.__init__(self, name, value, **args)
 
-    def copy(self):
-        """Make a setting which has its values copied from this one.
-
-        This needs to be overridden if the constructor changes
-        """
-        return self._copyHelper((), (), {'minval': self.minval,
-                                         'maxval': self.maxval})
-
     def convertTo(self, val):
         if isinstance(val, int):
             if val >= self.minval and val <= self.maxval:
@@ -532,6 +624,8 @@ def _finiteRangeFloat(f, minval=-1e300, maxval=1e300):
 class Float(Setting):
     """Float settings."""
 
+    __slots__ = ('minval', 'maxval')
+
     typename = 'float'
 
     def __init__(self, name, value, minval=-1e200, maxval=1e200,
@@ -546,14 +640,6 @@ class Float(Setting):
         self.maxval = maxval
         Setting.__init__(self, name, value, **args)
 
-    def copy(self):
-        """Make a setting which has its values copied from this one.
-
-        This needs to be overridden if the constructor changes
-        """
-        return self._copyHelper((), (), {'minval': self.minval,
-                                         'maxval': self.maxval})
-
     def convertTo(self, val):
         if isinstance(val, int) or isinstance(val, float):
             return _finiteRangeFloat(val,
@@ -577,6 +663,8 @@ class Float(Setting):
 class FloatOrAuto(Float):
     """Save a float or text auto."""
 
+    __slots__ = ()
+
     typename = 'float-or-auto'
 
     def convertTo(self, val):
@@ -612,6 +700,8 @@ class FloatOrAuto(Float):
 class IntOrAuto(Setting):
     """Save an int or text auto."""
 
+    __slots__ = ()
+
     typename = 'int-or-auto'
 
     def convertTo(self, val):
@@ -708,6 +798,8 @@ $'''
 class Distance(Setting):
     """A veusz distance measure, e.g. 1pt or 3%."""
 
+    __slots__ = ()
+
     typename = 'distance'
 
     # match a distance
@@ -825,12 +917,16 @@ class Distance(Setting):
 class DistancePt(Distance):
     """For a distance in points."""
 
+    __slots__ = ()
+
     def makeControl(self, *args):
         return controls.DistancePt(self, *args)
 
 class DistancePhysical(Distance):
     """For physical distances (no fractional)."""
 
+    __slots__ = ()
+
     def isDist(self, val):
         m = self.distre.match(val)
         if m:
@@ -845,6 +941,8 @@ class DistancePhysical(Distance):
 class DistanceOrAuto(Distance):
     """A distance or the value Auto"""
 
+    __slots__ = ()
+
     typename = 'distance-or-auto'
 
     distre = re.compile( distre_expr + r'|^Auto$', re.VERBOSE )
@@ -858,6 +956,8 @@ class DistanceOrAuto(Distance):
 class Choice(Setting):
     """One out of a list of strings."""
 
+    __slots__ = ('vallist', 'descriptions')
+
     # maybe should be implemented as a dict to speed up checks
 
     typename = 'choice'
@@ -877,10 +977,6 @@ class Choice(Setting):
 
         Setting.__init__(self, name, val, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((self.vallist,), (), {})
-
     def convertTo(self, val):
         if val in self.vallist:
             return val
@@ -903,6 +999,8 @@ class Choice(Setting):
 class ChoiceOrMore(Setting):
     """One out of a list of strings, or anything else."""
 
+    __slots__ = ('vallist', 'descriptions')
+
     # maybe should be implemented as a dict to speed up checks
 
     typename = 'choice-or-more'
@@ -920,10 +1018,6 @@ class ChoiceOrMore(Setting):
 
         Setting.__init__(self, name, val, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((self.vallist,), (), {})
-
     def convertTo(self, val):
         return val
 
@@ -940,6 +1034,8 @@ class ChoiceOrMore(Setting):
 class FloatChoice(ChoiceOrMore):
     """A numeric value, which can also be chosen from the list of values."""
 
+    __slots__ = ()
+
     typename = 'float-choice'
 
     def convertTo(self, val):
@@ -966,6 +1062,8 @@ class FloatChoice(ChoiceOrMore):
 class FloatDict(Setting):
     """A dictionary, taking floats as values."""
 
+    __slots__ = ()
+
     typename = 'float-dict'
 
     def convertTo(self, val):
@@ -1014,6 +1112,8 @@ class FloatDict(Setting):
 class FloatList(Setting):
     """A list of float values."""
 
+    __slots__ = ()
+
     typename = 'float-list'
 
     def convertTo(self, val):
@@ -1061,6 +1161,8 @@ class FloatList(Setting):
 class WidgetPath(Str):
     """A setting holding a path to a widget. This is checked for validity."""
 
+    __slots__ = ('relativetoparent', 'allowedwidgets')
+
     typename = 'widget-path'
 
     def __init__(self, name, val, relativetoparent=True,
@@ -1079,12 +1181,6 @@ class WidgetPath(Str):
         self.relativetoparent = relativetoparent
         self.allowedwidgets = allowedwidgets
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (),
-                                {'relativetoparent': self.relativetoparent,
-                                 'allowedwidgets': self.allowedwidgets})
-
     def getReferredWidget(self, val = None):
         """Get the widget referred to. We double-check here to make sure
         it's the one.
@@ -1130,6 +1226,8 @@ class WidgetPath(Str):
 class Dataset(Str):
     """A setting to choose from the possible datasets."""
 
+    __slots__ = ('dimensions', 'datatype')
+
     typename = 'dataset'
 
     def __init__(self, name, val, dimensions=1, datatype='numeric',
@@ -1142,12 +1240,6 @@ class Dataset(Str):
         self.datatype = datatype
         Setting.__init__(self, name, val, **args)
 
-    def copy(self):
-        """Make a setting which has its values copied from this one."""
-        return self._copyHelper((), (),
-                                {'dimensions': self.dimensions,
-                                 'datatype': self.datatype})
-
     def makeControl(self, *args):
         """Allow user to choose between the datasets."""
         return controls.Dataset(self, self.getDocument(), self.dimensions,
@@ -1164,6 +1256,8 @@ class Dataset(Str):
 class Strings(Setting):
     """A multiple set of strings."""
 
+    __slots__ = ()
+
     typename = 'str-multi'
 
     def convertTo(self, val):
@@ -1191,6 +1285,8 @@ class Strings(Setting):
 class Datasets(Setting):
     """A setting to choose one or more of the possible datasets."""
 
+    __slots__ = ('dimensions', 'datatype')
+
     typename = 'dataset-multi'
 
     def __init__(self, name, val, dimensions=1, datatype='numeric',
@@ -1221,12 +1317,6 @@ class Datasets(Setting):
 
         return tuple(val)
 
-    def copy(self):
-        """Make a setting which has its values copied from this one."""
-        return self._copyHelper((), (),
-                                {'dimensions': self.dimensions,
-                                 'datatype': self.datatype})
-
     def makeControl(self, *args):
         """Allow user to choose between the datasets."""
         return controls.Datasets(self, self.getDocument(), self.dimensions,
@@ -1247,6 +1337,8 @@ class DatasetExtended(Dataset):
     """Choose a dataset, give an expression or specify a list of float
     values."""
 
+    __slots__ = ()
+
     typename = 'dataset-extended'
 
     def convertTo(self, val):
@@ -1326,8 +1418,10 @@ class DatasetExtended(Dataset):
     def getData(self, doc):
         """Return veusz dataset"""
         if isinstance(self.val, cbasestr):
-            return doc.evaluate.evalDatasetExpression(
-                self.val, datatype=self.datatype, dimensions=self.dimensions)
+            with utils.profiler.timer(self.getWidget(), 'data'):
+                return doc.evaluate.evalDatasetExpression(
+                    self.val, datatype=self.datatype,
+                    dimensions=self.dimensions)
         else:
             return datasets.valsToDataset(
                 self.val, self.datatype, self.dimensions)
@@ -1338,6 +1432,8 @@ class DatasetOrStr(Dataset):
     Non string datasets are converted to string arrays using this.
     """
 
+    __slots__ = ()
+
     typename = 'dataset-or-str'
 
     def __init__(self, name, val, **args):
@@ -1360,13 +1456,11 @@ class DatasetOrStr(Dataset):
     def makeControl(self, *args):
         return controls.DatasetOrString(self, self.getDocument(), *args)
 
-    def copy(self):
-        """Make a setting which has its values copied from this one."""
-        return self._copyHelper((), (), {})
-
 class Color(ChoiceOrMore):
     """A color setting."""
 
+    __slots__ = ()
+
     typename = 'color'
 
     def __init__(self, name, value, **args):
@@ -1374,10 +1468,6 @@ class Color(ChoiceOrMore):
         and description."""
         ChoiceOrMore.__init__(self, name, [], value, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def color(self, painter, dataindex=0):
         """Return QColor from color.
 
@@ -1403,6 +1493,8 @@ class Color(ChoiceOrMore):
 class FillStyle(Choice):
     """A setting for the different fill styles provided by Qt."""
 
+    __slots__ = ()
+
     typename = 'fill-style'
 
     _fillstyles = [ 'solid', 'horizontal', 'vertical', 'cross',
@@ -1432,10 +1524,6 @@ class FillStyle(Choice):
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, self._fillstyles, value, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def qtStyle(self):
         """Return Qt ID of fill."""
         return self._fillcnvt[self.val]
@@ -1446,6 +1534,8 @@ class FillStyle(Choice):
 class LineStyle(Choice):
     """A setting choosing a particular line style."""
 
+    __slots__ = ()
+
     typename = 'line-style'
 
     # list of allowed line styles
@@ -1484,10 +1574,6 @@ class LineStyle(Choice):
     def __init__(self, name, default, **args):
         Choice.__init__(self, name, self._linestyles, default, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def qtStyle(self):
         """Get Qt ID of chosen line style."""
         return self._linecnvt[self.val]
@@ -1501,6 +1587,8 @@ class Axis(Str):
     direction is 'horizontal', 'vertical' or 'both'
     """
 
+    __slots__ = ('direction',)
+
     typename = 'axis'
 
     def __init__(self, name, val, direction, **args):
@@ -1513,10 +1601,6 @@ class Axis(Str):
         Setting.__init__(self, name, val, **args)
         self.direction = direction
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (self.direction,), {})
-
     def makeControl(self, *args):
         """Allows user to choose an axis or enter a name."""
         return controls.Axis(self, self.getDocument(), self.direction, *args)
@@ -1524,6 +1608,8 @@ class Axis(Str):
 class WidgetChoice(Str):
     """Hold the name of a child widget."""
 
+    __slots__ = ('widgettypes',)
+
     typename = 'widget-choice'
 
     def __init__(self, name, val, widgettypes={}, **args):
@@ -1531,11 +1617,6 @@ class WidgetChoice(Str):
         Setting.__init__(self, name, val, **args)
         self.widgettypes = widgettypes
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (),
-                                {'widgettypes': self.widgettypes})
-
     def buildWidgetList(self, level, widget, outdict):
         """A recursive helper to build up a list of possible widgets.
 
@@ -1596,30 +1677,26 @@ class WidgetChoice(Str):
 class Marker(Choice):
     """Choose a marker type from one allowable."""
 
+    __slots__ = ()
+
     typename = 'marker'
 
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, utils.MarkerCodes, value, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def makeControl(self, *args):
         return controls.Marker(self, *args)
 
 class Arrow(Choice):
     """Choose an arrow type from one allowable."""
 
+    __slots__ = ()
+
     typename = 'arrow'
 
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, utils.ArrowCodes, value, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def makeControl(self, *args):
         return controls.Arrow(self, *args)
 
@@ -1627,6 +1704,8 @@ class LineSet(Setting):
     """A setting which corresponds to a set of lines.
     """
 
+    __slots__ = ()
+
     typename='line-multi'
 
     def convertTo(self, val):
@@ -1689,6 +1768,8 @@ class FillSet(Setting):
     This setting keeps an internal array of LineSettings.
     """
 
+    __slots__ = ()
+
     typename = 'fill-multi'
 
     def convertTo(self, val):
@@ -1748,6 +1829,8 @@ class FillSet(Setting):
 class Filename(Str):
     """Represents a filename setting."""
 
+    __slots__ = ()
+
     typename = 'filename'
 
     def makeControl(self, *args):
@@ -1761,6 +1844,8 @@ class Filename(Str):
 class ImageFilename(Filename):
     """Represents an image filename setting."""
 
+    __slots__ = ()
+
     typename = 'filename-image'
 
     def makeControl(self, *args):
@@ -1769,6 +1854,8 @@ class ImageFilename(Filename):
 class FontFamily(Str):
     """Represents a font family."""
 
+    __slots__ = ()
+
     typename = 'font-family'
 
     def makeControl(self, *args):
@@ -1780,6 +1867,8 @@ class ErrorStyle(Choice):
     The allowed values are below in _errorstyles.
     """
 
+    __slots__ = ()
+
     typename = 'errorbar-style'
 
     _errorstyles = (
@@ -1797,63 +1886,53 @@ class ErrorStyle(Choice):
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, self._errorstyles, value, **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def makeControl(self, *args):
         return controls.ErrorStyle(self, *args)
 
 class AlignHorz(Choice):
     """Alignment horizontally."""
 
+    __slots__ = ()
+
     typename = 'align-horz'
 
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, ['left', 'centre', 'right'], value, **args)
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
 class AlignVert(Choice):
     """Alignment vertically."""
 
+    __slots__ = ()
+
     typename = 'align-vert'
 
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, ['top', 'centre', 'bottom'], value, **args)
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
 class AlignHorzWManual(Choice):
     """Alignment horizontally."""
 
+    __slots__ = ()
+
     typename = 'align-horz-+manual'
 
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, ['left', 'centre', 'right', 'manual'],
                         value, **args)
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
 class AlignVertWManual(Choice):
     """Alignment vertically."""
 
+    __slots__ = ()
+
     typename = 'align-vert-+manual'
 
     def __init__(self, name, value, **args):
         Choice.__init__(self, name, ['top', 'centre', 'bottom', 'manual'],
                         value, **args)
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
 # Bool which shows/hides other settings
 class BoolSwitch(Bool):
     """Bool switching setting."""
 
+    __slots__ = ('sfalse', 'strue')
+
     def __init__(self, name, value, settingsfalse=[], settingstrue=[],
                  **args):
         """Enables/disables a set of settings if True or False
@@ -1868,13 +1947,11 @@ class BoolSwitch(Bool):
     def makeControl(self, *args):
         return controls.BoolSwitch(self, *args)
 
-    def copy(self):
-        return self._copyHelper((), (), {'settingsfalse': self.sfalse,
-                                         'settingstrue': self.strue})
-
 class ChoiceSwitch(Choice):
     """Show or hide other settings based on the choice given here."""
 
+    __slots__ = ('sfalse', 'strue', 'showfn')
+
     def __init__(self, name, vallist, value, settingstrue=[], settingsfalse=[],
                  showfn=lambda val: True, **args):
         """Enables/disables a set of settings if True or False
@@ -1889,15 +1966,11 @@ class ChoiceSwitch(Choice):
     def makeControl(self, *args):
         return controls.ChoiceSwitch(self, False, self.vallist, *args)
 
-    def copy(self):
-        return self._copyHelper((self.vallist,), (),
-                                {'settingsfalse': self.sfalse,
-                                 'settingstrue': self.strue,
-                                 'showfn': self.showfn})
-
 class FillStyleExtended(ChoiceSwitch):
     """A setting for the different fill styles provided by Qt."""
 
+    __slots__ = ()
+
     typename = 'fill-style-ext'
 
     _strue = ( 'linewidth', 'linestyle', 'patternspacing',
@@ -1914,16 +1987,14 @@ class FillStyleExtended(ChoiceSwitch):
                               showfn=self._ishatch,
                               **args)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
     def makeControl(self, *args):
         return controls.FillStyleExtended(self, *args)
 
 class RotateInterval(Choice):
     '''Rotate a label with intervals given.'''
 
+    __slots__ = ()
+
     def __init__(self, name, val, **args):
         Choice.__init__(self, name,
                         ('-180', '-135', '-90', '-45',
@@ -1941,22 +2012,22 @@ class RotateInterval(Choice):
             val = '90'
         return Choice.convertTo(self, val)
 
-    def copy(self):
-        """Make a copy of the setting."""
-        return self._copyHelper((), (), {})
-
 class Colormap(Str):
     """A setting to set the color map used in an image.
     This is based on a Str rather than Choice as the list might
     change later.
     """
 
+    __slots__ = ()
+
     def makeControl(self, *args):
         return controls.Colormap(self, self.getDocument(), *args)
 
 class AxisBound(FloatOrAuto):
     """Axis bound - either numeric, Auto or date."""
 
+    __slots__ = ()
+
     typename = 'axis-bound'
 
     def makeControl(self, *args):
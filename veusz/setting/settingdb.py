@@ -38,11 +38,26 @@ defaultValues = {
     'export_quality': 85,
     'export_background': '#ffffff00',
     'export_SVG_text_as_text': False,
+    # draw markers as bitmaps in bitmap export (positions are rounded
+    # to whole pixels)
+    'export_spritemarkers': False,
 
     # plot options
     'plot_updatepolicy': -1, # update on document changed
     'plot_antialias': True,
     'plot_numthreads': 2,
+    # draw markers as cached bitmaps on screen
+    'plot_spritemarkers': True,
+
+    # save dataset values of vsz documents to binary sidecar file
+    'save_binarydata': False,
+
+    # cache datasets imported from linked files
+    'importcache_enable': False,
+    # directory for cache (default location if blank)
+    'importcache_dir': '',
+    # maximum size of import cache in MB
+    'importcache_maxsize': 500,
 
     # recent files list
     'main_recentfiles': [],
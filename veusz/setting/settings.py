@@ -20,7 +20,8 @@
 
 from __future__ import division
 from ..compat import citems
-from .reference import Reference, ReferenceMultiple
+from . import reference
+from .reference import Reference, ReferenceMultiple, settingsChanged
 
 class Settings(object):
     """A class for holding collections of settings."""
@@ -51,11 +52,14 @@ class Settings(object):
         self.parent = None
 
     def copy(self):
-        """Make a copy of the settings and its subsettings."""
+        """Make a copy of the settings and its subsettings.
 
-        s = Settings(
-            self.name, descr=self.descr, usertext=self.usertext,
-            pixmap=self.pixmap, setnsmode=self.setnsmode )
+        The copy has the same class as this object, but no parent."""
+
+        cls = self.__class__
+        s = cls.__new__(cls)
+        s.__dict__.update(self.__dict__)
+        s.__dict__.update({'setdict': {}, 'setnames': [], 'parent': None})
         for name in self.setnames:
             s.add( self.setdict[name].copy() )
         return s
@@ -113,12 +117,15 @@ class Settings(object):
 
         if readonly:
             setting.readonly = True
+
+        settingsChanged()
         
     def remove(self, name):
         """Remove name from the list of settings."""
 
         del self.setnames[ self.setnames.index( name ) ]
         del self.setdict[ name ]
+        settingsChanged()
         
     def __setattr__(self, name, val):
         """Allow us to do
@@ -268,3 +275,40 @@ class Settings(object):
 
                     setn.set(ref)
                     setn.default = ref
+
+class FrozenSettings(object):
+    """A read-only snapshot of a Settings object, for drawing.
+
+    Values are looked up once and are then plain attributes, so
+    reading them again is fast. Subsettings are also frozen. Other
+    attributes and methods (e.g. get) are those of the Settings.
+
+    The snapshot is only valid until settings or widgets change (see
+    isCurrent).
+    """
+
+    def __init__(self, settings):
+        self.__dict__['_settings'] = settings
+        self.__dict__['_generation'] = reference.generation
+
+    def isCurrent(self):
+        """Are the values still those of the settings?"""
+        return self.__dict__['_generation'] == reference.generation
+
+    def __getattr__(self, name):
+        settings = self.__dict__['_settings']
+        setn = settings.__dict__['setdict'].get(name)
+        if setn is None:
+            val = getattr(settings, name)
+        elif isinstance(setn, Settings):
+            val = FrozenSettings(setn)
+        else:
+            val = setn.val
+        self.__dict__[name] = val
+        return val
+
+    def __getitem__(self, name):
+        return self.__getattr__(name)
+
+    def __setattr__(self, name, val):
+        raise AttributeError("Frozen settings cannot be modified")
@@ -0,0 +1,203 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+###############################################################################
+
+"""Record time taken to import modules when Veusz starts.
+
+This is enabled with the --profile-startup command line option. The
+builtin __import__ function is wrapped to time the import of each
+module which is not already loaded. The time of a module excludes the
+time taken by imports nested within it, so that slow modules can be
+identified. Other steps of startup, such as loading plugins, can be
+timed with phase().
+
+This module must not import other parts of Veusz, so that it can be
+enabled before they are imported.
+"""
+
+from __future__ import division, print_function
+import sys
+import threading
+import time
+
+try:
+    import builtins
+except ImportError:
+    import __builtin__ as builtins
+
+# use the most precise clock available
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+class _NullPhase(object):
+    """Phase which does nothing, used when profiling is disabled."""
+    def __enter__(self):
+        pass
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+class _Phase(object):
+    """Context manager to record the time of a phase of startup."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = _clock()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.addPhase(self.name, _clock()-self.start)
+
+def _resolveName(name, globals, level):
+    """Get absolute name of module imported relative to globals."""
+    if level <= 0 or not globals:
+        return name
+    pkg = globals.get('__package__')
+    if not pkg:
+        pkg = globals.get('__name__', '')
+        if '__path__' not in globals:
+            pkg = pkg.rpartition('.')[0]
+    for i in range(level-1):
+        pkg = pkg.rpartition('.')[0]
+    return pkg + '.' + name if name else pkg
+
+class StartupProfiler(object):
+    """Record times taken to import modules and for phases of startup."""
+
+    def __init__(self):
+        self.starttime = _clock()
+        self.lock = threading.Lock()
+        # stack of imports in progress for each thread
+        self.local = threading.local()
+        # module name -> [exclusive time, inclusive time]
+        self.stats = {}
+        # list of (phase name, time)
+        self.phases = []
+        self.origimport = None
+
+    def install(self):
+        """Start recording imports."""
+        self.origimport = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        """Stop recording imports."""
+        if self.origimport is not None:
+            builtins.__import__ = self.origimport
+            self.origimport = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(),
+                level=0):
+        """Replacement for __import__ which records times."""
+
+        absname = _resolveName(name, globals, level)
+        candidates = [absname]
+        if fromlist:
+            # "from package import module" loads submodules
+            candidates += [
+                absname+'.'+f for f in fromlist if f != '*']
+        new = [n for n in candidates if n not in sys.modules]
+        if not new:
+            # nothing to load, so quickly return
+            return self.origimport(name, globals, locals, fromlist, level)
+
+        try:
+            stack = self.local.stack
+        except AttributeError:
+            stack = self.local.stack = []
+
+        # time taken by nested imports, start time
+        item = [0., _clock()]
+        stack.append(item)
+        try:
+            return self.origimport(name, globals, locals, fromlist, level)
+        finally:
+            stack.pop()
+            total = _clock() - item[1]
+
+            # names in fromlist may be attributes, not modules
+            # failed imports are counted in the importing module
+            loaded = [n for n in new if n in sys.modules]
+            if loaded:
+                self.addImport(', '.join(loaded), total-item[0], total)
+                if stack:
+                    stack[-1][0] += total
+
+    def addImport(self, name, exclusive, inclusive):
+        """Add time taken to import module."""
+        with self.lock:
+            stat = self.stats.setdefault(name, [0., 0.])
+            stat[0] += exclusive
+            stat[1] += inclusive
+
+    def addPhase(self, name, elapsed):
+        """Add time taken by phase of startup."""
+        with self.lock:
+            self.phases.append((name, elapsed))
+
+    def reportText(self, maxrows=40):
+        """Return a text report of startup times."""
+
+        with self.lock:
+            rows = sorted(
+                [ (stat[0], stat[1], name)
+                  for name, stat in self.stats.items() ],
+                reverse=True)
+            phases = list(self.phases)
+
+        out = ['Startup time: %.1f ms\n' % (
+            (_clock()-self.starttime)*1e3)]
+        for name, elapsed in phases:
+            out.append('  %-30s %10.1f ms\n' % (name, elapsed*1e3))
+        out.append('Total import time: %.1f ms\n' % (
+            sum([r[0] for r in rows])*1e3))
+
+        rows = rows[:maxrows]
+        namewidth = max([len(r[2]) for r in rows] + [6])
+        fmt = '%%-%is %%10s %%10s\n' % namewidth
+        out.append(fmt % ('Module', 'Self (ms)', 'Total (ms)'))
+        for exclusive, inclusive, name in rows:
+            out.append(fmt % (
+                name, '%.2f' % (exclusive*1e3), '%.2f' % (inclusive*1e3)))
+        return ''.join(out)
+
+# profiler in use, or None if disabled
+profiler = None
+
+def enable():
+    """Start recording startup times."""
+    global profiler
+    if profiler is None:
+        profiler = StartupProfiler()
+        profiler.install()
+
+def phase(name):
+    """Return a context manager to record the time of phase name."""
+    if profiler is None:
+        return _NullPhase()
+    return _Phase(profiler, name)
+
+def finish():
+    """Stop recording, writing report to stderr."""
+    global profiler
+    if profiler is not None:
+        profiler.uninstall()
+        sys.stderr.write(profiler.reportText())
+        profiler = None
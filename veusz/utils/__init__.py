@@ -22,6 +22,8 @@ from .version import version
 from .textrender import Renderer, FontMetrics, latexEscape
 from .safe_eval import compileChecked, SafeEvalException
 from .fitlm import fitLM
+from .profiling import Profiler, ExclusiveTimerStack, profiler, \
+    widgetName, painterWidget
 
 from .utilfuncs import *
 from .points import *
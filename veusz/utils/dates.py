@@ -23,7 +23,7 @@ import re
 
 import numpy as N
 
-from ..compat import crange, citems, cstr
+from ..compat import crange, citems, cstr, cbasestr
 
 # date format: YYYY-MM-DDTHH:MM:SS.mmmmmm
 # date and time part are optional (check we have at least one!)
@@ -101,6 +101,117 @@ def dateStringToDate(datestr):
     else:
         return N.nan
 
+# formats of ISO date strings which can be converted in bulk by numpy
+# (digits are replaced by 9 in the format)
+_bulk_format_re = re.compile(r'^9999-99-99([T ]99:99:99(\.9+)?)?$')
+
+# number of strings to convert at once in bulk conversion
+_bulk_chunk = 65536
+
+def _bulkStringFormat(strings):
+    """Find most common ISO format in a sample of strings, returning
+    None if no format is suitable for bulk conversion."""
+    counts = {}
+    for s in strings[:100]:
+        if not isinstance(s, cbasestr):
+            continue
+        fmt = re.sub('[0-9]', '9', s)
+        if _bulk_format_re.match(fmt):
+            counts[fmt] = counts.get(fmt, 0) + 1
+    if not counts:
+        return None
+    return max(counts, key=lambda f: counts[f])
+
+# days in each month (non leap year)
+_monthdays = N.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+def _validDateTimeFields(digits, hastime):
+    """Check the fields of ISO date strings are in the ranges allowed
+    by datetime. digits is a 2D array of the character values minus
+    '0', with a row for each string."""
+
+    def field(start, end):
+        val = 0
+        for i in crange(start, end):
+            val = val*10 + digits[:, i]
+        return val
+
+    year, month, day = field(0, 4), field(5, 7), field(8, 10)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    monthidx = N.clip(month-1, 0, 11)
+    maxday = _monthdays[monthidx] + (leap & (month == 2))
+    valid = ( (year >= 1) & (month >= 1) & (month <= 12) &
+              (day >= 1) & (day <= maxday) )
+    if hastime:
+        valid &= ( (field(11, 13) <= 23) & (field(14, 16) <= 59) &
+                   (field(17, 19) <= 59) )
+    return valid
+
+def _bulkConvertChunk(strings, fmt, fallback):
+    """Convert chunk of strings with format fmt, using fallback for
+    strings not matching the format."""
+
+    out = N.empty(len(strings), dtype=N.float64)
+    arr = N.array(strings)
+    if arr.dtype.kind == 'S':
+        arr = arr.astype('U')
+
+    # find strings which match the format, by looking at characters
+    flen = len(fmt)
+    tmpl = N.array(list(fmt))
+    digits = tmpl == '9'
+    seps = ~digits
+    ok = N.char.str_len(arr) == flen
+    okidxs = N.nonzero(ok)[0]
+    chars = arr[okidxs].astype('U%i' % flen).view('U1').reshape(-1, flen)
+    dchars = chars[:, digits]
+    good = ( ((dchars >= '0') & (dchars <= '9')).all(axis=1) &
+             (chars[:, seps] == tmpl[seps]).all(axis=1) )
+    # numpy fails for the whole array if any value is out of range
+    # (e.g. month 13), so only pass values valid for datetime
+    good &= _validDateTimeFields(chars.view(N.uint32).astype(N.int64) - 48,
+                                 flen > 10)
+    ok[okidxs[~good]] = False
+
+    try:
+        dt = N.array(arr[ok], dtype='datetime64[us]')
+    except ValueError:
+        # values numpy cannot convert
+        ok[:] = False
+    else:
+        # split into seconds and microseconds to get the same values
+        # as dateStringToDate
+        delta = (dt - N.datetime64(offsetdate, 'us')).astype(N.int64)
+        out[ok] = delta // 1000000 + (delta % 1000000)*1e-6
+
+    for i in N.nonzero(~ok)[0]:
+        out[i] = fallback(strings[i])
+    return out
+
+def dateStringsToFloats(strings, fallback=dateStringToDate):
+    """Convert a sequence of date strings to a numpy array of
+    Veusz-format date values.
+
+    The most common ISO format in the strings is converted in bulk
+    using numpy. Other strings are converted using the fallback
+    function, which should return NaN for invalid values.
+    """
+
+    strings = list(strings)
+    fmt = _bulkStringFormat(strings)
+    if fmt is None:
+        return N.array([fallback(s) for s in strings], dtype=N.float64)
+
+    out = N.empty(len(strings), dtype=N.float64)
+    for i in crange(0, len(strings), _bulk_chunk):
+        chunk = strings[i:i+_bulk_chunk]
+        try:
+            out[i:i+len(chunk)] = _bulkConvertChunk(chunk, fmt, fallback)
+        except (UnicodeError, TypeError):
+            # not all strings are text
+            out[i:i+len(chunk)] = [fallback(s) for s in chunk]
+    return out
+
 def floatUnixToVeusz(f):
     """Convert unix float to veusz float."""
     delta = datetime.datetime(1970,1,1) - offsetdate
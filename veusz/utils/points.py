@@ -19,6 +19,9 @@
 ###############################################################################
 
 from __future__ import division
+import math
+
+from ..compat import czip
 from .. import qtall as qt4
 import numpy as N
 
@@ -449,12 +452,190 @@ def plotMarkers(painter, xpos, ypos, markername, markersize, scaling=None,
         colorimg = colormap.applyColorMap(
             cmap, 'linear', color2d, 0., 1., trans)
 
-    # this is the fast (C++) or slow (python) helper
-    plotPathsToPainter(painter, path, xpos, ypos, scaling, clip, colorimg,
-                       scaleline)
+    # try to plot pre-rendered sprites if painting to a bitmap
+    if ( scaling is not None or
+         not getattr(painter, 'spritemarkers', False) or
+         not _plotSpriteMarkers(painter, path, xpos, ypos, clip, colorimg,
+                                (markername, markersize)) ):
+
+        # this is the fast (C++) or slow (python) helper
+        plotPathsToPainter(painter, path, xpos, ypos, scaling, clip, colorimg,
+                           scaleline)
 
     painter.restore()
 
+#######################################################################
+## sprite plotting of markers for bitmap output
+
+# only use sprites if there are at least this number of points
+spriteminpoints = 256
+# maximum number of different colors to make sprites for
+spritemaxcolors = 256
+
+def _solidBrush(brush):
+    """Is brush empty or a solid color?"""
+    return brush.style() in (qt4.Qt.NoBrush, qt4.Qt.SolidPattern)
+
+def _makeSprite(path, pen, brush, antialias):
+    """Render path with pen and brush into an image.
+
+    Returns (image, xoffset, yoffset), where the offsets are the
+    position of the top left of the image relative to the path origin.
+    """
+
+    bounds = path.boundingRect()
+    if pen.style() != qt4.Qt.NoPen:
+        stroker = qt4.QPainterPathStroker()
+        stroker.setWidth(max(pen.widthF(), 1.))
+        stroker.setJoinStyle(pen.joinStyle())
+        stroker.setMiterLimit(pen.miterLimit())
+        stroker.setCapStyle(pen.capStyle())
+        bounds = bounds.united(stroker.createStroke(path).boundingRect())
+
+    # add an extra pixel to allow for antialiasing
+    x0 = int(math.floor(bounds.left())) - 1
+    y0 = int(math.floor(bounds.top())) - 1
+    x1 = int(math.ceil(bounds.right())) + 1
+    y1 = int(math.ceil(bounds.bottom())) + 1
+
+    img = qt4.QImage(x1-x0, y1-y0, qt4.QImage.Format_ARGB32_Premultiplied)
+    img.fill(0)
+    p = qt4.QPainter(img)
+    p.setRenderHint(qt4.QPainter.Antialiasing, antialias)
+    p.setPen(pen)
+    p.setBrush(brush)
+    p.translate(-x0, -y0)
+    p.drawPath(path)
+    p.end()
+
+    return img, x0, y0
+
+def _plotSpriteMarkers(painter, path, xpos, ypos, clip, colorimg, key):
+    """Plot markers by rendering the path once into an image, then
+    drawing copies of the image onto a single layer.
+
+    Sprites are cached in the painter's PaintHelper, keyed by key,
+    the pen, brush and color.
+
+    Returns False if sprites cannot be used, so the caller should
+    fall back to plotting vector paths.
+    """
+
+    pen = painter.pen()
+    brush = painter.brush()
+    if not _solidBrush(brush) or not _solidBrush(pen.brush()):
+        return False
+
+    # we can only blit images if there is no rotation or scaling
+    trans = painter.worldTransform()
+    if trans.type() > qt4.QTransform.TxTranslate:
+        return False
+
+    xpos = N.asarray(xpos, dtype=N.float64)
+    ypos = N.asarray(ypos, dtype=N.float64)
+    numpts = min(len(xpos), len(ypos))
+    if colorimg is not None:
+        numpts = min(numpts, colorimg.width())
+    if numpts < spriteminpoints:
+        return False
+    xpos, ypos = xpos[:numpts], ypos[:numpts]
+
+    # colors of each point
+    if colorimg is not None:
+        if colorimg.format() != qt4.QImage.Format_ARGB32:
+            colorimg = colorimg.convertToFormat(qt4.QImage.Format_ARGB32)
+        rgbas = N.frombuffer(
+            colorimg.constScanLine(0).asstring(colorimg.width()*4),
+            dtype=N.uint32)[:numpts]
+        colors, colorindex = N.unique(rgbas, return_inverse=True)
+        if len(colors) > spritemaxcolors:
+            return False
+    else:
+        colors = [brush.color().rgba()]
+        colorindex = None
+
+    # get sprites from the cache, or make them
+    helper = painter.helper
+    antialias = helper.spriteantialias
+    pendash = ( tuple(pen.dashPattern())
+                if pen.style() == qt4.Qt.CustomDashLine else None )
+    penkey = (
+        pen.style(), pendash, pen.widthF(), pen.capStyle(), pen.joinStyle(),
+        pen.color().rgba(), brush.style())
+    sprites = []
+    for color in colors:
+        skey = key + penkey + (int(color), antialias)
+        if skey not in helper.spritecache:
+            if colorimg is None:
+                spritebrush = brush
+            else:
+                spritebrush = qt4.QBrush(qt4.QColor.fromRgba(int(color)))
+            helper.spritecache[skey] = _makeSprite(
+                path, pen, spritebrush, antialias)
+        sprites.append(helper.spritecache[skey])
+    sprite0, sx0, sy0 = sprites[0]
+    spw, sph = sprite0.width(), sprite0.height()
+
+    # area which can be drawn on (the size of the device is not used,
+    # as a QPicture's size is that of what has been drawn so far)
+    pagesize = helper.pagesize
+    area = qt4.QRectF(0, 0, pagesize[0], pagesize[1]).translated(
+        -trans.dx(), -trans.dy())
+    if clip is not None:
+        area = area.intersected(qt4.QRectF(clip))
+
+    # integer pixel positions of the top left of sprites
+    with N.errstate(invalid='ignore'):
+        ix = N.floor(xpos + 0.5) + sx0
+        iy = N.floor(ypos + 0.5) + sy0
+        visible = ( (ix+spw > area.left()) & (ix < area.right()) &
+                    (iy+sph > area.top()) & (iy < area.bottom()) )
+    ix = ix[visible].astype(N.intc)
+    iy = iy[visible].astype(N.intc)
+    if colorindex is not None:
+        colorindex = colorindex[visible]
+    if len(ix) == 0:
+        return True
+
+    # layer to draw sprites onto
+    lx0, ly0 = ix.min(), iy.min()
+    lw, lh = ix.max()-lx0+spw, iy.max()-ly0+sph
+    ix -= lx0
+    iy -= ly0
+
+    # Opaque sprites at the same position hide earlier ones, so only
+    # draw the final one at each position. Hollow markers do not hide
+    # earlier ones. (alpha is the most significant byte of the colors)
+    opaque = (
+        pen.color().alpha() in (0, 255) and
+        brush.style() == qt4.Qt.SolidPattern and
+        (int(N.min(colors)) >> 24) == 255 )
+    if opaque:
+        poskey = iy.astype(N.int64)*lw + ix
+        rev = poskey[::-1]
+        dummy, firstrev = N.unique(rev, return_index=True)
+        keep = N.sort(len(poskey)-1-firstrev)
+        ix, iy = ix[keep], iy[keep]
+        if colorindex is not None:
+            colorindex = colorindex[keep]
+
+    layer = qt4.QImage(int(lw), int(lh),
+                       qt4.QImage.Format_ARGB32_Premultiplied)
+    layer.fill(0)
+    lpainter = qt4.QPainter(layer)
+    drawImage = lpainter.drawImage
+    if colorindex is None:
+        for x, y in czip(ix.tolist(), iy.tolist()):
+            drawImage(x, y, sprite0)
+    else:
+        images = [s[0] for s in sprites]
+        for x, y, c in czip(ix.tolist(), iy.tolist(), colorindex.tolist()):
+            drawImage(x, y, images[c])
+    lpainter.end()
+
+    painter.drawImage(qt4.QPointF(lx0, ly0), layer)
+    return True
+
 def plotMarker(painter, xpos, ypos, markername, markersize):
     """Function to plot a marker on a painter, posn xpos, ypos, type and size
     """
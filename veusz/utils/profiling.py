@@ -0,0 +1,198 @@
+#    Copyright (C) 2016 Jeremy S. Sanders
+#    Email: Jeremy Sanders <jeremy@jeremysanders.net>
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 2 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+###############################################################################
+
+"""Instrumentation to record time taken by parts of the document.
+
+Times and call counts are recorded for (name, phase) pairs, where name
+is normally the path of a widget, and phase is one of the phases
+listed in Profiler.phases. Widgets can be passed instead of names, so
+that their paths are only looked up if profiling is enabled. When
+profiling is disabled the timers do nothing.
+"""
+
+from __future__ import division
+import threading
+import time
+
+from ..compat import citems, cbasestr
+
+# use the most precise clock available
+try:
+    _clock = time.perf_counter
+except AttributeError:
+    _clock = time.time
+
+class _NullTimer(object):
+    """Timer which does nothing, used when profiling is disabled."""
+    def __enter__(self):
+        pass
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+_nulltimer = _NullTimer()
+
+class _Timer(object):
+    """Context manager to add the time taken to the profiler."""
+
+    def __init__(self, profiler, name, phase):
+        self.profiler = profiler
+        self.name = name
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = _clock()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add(self.name, self.phase, _clock()-self.start)
+
+class ExclusiveTimerStack(object):
+    """Record times for nested timers, where the time spent in an
+    inner timer is not included in the outer one."""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.stack = []
+
+    def push(self, name, phase):
+        """Start timing name and phase, pausing any outer timer."""
+        if not self.profiler.enabled:
+            self.stack.append(None)
+            return
+        now = _clock()
+        if self.stack and self.stack[-1] is not None:
+            outer = self.stack[-1]
+            outer[2] += now - outer[3]
+        # name, phase, accumulated time, start time
+        self.stack.append([name, phase, 0., now])
+
+    def pop(self):
+        """Stop timing innermost timer, restarting any outer timer."""
+        item = self.stack.pop()
+        if item is None:
+            return
+        now = _clock()
+        self.profiler.add(item[0], item[1], item[2] + now - item[3])
+        if self.stack and self.stack[-1] is not None:
+            self.stack[-1][3] = now
+
+class Profiler(object):
+    """Keep track of time spent in each phase of drawing for widgets."""
+
+    # phases of drawing which are recorded
+    phases = (
+        'page',        # total time to draw a page
+        'autorange',   # calculating automatic axis ranges
+        'data',        # fetching datasets for a widget
+        'expression',  # evaluating dataset expressions
+        'transform',   # converting coordinates on axes
+        'paint',       # painting the widget
+        'text',        # laying out and rendering text
+        'playback',    # replaying recorded painting to output
+        )
+
+    # columns which can be used to sort reports
+    sortcolumns = ('time', 'count', 'mean', 'name', 'phase')
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def enable(self, enabled=True):
+        """Turn profiling on or off."""
+        self.enabled = enabled
+
+    def reset(self):
+        """Forget recorded times."""
+        with self.lock:
+            self.stats = {}
+
+    def timer(self, name, phase):
+        """Return a context manager to record time for name and phase."""
+        if not self.enabled:
+            return _nulltimer
+        return _Timer(self, name, phase)
+
+    def add(self, name, phase, elapsed):
+        """Add elapsed time to name (or widget) and phase."""
+        if not isinstance(name, cbasestr):
+            name = widgetName(name)
+        with self.lock:
+            stat = self.stats.get((name, phase))
+            if stat is None:
+                self.stats[(name, phase)] = [elapsed, 1]
+            else:
+                stat[0] += elapsed
+                stat[1] += 1
+
+    def report(self, sortby='time'):
+        """Return a list of (name, phase, total time, count, mean time),
+        sorted by the column given in sortby (see sortcolumns).
+        """
+
+        with self.lock:
+            rows = [ (name, phase, stat[0], stat[1], stat[0]/stat[1])
+                     for (name, phase), stat in citems(self.stats) ]
+
+        col = self.sortcolumns.index(sortby)
+        # numeric columns are sorted with largest first
+        rows.sort(key=lambda r: r[(2, 3, 4, 0, 1)[col]],
+                  reverse=col < 3)
+        return rows
+
+    def reportText(self, sortby='time', maxrows=None):
+        """Return report as a text table."""
+
+        rows = self.report(sortby=sortby)
+        if maxrows is not None:
+            rows = rows[:maxrows]
+
+        namewidth = max([len(r[0]) for r in rows] + [4])
+        fmt = '%%-%is %%-10s %%10s %%8s %%10s\n' % namewidth
+        out = [fmt % ('Name', 'Phase', 'Time (ms)', 'Calls', 'Mean (ms)')]
+        for name, phase, total, count, mean in rows:
+            out.append(fmt % (
+                name, phase, '%.2f' % (total*1e3), count, '%.3f' % (mean*1e3)))
+        return ''.join(out)
+
+    def nameTimes(self, phases=('paint',)):
+        """Return dict of names to total time, summing over the phases
+        given.
+
+        By default only 'paint' is used. This excludes the painting
+        time of child widgets, but includes the other phases which
+        happen while painting, so adding those would count them twice.
+        """
+
+        out = {}
+        with self.lock:
+            for (name, phase), stat in citems(self.stats):
+                if phase in phases:
+                    out[name] = out.get(name, 0.) + stat[0]
+        return out
+
+def widgetName(widget):
+    """Name to use for a widget when profiling."""
+    return widget.path if widget is not None else '(none)'
+
+def painterWidget(painter):
+    """Return the widget being painted by a painter, if known."""
+    return getattr(painter, 'widget', None)
+
+# the profiler used by the program
+profiler = Profiler()
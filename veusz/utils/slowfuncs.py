@@ -23,7 +23,6 @@ These are slow versions of routines also implemented in C++
 from __future__ import division
 from itertools import count
 import sys
-import struct
 import math
 
 from ..compat import crange, czip
@@ -204,60 +203,83 @@ def plotBoxesToPainter(painter, x1, y1, x2, y2, clip=None, autoexpand=True):
     if rects:
         painter.drawRects(rects)
 
-def slowNumpyToQImage(img, cmap, transparencyimg):
-    """Slow version of routine to convert numpy array to QImage
-    This is hard work in Python, but it was like this originally.
-
-    img: numpy array to convert to QImage
-    cmap: 2D array of colors (BGRA rows)
-    forcetrans: force image to have alpha component."""
+def qimageFromArray(arr, fmt):
+    """Make a QImage from a 2D numpy array of 32 bit colors.
 
-    if struct.pack("h", 1) == "\000\001":
-        # have to swap colors for big endian architectures
-        cmap2 = cmap.copy()
-        cmap2[:,0] = cmap[:,3]
-        cmap2[:,1] = cmap[:,2]
-        cmap2[:,2] = cmap[:,1]
-        cmap2[:,3] = cmap[:,0]
-        cmap = cmap2
+    The image owns a copy of the data, as Qt may keep copies of the
+    image (e.g. in recorded paint operations) which outlive the
+    array. The array is kept to avoid converting the image back.
+    """
+    arr = N.ascontiguousarray(arr, dtype=N.uint32)
+    img = qt4.QImage(arr.ctypes.data, arr.shape[1], arr.shape[0],
+                     arr.shape[1]*4, fmt).copy()
+    img.veusz_array = (img.cacheKey(), arr)
+    return img
 
-    fracs = N.clip(N.ravel(img), 0., 1.)
+def qimageToArray(img):
+    """Return a 2D numpy array of uint32 colors for a QImage."""
+    cached = getattr(img, 'veusz_array', None)
+    # the cache key changes if the image is modified
+    if cached is not None and cached[0] == img.cacheKey():
+        return cached[1]
+    if img.depth() != 32:
+        img = img.convertToFormat(qt4.QImage.Format_ARGB32)
+    buf = img.constBits().asstring(img.byteCount())
+    arr = N.frombuffer(buf, dtype=N.uint32).reshape(
+        img.height(), img.bytesPerLine()//4)
+    return arr[:, :img.width()]
 
-    # Work out which is the minimum colour map. Assumes we have <255 bands.
-    numbands = cmap.shape[0]-1
-    bands = (fracs*numbands).astype(N.uint8)
-    bands = N.clip(bands, 0, numbands-1)
+def slowNumpyToQImage(img, cmap, transparencyimg):
+    """Version of routine to convert numpy array to QImage using numpy.
 
-    # work out fractional difference of data from band to next band
-    deltafracs = (fracs - bands * (1./numbands)) * numbands
+    img: numpy array to convert to QImage
+    cmap: 2D array of colors (BGRA rows)
+    transparencyimg: optional array of 0-1 values to scale alpha by
+    """
 
-    # need to make a 2-dimensional array to multiply against triplets
-    deltafracs.shape = (deltafracs.shape[0], 1)
+    cmap = N.array(cmap, dtype=N.intc)
+    numcolors = cmap.shape[0]
+
+    # the y direction of numpy and Qt images is different
+    vals = N.array(img[::-1], dtype=N.float64)
+    finite = N.isfinite(vals)
+    vals[~finite] = 0.
+    vals = N.clip(vals, 0., 1.)
+
+    if cmap[0,0] == -1:
+        # jumps between colors in stepped mode (ignoring 1st color,
+        # which signals this mode)
+        bands = N.clip( (vals*(numcolors-1)).astype(N.intc)+1,
+                        1, numcolors-1 )
+        bgra = cmap[bands]
+    else:
+        # linear interpolation between a band and the next band
+        numbands = numcolors-1
+        bands = N.clip( (vals*numbands).astype(N.intc), 0,
+                        max(numbands-1, 0) )
+        delta = (vals*numbands - bands)[..., N.newaxis]
+        bands2 = N.minimum(bands+1, numbands)
+        bgra = ( (1.-delta)*cmap[bands] + delta*cmap[bands2] ).astype(N.intc)
 
-    # calculate BGRalpha quadruplets
-    # this is a linear interpolation between the band and the next band
-    quads = (deltafracs*cmap[bands+1] +
-             (1.-deltafracs)*cmap[bands]).astype(N.uint8)
+    # non finite values are transparent
+    bgra[~finite] = 0
 
     # apply transparency if a transparency image is set
     if transparencyimg is not None and transparencyimg.shape == img.shape:
-        quads[:,3] = ( N.clip(N.ravel(transparencyimg), 0., 1.) *
-                       quads[:,3] ).astype(N.uint8)
+        trans = N.clip(transparencyimg[::-1], 0., 1.)
+        bgra[...,3] = (bgra[...,3]*trans).astype(N.intc)
 
-    # convert 32bit quads to a Qt QImage
-    s = quads.tostring()
+    # convert to 32 bit colors in the native byte order, as QRgb
+    bgra = bgra.astype(N.uint32)
+    colors = ( (bgra[...,3] << 24) | (bgra[...,2] << 16) |
+               (bgra[...,1] << 8) | bgra[...,0] )
 
     fmt = qt4.QImage.Format_RGB32
     if N.any(cmap[:,3] != 255) or transparencyimg is not None:
         # any transparency
         fmt = qt4.QImage.Format_ARGB32
 
-    img = qt4.QImage(s, img.shape[1], img.shape[0], fmt)
-    img = img.mirrored()
-
-    # hack to ensure string isn't freed before QImage
-    img.veusz_string = s
-    return img
+    return qimageFromArray(colors, fmt)
 
 def resampleLinearImage(img, xpts, ypts):
     """Resample image to linear image.
@@ -267,6 +289,8 @@ def resampleLinearImage(img, xpts, ypts):
     ypts: edge grid points for image.
     """
 
+    xpts = N.array(xpts, dtype=N.float64)
+    ypts = N.array(ypts, dtype=N.float64)
     if xpts[0] > xpts[-1]:
         xpts = xpts[::-1]
     if ypts[0] > ypts[-1]:
@@ -279,30 +303,27 @@ def resampleLinearImage(img, xpts, ypts):
     minx, maxx = xpts[0], xpts[-1]
     miny, maxy = ypts[0], ypts[-1]
 
-    sizex = int((maxx - minx) / (mindeltax*0.5) + 0.01)
-    sizey = int((maxy - miny) / (mindeltay*0.5) + 0.01)
+    sizex = int((maxx - minx) / (mindeltax*0.25) + 0.01)
+    sizey = int((maxy - miny) / (mindeltay*0.25) + 0.01)
     sizex = min(sizex, 1024)
     sizey = min(sizey, 1024)
 
     deltax = (maxx - minx) / sizex
     deltay = (maxy - miny) / sizey
 
-    outimg = qt4.QImage(sizex, sizey, img.format())
-
-    iy = 0
-    for oy in crange(sizey):
-        while miny+(oy+0.5)*deltay > ypts[iy+1] and iy < len(ypts)-2:
-            iy += 1
+    # find input pixel for the centre of each output pixel
+    xc = minx + (N.arange(sizex)+0.5)*deltax
+    yc = miny + (N.arange(sizey)+0.5)*deltay
+    ix = N.minimum(N.searchsorted(xpts[1:], xc, side='left'), len(xpts)-2)
+    iy = N.minimum(N.searchsorted(ypts[1:], yc, side='left'), len(ypts)-2)
 
-        ix = 0
-        for ox in crange(sizex):
-            while minx+(ox+0.5)*deltax > xpts[ix+1] and ix < len(xpts)-2:
-                ix += 1
+    inarr = qimageToArray(img)
+    outarr = inarr[iy[:,N.newaxis], ix[N.newaxis,:]]
 
-            col = img.pixel(qt4.QPoint(ix, iy))
-            outimg.setPixel(ox, oy, col)
-
-    return outimg
+    fmt = img.format()
+    if img.depth() != 32:
+        fmt = qt4.QImage.Format_ARGB32
+    return qimageFromArray(outarr, fmt)
 
 class RotatedRectangle:
     """A rectangle with a rotation angle."""
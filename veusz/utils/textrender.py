@@ -28,6 +28,7 @@ import numpy as N
 from ..compat import cbasestr, cstr
 from .. import qtall as qt4
 from . import points
+from . import profiling
 
 mmlsupport = True
 try:
@@ -1193,6 +1194,15 @@ class _Renderer:
     def _initText(self, text):
         """Override this to set up renderer with text."""
 
+    def render(self):
+        """Render the text, returning its bounds."""
+        with profiling.profiler.timer(
+                profiling.painterWidget(self.painter), 'text'):
+            return self._render()
+
+    def _render(self):
+        """Override this to render the text."""
+
     def ensureInBox(self, minx = -32767, maxx = 32767,
                     miny = -32767, maxy = 32767, extraspace = False):
         """Adjust position of text so that it is within this box."""
@@ -1387,7 +1397,7 @@ class _StdRenderer(_Renderer):
 
         return totalwidth, totalheight, dy
 
-    def render(self):
+    def _render(self):
         """Render the text."""
 
         if self.calcbounds is None:
@@ -1480,7 +1490,7 @@ class _MmlRenderer(_Renderer):
     def _getWidthHeight(self):
         return self.size.width(), self.size.height(), 0
 
-    def render(self):
+    def _render(self):
         """Render the text."""
 
         if self.calcbounds is None:
@@ -1536,9 +1546,10 @@ def Renderer(painter, font, x, y, text,
     else:
         r = _StdRenderer
 
-    return r(
-        painter, font, x, y, text,
-        alignhorz=alignhorz, alignvert=alignvert,
-        angle=angle, usefullheight=usefullheight,
-        doc=doc
-        )
+    with profiling.profiler.timer(profiling.painterWidget(painter), 'text'):
+        return r(
+            painter, font, x, y, text,
+            alignhorz=alignhorz, alignvert=alignvert,
+            angle=angle, usefullheight=usefullheight,
+            doc=doc
+            )
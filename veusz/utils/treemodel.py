@@ -181,6 +181,64 @@ class TreeModel(qt4.QAbstractItemModel):
 
         return len(parentitem.childnodes)
 
+    def nodeIndex(self, node):
+        """Return index of node (an invalid index for the root)."""
+        if node is self.root:
+            return qt4.QModelIndex()
+        row = node.parent.childnodes.index(node)
+        return self.createIndex(row, 0, node._idx)
+
+    def _addNodeIndices(self, node):
+        """Assign indices to node and its children."""
+        node._idx = self.nodeindex
+        self.nodeindex += 1
+        self.nodes[node._idx] = node
+        for c in node.childnodes:
+            self._addNodeIndices(c)
+
+    def _removeNodeIndices(self, node):
+        """Remove indices of node and its children."""
+        del self.nodes[node._idx]
+        for c in node.childnodes:
+            self._removeNodeIndices(c)
+
+    def setRoot(self, newroot):
+        """Replace the tree with the one given."""
+        self.beginResetModel()
+        self.root = newroot
+        self.nodes = {}
+        for c in newroot.childnodes:
+            self._addNodeIndices(c)
+        self.endResetModel()
+
+    def insertNodeSorted(self, parent, node):
+        """Insert node (with any children) into the parent node in the
+        tree, sorted by its data."""
+        cdata = [c.data for c in parent.childnodes]
+        row = bisect.bisect_left(cdata, node.data)
+        self.beginInsertRows(self.nodeIndex(parent), row, row)
+        node.parent = parent
+        parent.childnodes.insert(row, node)
+        self._addNodeIndices(node)
+        self.endInsertRows()
+
+    def removeNode(self, node):
+        """Remove node (with any children) from the tree."""
+        parent = node.parent
+        row = parent.childnodes.index(node)
+        self.beginRemoveRows(self.nodeIndex(parent), row, row)
+        del parent.childnodes[row]
+        self._removeNodeIndices(node)
+        self.endRemoveRows()
+
+    def setNodeData(self, node, data):
+        """Change data of node in the tree.
+        The node should keep the same sort position."""
+        node.data = data
+        idx = self.nodeIndex(node)
+        self.dataChanged.emit(
+            idx, self.createIndex(idx.row(), len(data)-1, node._idx))
+
     @staticmethod
     def _getdata(theroot):
         """Get a set of child node data and a mapping of data to node."""
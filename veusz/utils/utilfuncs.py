@@ -140,10 +140,15 @@ def extendedColorFromQColor(col):
 
 def pixmapAsHtml(pix):
     """Get QPixmap as html image text."""
+    return imageAsHtml(pix.toImage())
+
+def imageAsHtml(img):
+    """Get QImage as html image text.
+    Unlike pixmapAsHtml, this can be used outside the main thread."""
     ba = qt4.QByteArray()
     buf = qt4.QBuffer(ba)
     buf.open(qt4.QIODevice.WriteOnly)
-    pix.toImage().save(buf, "PNG")
+    img.save(buf, "PNG")
     b64 = cbytes(buf.data().toBase64()).decode('ascii')
     return '<img src="data:image/png;base64,%s">' % b64
 
@@ -585,3 +590,24 @@ def unescapeHDFDataName(name):
 def allNotNone(*items):
     """Are all the items not None."""
     return not any((x is None for x in items))
+
+_moduleavailable = {}
+def moduleAvailable(name):
+    """Return whether a top level module can be imported, without
+    importing it (which may be slow)."""
+    if name in sys.modules:
+        return True
+    if name not in _moduleavailable:
+        try:
+            import importlib.util
+            found = importlib.util.find_spec(name) is not None
+        except (ImportError, AttributeError):
+            # python 2 or python 3.3 (no find_spec)
+            import imp
+            try:
+                imp.find_module(name)
+                found = True
+            except ImportError:
+                found = False
+        _moduleavailable[name] = found
+    return _moduleavailable[name]
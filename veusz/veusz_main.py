@@ -25,6 +25,7 @@ import sys
 import os.path
 import signal
 import optparse
+import atexit
 
 # trick to make sure veusz is on the path, if being run as a script
 try:
@@ -34,6 +35,11 @@ except ImportError:
         os.path.abspath(os.path.join(os.path.dirname(__file__), '..')) )
     import veusz
 
+# record times of the imports below, if requested
+from veusz import startupprofile
+if '--profile-startup' in sys.argv:
+    startupprofile.enable()
+
 from veusz.compat import czip, cbytes
 from veusz import qtall as qt4
 from veusz import utils
@@ -167,11 +173,25 @@ class VeuszApp(qt4.QApplication):
                           ' output image file, exiting when finished')
         parser.add_option('--embed-remote', action='store_true',
                           help=optparse.SUPPRESS_HELP)
+        parser.add_option('--export-server', action='store_true',
+                          help='run a server which exports documents sent'
+                          ' with veusz_export_client (see'
+                          ' --export-server --help)')
         parser.add_option('--plugin', action='append', metavar='FILE',
                           help='load the plugin from the file given for '
                           'the session')
         parser.add_option('--translation', metavar='FILE',
                           help='load the translation .qm file given')
+        parser.add_option('--profile', action='store_true',
+                          help='record time taken to draw documents, writing'
+                          ' a report to stderr on exit')
+        parser.add_option('--clear-import-cache', action='store_true',
+                          help='remove all entries in the import cache,'
+                          ' exiting unless documents are given')
+        parser.add_option('--profile-startup', action='store_true',
+                          help='record time taken to import modules and'
+                          ' load plugins on startup, writing a report to'
+                          ' stderr')
         options, args = parser.parse_args(self.arguments())
 
         # export files to make images
@@ -229,7 +249,8 @@ class VeuszApp(qt4.QApplication):
     def startup(self):
         """Do startup."""
 
-        if not (self.options.listen or self.options.export):
+        if not (self.options.listen or self.options.export or
+                self.options.clear_import_cache):
             # show the splash screen on normal start
             self.splash = makeSplashLogo()
             self.splash.show()
@@ -250,9 +271,11 @@ class VeuszApp(qt4.QApplication):
         options = self.options
         args = self.args
 
-        from veusz.utils import vzdbus, vzsamp
-        vzdbus.setup()
-        vzsamp.setup()
+        if not options.export:
+            from veusz.utils import vzdbus
+            vzdbus.setup()
+            # SAMP is slow to import, so set up after window is shown
+            qt4.QTimer.singleShot(0, self.slotSetupSAMP)
 
         from veusz import document
         from veusz import setting
@@ -270,9 +293,30 @@ class VeuszApp(qt4.QApplication):
 
         # load any requested plugins
         if options.plugin:
-            document.Document.loadPlugins(pluginlist=options.plugin)
+            with startupprofile.phase('command line plugins'):
+                document.Document.loadPlugins(pluginlist=options.plugin)
+
+        # record drawing times, reporting them on exit
+        if options.profile:
+            utils.profiler.enable()
+            atexit.register(
+                lambda: sys.stderr.write(utils.profiler.reportText()))
+
+        if options.clear_import_cache:
+            from veusz.dataimport import importcache
+            importcache.clear()
+            if not (options.listen or options.export or len(args) > 1):
+                self.quit()
+                sys.exit(0)
 
         # different modes
+        # report import times when started, or on exit if exporting
+        if options.profile_startup:
+            if options.export:
+                atexit.register(startupprofile.finish)
+            else:
+                qt4.QTimer.singleShot(0, startupprofile.finish)
+
         if options.listen:
             # listen to incoming commands
             listen(args, quiet=options.quiet)
@@ -282,13 +326,19 @@ class VeuszApp(qt4.QApplication):
             sys.exit(0)
         else:
             # standard start main window
-            self.openMainWindow(args)
+            with startupprofile.phase('open main window'):
+                self.openMainWindow(args)
             self.startupdone = True
 
         # clear splash when startup done
         if self.splash is not None:
             self.splash.finish(self.topLevelWidgets()[0])
 
+    def slotSetupSAMP(self):
+        """Connect to SAMP hub, if available."""
+        from veusz.utils import vzsamp
+        vzsamp.setup()
+
 def run():
     '''Run the main application.'''
 
@@ -306,6 +356,14 @@ def run():
         runremote()
         return
 
+    # run export server without starting the application
+    if '--export-server' in sys.argv:
+        from veusz.export_server import runserver
+        args = sys.argv[1:]
+        args.remove('--export-server')
+        runserver(args)
+        return
+
     # this function is spaghetti-like and has nasty code paths.
     # the idea is to postpone the imports until the splash screen
     # is shown
@@ -634,8 +634,9 @@ class Axis(widget.Widget):
 
     def dataToPlotterCoords(self, posn, data):
         """Convert data values to plotter coordinates, scaling if necessary."""
-        self.updateAxisLocation(posn)
-        return self._graphToPlotter(data*self.settings.datascale)
+        with utils.profiler.timer(self, 'transform'):
+            self.updateAxisLocation(posn)
+            return self._graphToPlotter(data*self.settings.datascale)
 
     def plotterToGraphCoords(self, bounds, vals):
         """Convert plotter coordinates on this axis to graph coordinates.
@@ -25,6 +25,8 @@ as a C routine (taken from matplotlib) is used to trace the contours.
 from __future__ import division, print_function
 import sys
 import math
+import threading
+import multiprocessing
 
 from ..compat import czip, crange
 from .. import qtall as qt4
@@ -56,6 +58,53 @@ def finitePoly(poly):
         out.append( line[validrows] )
     return out
 
+# trace contours in threads if the dataset has more than this many points
+threadedtraceminsize = 250000
+
+def traceContourLevels(xpts, ypts, data, mask, levels):
+    """Trace the contour levels given, returning a dict mapping each
+    level to a list of lines.
+
+    Each level is a tuple of one level (for lines) or two levels (for
+    polygons between the levels). Large datasets are traced in
+    multiple threads. Each thread uses its own Cntr object, as the
+    tracer is not reentrant.
+    """
+
+    levels = list(levels)
+    try:
+        numthreads = multiprocessing.cpu_count()
+    except NotImplementedError:
+        numthreads = 1
+    if data.size < threadedtraceminsize:
+        numthreads = 1
+    numthreads = max(1, min(numthreads, len(levels)))
+
+    out = {}
+    errors = []
+    def trace(chunk):
+        try:
+            c = Cntr(xpts, ypts, data, mask)
+            for level in chunk:
+                # dict assignment is atomic, so is thread safe
+                out[level] = finitePoly(c.trace(*level))
+        except Exception as e:
+            errors.append(e)
+
+    if numthreads == 1:
+        trace(levels)
+    else:
+        threads = [ threading.Thread(target=trace, args=(levels[i::numthreads],))
+                    for i in crange(numthreads) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+    return out
+
 class ContourLineLabeller(LineLabeller):
     def __init__(self, clip, rot, painter, font, doc):
         LineLabeller.__init__(self, clip, rot)
@@ -178,6 +227,10 @@ class Contour(plotters.GenericPlotter):
         self.lastdataset = None
         self.contsettings = None
 
+        # traced lines or polygons for the current dataset, mapping
+        # (level,) or (level1, level2) to lists of lines
+        self._levelcache = {}
+
         # cached traced contours
         self._cachedcontours = None
         self._cachedpolygons = None
@@ -432,6 +485,7 @@ class Contour(plotters.GenericPlotter):
         data = d.data.get(s.data, None)
         if data is None or data.dimensions != 2 or data.data.size == 0:
             self.contsettings = self.lastdataset = None
+            self._levelcache = {}
             s.levelsOut = []
             return False
 
@@ -442,6 +496,9 @@ class Contour(plotters.GenericPlotter):
                          tuple(s.manualLevels) )
 
         if data is not self.lastdataset or contsettings != self.contsettings:
+            if data is not self.lastdataset:
+                # traced contours are no longer valid
+                self._levelcache = {}
             self.updateContours()
             self.lastdataset = data
             self.contsettings = contsettings
@@ -476,41 +533,49 @@ class Contour(plotters.GenericPlotter):
         if xw == 0 or yw == 0:
             return
 
-        xc, yc = data.getPixelCentres()
-        xpts = N.reshape( N.tile(xc, yw), (yw, xw) )
-        ypts = N.tile(yc[:, N.newaxis], xw)
-
-        # only keep finite data points
-        mask = N.logical_not(N.isfinite(data.data))
-
         # iterate over the levels and trace the contours
         self._cachedcontours = None
         self._cachedpolygons = None
         self._cachedsubcontours = None
 
-        if Cntr is not None:
-            c = Cntr(xpts, ypts, data.data, mask)
-
-            # trace the contour levels
-            if len(s.Lines.lines) != 0:
-                self._cachedcontours = []
-                for level in levels:
-                    linelist = c.trace(level)
-                    self._cachedcontours.append( finitePoly(linelist) )
-
-            # trace the polygons between the contours
-            if len(s.Fills.fills) != 0 and len(levels) > 1 and not s.Fills.hide:
-                self._cachedpolygons = []
-                for level1, level2 in czip(levels[:-1], levels[1:]):
-                    linelist = c.trace(level1, level2)
-                    self._cachedpolygons.append( finitePoly(linelist) )
-
-            # trace sub-levels
-            if len(sublevels) > 0:
-                self._cachedsubcontours = []
-                for level in sublevels:
-                    linelist = c.trace(level)
-                    self._cachedsubcontours.append( finitePoly(linelist) )
+        if Cntr is None:
+            return
+
+        # which levels (or pairs of levels for fills) are needed
+        linelevels = []
+        if len(s.Lines.lines) != 0:
+            linelevels = [(level,) for level in levels]
+        polylevels = []
+        if len(s.Fills.fills) != 0 and len(levels) > 1 and not s.Fills.hide:
+            polylevels = list(czip(levels[:-1], levels[1:]))
+        sublinelevels = [(level,) for level in sublevels]
+
+        # only trace levels which have not been traced before
+        needed = set(linelevels + polylevels + sublinelevels)
+        totrace = [l for l in needed if l not in self._levelcache]
+        if totrace:
+            xc, yc = data.getPixelCentres()
+            xpts = N.reshape( N.tile(xc, yw), (yw, xw) )
+            ypts = N.tile(yc[:, N.newaxis], xw)
+
+            # only keep finite data points
+            mask = N.logical_not(N.isfinite(data.data))
+
+            self._levelcache.update(
+                traceContourLevels(xpts, ypts, data.data, mask, totrace))
+
+        # throw away levels no longer used
+        for level in list(self._levelcache):
+            if level not in needed:
+                del self._levelcache[level]
+
+        cache = self._levelcache
+        if linelevels:
+            self._cachedcontours = [cache[l] for l in linelevels]
+        if polylevels:
+            self._cachedpolygons = [cache[l] for l in polylevels]
+        if sublinelevels:
+            self._cachedsubcontours = [cache[l] for l in sublinelevels]
 
     def _plotContours(self, painter, posn, axes, linestyles,
                       contours, showlabels, hidelines, clip):
@@ -313,7 +313,9 @@ class _GraphMarginBox(qt4.QGraphicsItem):
 
     def updateWidget(self):
         """Update widget margins."""
-        self.params.widget.updateControlItem(self.params)
+        # widget may be being drawn in another thread
+        self.params.widget.document.callWithPaintLock(
+            lambda: self.params.widget.updateControlItem(self.params))
 
 
 ##############################################################################
@@ -464,7 +466,8 @@ class _GraphResizableBox(qt4.QGraphicsItem):
 
     def updateWidget(self):
         """Tell the user the graphicsitem has been moved or resized."""
-        self.params.widget.updateControlItem(self.params)
+        self.params.widget.document.callWithPaintLock(
+            lambda: self.params.widget.updateControlItem(self.params))
 
     def boundingRect(self):
         """Intentionally zero bounding rect."""
@@ -570,7 +573,9 @@ class _GraphLine(qt4.QGraphicsLineItem):
         pt2 = ( self.pts[1].x() + self.pos().x(),
                 self.pts[1].y() + self.pos().y() )
 
-        self.params.widget.updateControlItem(self.params, pt1, pt2)
+        self.params.widget.document.callWithPaintLock(
+            lambda: self.params.widget.updateControlItem(
+                self.params, pt1, pt2))
 
 #############################################################################
 
@@ -723,7 +728,8 @@ class _GraphAxisLine(qt4.QGraphicsItem):
 
     def updateWidget(self):
         """Tell widget to update."""
-        self.params.widget.updateControlItem(self.params)
+        self.params.widget.document.callWithPaintLock(
+            lambda: self.params.widget.updateControlItem(self.params))
 
     def boundingRect(self):
         """Intentionally zero bounding rect."""
@@ -34,14 +34,23 @@ from .. import qtall as qt4
 from .function import FunctionPlotter
 from . import widget
 
-# try importing iminuit first, then minuit, then None
-try:
-    import iminuit as minuit
-except ImportError:
-    try:
-        import minuit
-    except ImportError:
-        minuit = None
+# lazily imported (False if import not yet tried)
+minuit = False
+
+def loadMinuitModule():
+    """Import iminuit first, then minuit, returning None if neither is
+    available."""
+    global minuit
+    if minuit is False:
+        try:
+            import iminuit as mod
+        except ImportError:
+            try:
+                import minuit as mod
+            except ImportError:
+                mod = None
+        minuit = mod
+    return minuit
 
 def _(text, disambiguation=None, context='Fit'):
     """Translate text."""
@@ -340,7 +349,7 @@ class Fit(FunctionPlotter):
             sys.stderr.write(_('No data values. Not fitting.\n'))
             return
 
-        if minuit is not None:
+        if loadMinuitModule() is not None:
             vals, chi2, dof = minuitFit(evalfunc, params, paramnames, s.values,
                                         xvals, yvals, yserr)
         else:
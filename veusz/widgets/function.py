@@ -373,11 +373,17 @@ class FunctionPlotter(GenericPlotter):
         return pickable.GenericPickable(
                     self, axisnames, (xpts, ypts), (pxpts, pypts) )
 
+    def _cachedPickable(self, bounds):
+        return pickable.cachedPickable(
+            self, bounds, lambda: self._pickable(bounds))
+
     def pickPoint(self, x0, y0, bounds, distance='radial'):
-        return self._pickable(bounds).pickPoint(x0, y0, bounds, distance)
+        return self._cachedPickable(bounds).pickPoint(
+            x0, y0, bounds, distance)
 
     def pickIndex(self, oldindex, direction, bounds):
-        return self._pickable(bounds).pickIndex(oldindex, direction, bounds)
+        return self._cachedPickable(bounds).pickIndex(
+            oldindex, direction, bounds)
 
     def dataDraw(self, painter, axes, posn, cliprect):
         """Draw the function."""
@@ -154,11 +154,16 @@ class NonOrthFunction(Widget):
 
         return pickable.GenericPickable( self, labels, (apts, bpts), (px, py) )
 
+    def _cachedPickable(self, bounds):
+        return pickable.cachedPickable(self, bounds, self._pickable)
+
     def pickPoint(self, x0, y0, bounds, distance='radial'):
-        return self._pickable().pickPoint(x0, y0, bounds, distance)
+        return self._cachedPickable(bounds).pickPoint(
+            x0, y0, bounds, distance)
 
     def pickIndex(self, oldindex, direction, bounds):
-        return self._pickable().pickIndex(oldindex, direction, bounds)
+        return self._cachedPickable(bounds).pickIndex(
+            oldindex, direction, bounds)
 
     def autoColor(self, painter, dataindex=0):
         """Automatic color for plotting."""
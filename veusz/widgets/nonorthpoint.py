@@ -138,15 +138,20 @@ class NonOrthPoint(Widget):
             inrange[2] = min( N.nanmin(d2.data), inrange[2] )
             inrange[3] = max( N.nanmax(d2.data), inrange[3] )
 
-    def pickPoint(self, x0, y0, bounds, distance = 'radial'):
-        p = pickable.DiscretePickable(self, 'data1', 'data2',
+    def _pickable(self):
+        return pickable.DiscretePickable(self, 'data1', 'data2',
                 lambda v1, v2: self.parent.graphToPlotCoords(v1, v2))
-        return p.pickPoint(x0, y0, bounds, distance)
+
+    def _cachedPickable(self, bounds):
+        return pickable.cachedPickable(self, bounds, self._pickable)
+
+    def pickPoint(self, x0, y0, bounds, distance = 'radial'):
+        return self._cachedPickable(bounds).pickPoint(
+            x0, y0, bounds, distance)
 
     def pickIndex(self, oldindex, direction, bounds):
-        p = pickable.DiscretePickable(self, 'data1', 'data2',
-                lambda v1, v2: self.parent.graphToPlotCoords(v1, v2))
-        return p.pickIndex(oldindex, direction, bounds)
+        return self._cachedPickable(bounds).pickIndex(
+            oldindex, direction, bounds)
 
     def drawLabels(self, painter, xplotter, yplotter,
                    textvals, markersize):
@@ -330,9 +330,10 @@ class Page(widget.Widget):
         x1, y1, x2, y2 = parentposn
 
         # find ranges of axes
-        axisdependhelper = AxisDependHelper()
-        axisdependhelper.recursivePlotterSearch(self)
-        axisdependhelper.findAxisRanges()
+        with utils.profiler.timer(self, 'autorange'):
+            axisdependhelper = AxisDependHelper()
+            axisdependhelper.recursivePlotterSearch(self)
+            axisdependhelper.findAxisRanges()
 
         # store axis->plotter mappings in painthelper
         painthelper.axisplottermap.update(axisdependhelper.axis_plotter_map)
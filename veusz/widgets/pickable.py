@@ -22,7 +22,7 @@
 from __future__ import division
 import numpy as N
 
-from ..compat import CBool
+from ..compat import CBool, crange
 from .. import document
 
 class PickInfo(CBool):
@@ -87,6 +87,202 @@ def _chooseOrderingSign(m, c, p):
     else:
         assert m is not None or p is not None
 
+class _PointIndex(object):
+    """Index of the points of a GenericPickable which are finite and
+    within the bounds, to quickly find the closest point.
+
+    Radial searches use a uniform grid of cells over the bounds,
+    searching rings of cells around the cursor. Horizontal and vertical
+    searches use the points sorted in that coordinate. As sorting is
+    slower than a single search of every point, the grid and sorted
+    points are only made when a second search is done. Positions
+    returned are indices into the indices array, which holds the
+    original indices of the points in ascending order.
+    """
+
+    # mean number of points in each cell of grid
+    pointspercell = 4
+    # maximum number of cells in grid
+    maxcells = 1<<20
+
+    def __init__(self, xscreen, yscreen, bounds):
+        self.bounds = tuple(bounds)
+        with N.errstate(invalid='ignore'):
+            valid = (
+                N.isfinite(xscreen) & N.isfinite(yscreen) &
+                (xscreen >= bounds[0]) & (xscreen <= bounds[2]) &
+                (yscreen >= bounds[1]) & (yscreen <= bounds[3]) )
+        self.indices = N.flatnonzero(valid)
+        self.x = xscreen[self.indices]
+        self.y = yscreen[self.indices]
+
+        # made when needed
+        self.grid = None
+        self.sortorders = {}
+        self.searched = set()
+
+    def _makeGrid(self):
+        """Sort points into cells of grid."""
+        b = self.bounds
+        width = max(b[2]-b[0], 1e-3)
+        height = max(b[3]-b[1], 1e-3)
+        ncells = min(max(len(self.x)//self.pointspercell, 1), self.maxcells)
+        size = N.sqrt(width*height/ncells)
+        nx = max(int(N.ceil(width/size)), 1)
+        ny = max(int(N.ceil(height/size)), 1)
+
+        cx = N.clip(((self.x-b[0])/size).astype(N.intp), 0, nx-1)
+        cy = N.clip(((self.y-b[1])/size).astype(N.intp), 0, ny-1)
+        cells = cy*nx + cx
+
+        # points in cell c are order[start[c]:start[c+1]]
+        order = N.argsort(cells)
+        start = N.zeros(nx*ny+1, dtype=N.intp)
+        N.cumsum(N.bincount(cells, minlength=nx*ny), out=start[1:])
+        self.grid = (size, nx, ny, order, start)
+
+    def _ringCells(self, qx, qy, r):
+        """Return numbers of cells in the grid in the ring r cells from
+        cell (qx, qy)."""
+        size, nx, ny, order, start = self.grid
+        if r == 0:
+            xs = N.array([qx])
+            ys = N.array([qy])
+        else:
+            span = N.arange(-r, r+1)
+            side = N.arange(-r+1, r)
+            xs = N.concatenate((
+                qx+span, qx+span,
+                N.full(len(side), qx-r, dtype=N.intp),
+                N.full(len(side), qx+r, dtype=N.intp)))
+            ys = N.concatenate((
+                N.full(len(span), qy-r, dtype=N.intp),
+                N.full(len(span), qy+r, dtype=N.intp),
+                qy+side, qy+side))
+        inside = (xs >= 0) & (xs < nx) & (ys >= 0) & (ys < ny)
+        return ys[inside]*nx + xs[inside]
+
+    def _closestRadial(self, x0, y0):
+        """Find closest point to (x0, y0), returning (position, dist)."""
+        if self.grid is None:
+            self._makeGrid()
+        size, nx, ny, order, start = self.grid
+        b = self.bounds
+
+        qx = int(N.floor((x0-b[0])/size))
+        qy = int(N.floor((y0-b[1])/size))
+        # rings to reach nearest and furthest cells of the grid
+        rmin = max(0, -qx, qx-nx+1, -qy, qy-ny+1)
+        rmax = max(qx, nx-1-qx, qy, ny-1-qy)
+
+        bestpos = None
+        bestdist = N.inf
+        for r in crange(rmin, rmax+1):
+            # unsearched points are at least (r-1)*size away
+            if bestdist < (r-1)*size:
+                break
+
+            cells = self._ringCells(qx, qy, r)
+            counts = start[cells+1] - start[cells]
+            total = counts.sum()
+            if total == 0:
+                continue
+
+            # join the ranges of points in each cell
+            offsets = N.repeat(start[cells] - N.cumsum(counts) + counts,
+                               counts)
+            pos = order[N.arange(total) + offsets]
+
+            dist = N.sqrt((self.x[pos]-x0)**2 + (self.y[pos]-y0)**2)
+            m = dist.min()
+            # if there are multiple equidistant points, take the first
+            p = pos[dist == m].min()
+            if m < bestdist or (m == bestdist and p < bestpos):
+                bestdist = m
+                bestpos = p
+
+        if bestpos is None:
+            return None
+        return bestpos, bestdist
+
+    def _closestAlong(self, vals, v0, key):
+        """Find closest point to v0 along coordinate vals, returning
+        (position, dist)."""
+        if key not in self.sortorders:
+            # stable sort, so equal values are in the original order
+            order = N.argsort(vals, kind='mergesort')
+            self.sortorders[key] = (order, vals[order])
+        order, sortedvals = self.sortorders[key]
+
+        k = N.searchsorted(sortedvals, v0)
+        candidates = []
+        if k > 0:
+            # first point with the value before v0
+            vleft = sortedvals[k-1]
+            first = N.searchsorted(sortedvals, vleft)
+            candidates.append( (v0-vleft, order[first]) )
+        if k < len(sortedvals):
+            candidates.append( (sortedvals[k]-v0, order[k]) )
+        if not candidates:
+            return None
+        dist, pos = min(candidates)
+        return pos, dist
+
+    def _closestSearch(self, x0, y0, distance_direction):
+        """Find closest point by checking every point, returning
+        (position, dist)."""
+        if distance_direction == 'vertical':
+            dist = N.abs(self.y - y0)
+        elif distance_direction == 'horizontal':
+            dist = N.abs(self.x - x0)
+        else:
+            dist = N.sqrt((self.x - x0)**2 + (self.y - y0)**2)
+        m = dist.min()
+        # if there are multiple equidistant points, take the first
+        return N.flatnonzero(dist == m)[0], m
+
+    def closest(self, x0, y0, distance_direction):
+        """Find closest valid point, returning (original index, distance),
+        or None if there are no valid points."""
+
+        # programming error
+        assert (distance_direction == 'radial' or
+                distance_direction == 'vertical' or
+                distance_direction == 'horizontal')
+
+        if len(self.indices) == 0:
+            return None
+
+        if distance_direction not in self.searched:
+            # first search of this type
+            self.searched.add(distance_direction)
+            res = self._closestSearch(x0, y0, distance_direction)
+        elif distance_direction == 'vertical':
+            # measure distance along y
+            res = self._closestAlong(self.y, y0, 'y')
+        elif distance_direction == 'horizontal':
+            # measure distance along x
+            res = self._closestAlong(self.x, x0, 'x')
+        else:
+            # measure radial distance
+            res = self._closestRadial(x0, y0)
+
+        if res is None:
+            return None
+        return self.indices[res[0]], res[1]
+
+def cachedPickable(widget, bounds, makefn):
+    """Return the pickable made by makefn() for widget.
+
+    The pickable (and its index) is reused until the document changes
+    or the widget is shown with different bounds (e.g. when zooming).
+    """
+    key = (widget.document.changeset, tuple(bounds))
+    cached = getattr(widget, '_pickablecache', None)
+    if cached is None or cached[0] != key:
+        cached = widget._pickablecache = (key, makefn())
+    return cached[1]
+
 class GenericPickable:
     """Utility class which abstracts the math of picking the closest point out
        of a list of points"""
@@ -97,30 +293,43 @@ class GenericPickable:
         self.xvals, self.yvals = vals
         self.xscreen, self.yscreen = screenvals
 
+        # made when first needed
+        self._pointindex = None
+        self._finite = None
+
+    def _getPointIndex(self, bounds):
+        """Get index of points for bounds given."""
+        if ( self._pointindex is None or
+             self._pointindex.bounds != tuple(bounds) ):
+            self._pointindex = _PointIndex(self.xscreen, self.yscreen, bounds)
+        return self._pointindex
+
     def _pickSign(self, i):
         if len(self.xscreen) <= 1:
             # we only have one element, so it doesn't matter anyways
             return 1
 
-        # go backwards to get previous finite point
-        mi = i-1
-        while mi >= 0 and not N.isfinite(self.xscreen[mi]+self.yscreen[mi]):
-            mi -= 1
-        if mi < 0:
+        if self._finite is None:
+            self._finite = N.flatnonzero(N.isfinite(self.xscreen+self.yscreen))
+        finite = self._finite
+
+        # previous finite point
+        k = N.searchsorted(finite, i)
+        if k == 0:
             m = None
         else:
+            mi = finite[k-1]
             m = self.xscreen[mi], self.yscreen[mi]
 
         # point in centre
         c = self.xscreen[i], self.yscreen[i]
 
-        # find next finite point
-        pi = i+1
-        while pi < len(self.xscreen) and not N.isfinite(self.xscreen[pi]+self.yscreen[pi]):
-            pi += 1
-        if pi == len(self.xscreen):
+        # next finite point
+        k = N.searchsorted(finite, i, side='right')
+        if k == len(finite):
             p = None
         else:
+            pi = finite[k]
             p = self.xscreen[pi], self.yscreen[pi]
 
         return _chooseOrderingSign(m, c, p)
@@ -136,38 +345,11 @@ class GenericPickable:
         if len(self.xscreen) == 0 or len(self.yscreen) == 0:
             return info
 
-        # calculate distances
-        if distance_direction == 'vertical':
-            # measure distance along y
-            dist = N.abs(self.yscreen - y0)
-        elif distance_direction == 'horizontal':
-            # measure distance along x
-            dist = N.abs(self.xscreen - x0)
-        elif distance_direction == 'radial':
-            # measure radial distance
-            dist = N.sqrt((self.xscreen - x0)**2 + (self.yscreen - y0)**2)
-        else:
-            # programming error
-            assert (distance_direction == 'radial' or
-                    distance_direction == 'vertical' or
-                    distance_direction == 'horizontal')
-
-        # ignore points which are offscreen or not finite
-        with N.errstate(invalid='ignore'):
-            outofbounds = (
-                (self.xscreen < bounds[0]) | (self.xscreen > bounds[2]) |
-                (self.yscreen < bounds[1]) | (self.yscreen > bounds[3]) |
-                ~N.isfinite(self.xscreen) | ~N.isfinite(self.yscreen) )
-        dist[outofbounds] = N.inf
-
-        m = N.min(dist)
-        # if there are multiple equidistant points, arbitrarily take
-        # the first one
-
-        try:
-            i = N.nonzero(dist == m)[0][0]
-        except IndexError:
+        # points which are offscreen or not finite are not in the index
+        res = self._getPointIndex(bounds).closest(x0, y0, distance_direction)
+        if res is None:
             return info
+        i, m = res
 
         info.screenpos = self.xscreen[i], self.yscreen[i]
         info.coords = self.xvals[i], self.yvals[i]
@@ -209,15 +391,14 @@ class GenericPickable:
         i += incr
 
         # skip points that are outside of the bounds or are not finite
-        while (i >= 0 and i < len(self.xscreen) and
-                ( not N.isfinite(self.xscreen[i]) or
-                  not N.isfinite(self.yscreen[i]) or
-                  (self.xscreen[i] < bounds[0] or self.xscreen[i] > bounds[2] or
-                   self.yscreen[i] < bounds[1] or self.yscreen[i] > bounds[3]) )):
-            i += incr
-
-        if i < 0 or i >= len(self.xscreen):
+        valid = self._getPointIndex(bounds).indices
+        if incr > 0:
+            k = N.searchsorted(valid, i)
+        else:
+            k = N.searchsorted(valid, i, side='right') - 1
+        if k < 0 or k >= len(valid):
             return info
+        i = valid[k]
 
         info.screenpos = self.xscreen[i], self.yscreen[i]
         info.coords = self.xvals[i], self.yvals[i]
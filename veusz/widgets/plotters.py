@@ -162,7 +162,7 @@ class GenericPlotter(widget.Widget):
         posn = self.computeBounds(parentposn, painthelper)
 
         # exit if hidden or function blank
-        if self.settings.hide:
+        if self.frozenSettings().hide:
             return
 
         # get axes widgets
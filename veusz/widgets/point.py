@@ -443,7 +443,7 @@ class PointPlotter(GenericPlotter):
         """Plot error bars (horizontal and vertical).
         """
 
-        s = self.settings
+        s = self.frozenSettings()
         style = s.errorStyle
         if style == 'none':
             return
@@ -646,7 +646,7 @@ class PointPlotter(GenericPlotter):
         if len(pts) < 2:
             return
         path = self._getBezierLine(pts, cliprect)
-        s = self.settings
+        s = self.frozenSettings()
 
         # do filling
         for fillstyle in s.FillBelow, s.FillAbove:
@@ -673,7 +673,7 @@ class PointPlotter(GenericPlotter):
         pts = self._getLinePoints(xvals, yvals, posn, xdata, ydata)
         if len(pts) < 2:
             return
-        s = self.settings
+        s = self.frozenSettings()
 
         # do filling
         for fillstyle in s.FillBelow, s.FillAbove:
@@ -688,7 +688,7 @@ class PointPlotter(GenericPlotter):
     def drawKeySymbol(self, number, painter, x, y, width, height):
         """Draw the plot symbol and/or line."""
 
-        s = self.settings
+        s = self.frozenSettings()
 
         # datasets from document
         xv = s.get('xData').getData(self.document)
@@ -769,7 +769,7 @@ class PointPlotter(GenericPlotter):
                    textvals, markersize):
         """Draw labels for the points."""
 
-        s = self.settings
+        s = self.frozenSettings()
         lab = s.get('Label')
 
         # work out offset an alignment
@@ -828,11 +828,17 @@ class PointPlotter(GenericPlotter):
 
         return pickable.DiscretePickable(self, 'xData', 'yData', map_fn)
 
+    def _cachedPickable(self, bounds):
+        return pickable.cachedPickable(
+            self, bounds, lambda: self._pickable(bounds))
+
     def pickPoint(self, x0, y0, bounds, distance = 'radial'):
-        return self._pickable(bounds).pickPoint(x0, y0, bounds, distance)
+        return self._cachedPickable(bounds).pickPoint(
+            x0, y0, bounds, distance)
 
     def pickIndex(self, oldindex, direction, bounds):
-        return self._pickable(bounds).pickIndex(oldindex, direction, bounds)
+        return self._cachedPickable(bounds).pickIndex(
+            oldindex, direction, bounds)
 
     def getColorbarParameters(self):
         """Return parameters for colorbar."""
@@ -845,7 +851,7 @@ class PointPlotter(GenericPlotter):
         """Plot the data on a plotter."""
 
         # get data
-        s = self.settings
+        s = self.frozenSettings()
         doc = self.document
         xv = s.get('xData').getData(doc)
         yv = s.get('yData').getData(doc)
@@ -880,8 +886,11 @@ class PointPlotter(GenericPlotter):
 
             #print "Calculating coordinates"
             # calc plotter coords of x and y points
-            xplotter = axes[0].dataToPlotterCoords(posn, xvals.data)
-            yplotter = axes[1].dataToPlotterCoords(posn, yvals.data)
+            # (other widgets may plot the same data on the same axes)
+            xplotter = painter.helper.dataToPlotterCoords(
+                axes[0], posn, xvals.data)
+            yplotter = painter.helper.dataToPlotterCoords(
+                axes[1], posn, yvals.data)
 
             # points are plotted offset in shift-points modes
             if s.PlotLine.steps != 'off':
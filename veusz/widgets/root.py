@@ -161,8 +161,7 @@ class Root(widget.Widget):
                 newsett = setting.Settings(name=klass.typename,
                                            usertext = klass.typename,
                                            pixmap="button_%s" % klass.typename)
-                classset = setting.Settings('temp')
-                klass.addSettings(classset)
+                classset = klass.settingsTemplate()
 
                 # copy formatting settings to stylesheet
                 for name in classset.setnames:
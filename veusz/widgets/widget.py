@@ -54,6 +54,9 @@ class Action(object):
         self.descr = descr
         self.usertext = usertext
 
+# settings made for each widget class (see Widget.settingsTemplate)
+_settingstemplates = {}
+
 class Widget(object):
     """ Fundamental plotting widget interface."""
 
@@ -88,12 +91,11 @@ class Widget(object):
         # store child widgets
         self.children = []
         
-        # settings for widget
-        self.settings = setting.Settings( 'Widget_' + self.typename,
-                                          setnsmode='widgetsettings' )
+        # settings for widget, copied from those made for the class
+        self.settings = self.settingsTemplate().copy()
         self.settings.parent = self
-
-        self.addSettings(self.settings)
+        # read-only snapshot of settings for drawing
+        self._frozensettings = None
 
         # actions for widget
         self.actions = []
@@ -103,6 +105,30 @@ class Widget(object):
         """Get types of widgets this can be a child of."""
         return ()
 
+    @classmethod
+    def settingsTemplate(klass):
+        """Get settings for this class, which are copied for each widget.
+
+        These are made by addSettings when first needed."""
+        try:
+            return _settingstemplates[klass]
+        except KeyError:
+            s = setting.Settings( 'Widget_' + klass.typename,
+                                  setnsmode='widgetsettings' )
+            klass.addSettings(s)
+            _settingstemplates[klass] = s
+            return s
+
+    def frozenSettings(self):
+        """Return a read-only snapshot of the settings, which is faster
+        to read values from when drawing (see setting.FrozenSettings).
+
+        The snapshot is made again if settings or widgets change."""
+        fs = self._frozensettings
+        if fs is None or not fs.isCurrent():
+            fs = self._frozensettings = setting.FrozenSettings(self.settings)
+        return fs
+
     @classmethod
     def addSettings(klass, s):
         """Add items to settings s."""
@@ -136,6 +162,7 @@ class Widget(object):
                 raise ValueError('New name "%s" already exists' % name)
 
         self.name = name
+        setting.settingsChanged()
 
     def addDefaultSubWidgets(self):
         '''Add default sub widgets to widget, if any'''
@@ -180,6 +207,7 @@ class Widget(object):
         index is a position to place the new child
         """
         self.children.insert(index, child)
+        setting.settingsChanged()
 
     def createUniqueName(self, prefix):
         """Create a name using the prefix which hasn't been used before."""
@@ -254,6 +282,7 @@ class Widget(object):
 
         if i < nc:
             self.children.pop(i)
+            setting.settingsChanged()
         else:
             raise ValueError("Cannot remove graph '%s' - does not exist" % name)
 
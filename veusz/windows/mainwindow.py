@@ -26,11 +26,6 @@ import sys
 import glob
 import re
 
-try:
-    import h5py
-except ImportError:
-    h5py = None
-
 from ..compat import cstr, cstrerror, cgetcwd
 from .. import qtall as qt4
 
@@ -900,7 +895,12 @@ class MainWindow(qt4.QMainWindow):
             qt4.QApplication.setOverrideCursor( qt4.QCursor(qt4.Qt.WaitCursor) )
             try:
                 ext = os.path.splitext(self.filename)[1]
-                mode = 'hdf5' if ext == '.vszh5' else 'vsz'
+                if ext == '.vszh5':
+                    mode = 'hdf5'
+                elif setting.settingdb['save_binarydata']:
+                    mode = 'vszbin'
+                else:
+                    mode = 'vsz'
                 self.document.save(self.filename, mode)
                 self.updateStatusbar(_("Saved to %s") % self.filename)
             except EnvironmentError as e:
@@ -995,7 +995,7 @@ class MainWindow(qt4.QMainWindow):
         """Save As file."""
 
         filters = [_('Veusz document files (*.vsz)')]
-        if h5py is not None:
+        if utils.moduleAvailable('h5py'):
             filters += [_('Veusz HDF5 document files (*.vszh5)')]
         filename = self.fileSaveDialog(filters, _('Save as'))
         if filename:
@@ -1126,7 +1126,7 @@ class MainWindow(qt4.QMainWindow):
         """Open an existing file in a new window."""
 
         filters = ['*.vsz']
-        if h5py is not None:
+        if utils.moduleAvailable('h5py'):
             filters.append('*.vszh5')
 
         filename = self.fileOpenDialog(
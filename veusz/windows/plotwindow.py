@@ -66,7 +66,12 @@ class PickerCrosshairItem( qt4.QGraphicsPathItem ):
         self.hide()
 
 class RenderControl(qt4.QObject):
-    """Object for rendering plots in a separate thread."""
+    """Object for drawing plots in separate threads.
+
+    Each job records the page into a PaintHelper and renders it to an
+    image. Jobs are superseded by newer jobs, or if the document is
+    modified while the page is being recorded.
+    """
 
     # emitted when new item on plot queue
     sigQueueChange = qt4.pyqtSignal(int)
@@ -75,6 +80,9 @@ class RenderControl(qt4.QObject):
     signalRenderFinished = qt4.pyqtSignal(
         int, qt4.QImage, document.PaintHelper)
 
+    # when recording a plot raises an exception (sys.exc_info() tuple)
+    sigRenderError = qt4.pyqtSignal(object)
+
     def __init__(self, plotwindow):
         """Start up numthreads rendering threads."""
         qt4.QObject.__init__(self)
@@ -118,6 +126,34 @@ class RenderControl(qt4.QObject):
         """Exit threads started."""
         self.updateNumberThreads(num=0)
 
+    def recordJob(self, helper, pagenumber, changeset):
+        """Record page into helper.
+
+        Returns (current, excinfo), where current is whether the
+        document was unchanged while recording, and excinfo is
+        sys.exc_info() if recording failed.
+        """
+
+        doc = helper.document
+        excinfo = None
+        # stop if the document is waiting to be modified, as a newer
+        # job will be added for the modified document
+        helper.abortable = True
+        with doc.paintlock:
+            if doc.changeset != changeset:
+                return False, None
+            try:
+                doc.paintTo(helper, pagenumber)
+            except document.PaintAborted:
+                return False, None
+            except Exception:
+                excinfo = sys.exc_info()
+
+            # modifications outside of operations (which hold
+            # paintlock) could make the plot inconsistent
+            current = doc.changeset == changeset
+        return current, excinfo
+
     def processNextJob(self):
         """Take a job from the queue and process it.
 
@@ -126,36 +162,43 @@ class RenderControl(qt4.QObject):
         """
 
         self.mutex.lock()
-        jobid, helper = self.latestjobs[-1]
+        jobid, helper, pagenumber, changeset = self.latestjobs[-1]
         del self.latestjobs[-1]
         lastadded = self.latestaddedjob
         self.mutex.unlock()
 
         # don't process jobs which have been superseded
         if lastadded == jobid:
-            img = qt4.QImage(helper.pagesize[0], helper.pagesize[1],
-                             qt4.QImage.Format_ARGB32_Premultiplied)
-            img.fill( setting.settingdb.color('page').rgb() )
-
-            painter = qt4.QPainter(img)
-            aa = self.plotwindow.antialias
-            painter.setRenderHint(qt4.QPainter.Antialiasing, aa)
-            painter.setRenderHint(qt4.QPainter.TextAntialiasing, aa)
-            helper.renderToPainter(painter)
-            painter.end()
-
-            self.mutex.lock()
-            # just throw away result if it older than the latest one
-            if jobid > self.latestdrawnjob:
-                self.signalRenderFinished.emit(jobid, img, helper)
-                self.latestdrawnjob = jobid
-            self.mutex.unlock()
+            current, excinfo = self.recordJob(helper, pagenumber, changeset)
+            if current and excinfo is not None:
+                self.sigRenderError.emit(excinfo)
+
+            # skip rendering if superseded while recording
+            if current and self.latestaddedjob == jobid:
+                img = qt4.QImage(helper.pagesize[0], helper.pagesize[1],
+                                 qt4.QImage.Format_ARGB32_Premultiplied)
+                img.fill( setting.settingdb.color('page').rgb() )
+
+                painter = qt4.QPainter(img)
+                aa = self.plotwindow.antialias
+                painter.setRenderHint(qt4.QPainter.Antialiasing, aa)
+                painter.setRenderHint(qt4.QPainter.TextAntialiasing, aa)
+                helper.renderToPainter(painter)
+                painter.end()
+
+                self.mutex.lock()
+                # just throw away result if it older than the latest one
+                if jobid > self.latestdrawnjob:
+                    self.signalRenderFinished.emit(jobid, img, helper)
+                    self.latestdrawnjob = jobid
+                self.mutex.unlock()
 
         # tell any listeners that a job has been processed
         self.sigQueueChange.emit(-1)
 
-    def addJob(self, helper):
-        """Process drawing job in PaintHelper given."""
+    def addJob(self, helper, pagenumber, changeset):
+        """Record page into PaintHelper given and render it.
+        changeset is the document changeset when the job is added."""
 
         # indicate that there is a new item to be processed to listeners
         self.sigQueueChange.emit(1)
@@ -163,7 +206,8 @@ class RenderControl(qt4.QObject):
         # add the job to the queue
         self.mutex.lock()
         self.latestaddedjob += 1
-        self.latestjobs.append( (self.latestaddedjob, helper) )
+        self.latestjobs.append(
+            (self.latestaddedjob, helper, pagenumber, changeset) )
         self.mutex.unlock()
 
         if self.threads:
@@ -173,6 +217,13 @@ class RenderControl(qt4.QObject):
             # process job in current thread if multithreading disabled
             self.processNextJob()
 
+    def cancelJobs(self):
+        """Throw away the results of jobs which have been added."""
+        self.mutex.lock()
+        self.latestaddedjob += 1
+        self.latestdrawnjob = self.latestaddedjob
+        self.mutex.unlock()
+
 class RenderThread( qt4.QThread ):
     """A thread for processing rendering jobs.
     This is controlled by a RenderControl object
@@ -198,6 +249,57 @@ class RenderThread( qt4.QThread ):
                 sys.stderr.write(_("Error in rendering thread\n"))
                 traceback.print_exc(file=sys.stderr)
 
+class ProfileOverlayItem(qt4.QGraphicsItem):
+    """Show the time taken to draw each widget as a heat map over the
+    widget bounds."""
+
+    def __init__(self):
+        qt4.QGraphicsItem.__init__(self)
+        # list of (QRectF, fraction of maximum time, label)
+        self.boxes = []
+        self.bounds = qt4.QRectF()
+
+    def updateTimes(self, painthelper):
+        """Update boxes from times recorded by profiler for widgets
+        drawn by painthelper."""
+
+        self.prepareGeometryChange()
+        self.boxes = []
+        self.bounds = qt4.QRectF()
+
+        times = utils.profiler.nameTimes()
+        if painthelper is not None and times:
+            items = []
+            for widget, bounds in painthelper.widgetBoundsIterator():
+                # skip root and pages, which cover everything
+                if widget.typename in ('document', 'page'):
+                    continue
+                t = times.get(widget.path)
+                if t:
+                    rect = qt4.QRectF(qt4.QPointF(bounds[0], bounds[1]),
+                                      qt4.QPointF(bounds[2], bounds[3]))
+                    items.append((rect, t, widget.name))
+            if items:
+                maxtime = max([i[1] for i in items])
+                for rect, t, name in items:
+                    self.boxes.append(
+                        (rect, t/maxtime, '%s: %.1f ms' % (name, t*1e3)))
+                    self.bounds = self.bounds.united(rect)
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        painter.save()
+        painter.setPen(qt4.QPen(qt4.Qt.darkRed))
+        for rect, frac, label in self.boxes:
+            painter.setBrush(qt4.QColor(255, 0, 0, int(20+140*frac)))
+            painter.drawRect(rect)
+            painter.drawText(rect.adjusted(2, 2, -2, -2),
+                             qt4.Qt.AlignLeft | qt4.Qt.AlignTop, label)
+        painter.restore()
+
+    def boundingRect(self):
+        return self.bounds
+
 class ControlGraphRoot(qt4.QGraphicsItem):
     """Control graph items are connected to this root item.
     We don't use a group here as it would swallow parent events."""
@@ -275,11 +377,19 @@ class PlotWindow( qt4.QGraphicsView ):
         self.pickeritem.setZValue(2.)
         self.pickeritem.hide()
 
+        # heat map of times for drawing widgets (not shown normally)
+        self.profileoverlay = ProfileOverlayItem()
+        self.scene.addItem(self.profileoverlay)
+        self.profileoverlay.setZValue(1.5)
+        self.profileoverlay.hide()
+
         # all the widgets that picker key-navigation might cycle through
         self.pickerwidgets = []
 
         # the picker state
         self.pickerinfo = widgets.PickInfo()
+        # mouse position to pick when drawing in another thread finishes
+        self.deferredpick = None
 
         # set up so if document is modified we are notified
         self.document = document
@@ -300,6 +410,8 @@ class PlotWindow( qt4.QGraphicsView ):
         self.rendercontrol = RenderControl(self)
         self.rendercontrol.signalRenderFinished.connect(
             self.slotRenderFinished)
+        self.rendercontrol.sigRenderError.connect(
+            self.slotRenderError)
         self.rendercontrol.sigQueueChange.connect(
             self.sigQueueChange)
 
@@ -539,9 +651,6 @@ class PlotWindow( qt4.QGraphicsView ):
         xpts = N.array( [pt1.x(), pt2.x(), pt1.x()+1, pt2.x()-1] )
         ypts = N.array( [pt1.y(), pt2.y(), pt1.y()+1, pt2.y()-1] )
 
-        # build up operation list to do zoom
-        operations = []
-
         axes = {}
         # iterate over children, to look for plotters
         for c in [i for i in widget.children if
@@ -555,44 +664,55 @@ class PlotWindow( qt4.QGraphicsView ):
                 if a:
                     axes[a] = True
 
-        # iterate over each axis, and update the ranges
-        for axis in axes:
-            s = axis.settings
-            if s.direction == 'horizontal':
-                p = xpts
-            else:
-                p = ypts
-
-            # convert points on plotter to axis coordinates
-            # FIXME: Need To Trap Conversion Errors!
-            try:
-                r = axis.plotterToGraphCoords(
-                    self.painthelper.widgetBounds(axis), p)
-            except KeyError:
-                continue
-
-            # invert if min and max are inverted
-            if r[1] < r[0]:
-                r[1], r[0] = r[0], r[1]
-                r[3], r[2] = r[2], r[3]
-
-            # build up operations to change axis
-            if s.min != r[0]:
-                operations.append( document.OperationSettingSet(
-                        s.get('min'),
-                        utils.round2delt(r[0], r[2])) )
+        painthelper = self.painthelper
+        def zoom():
+            # build up operation list to do zoom
+            operations = []
 
-            if s.max != r[1]:
-                operations.append( document.OperationSettingSet(
-                        s.get('max'),
-                        utils.round2delt(r[1], r[3])) )
+            # iterate over each axis, and update the ranges
+            for axis in axes:
+                s = axis.settings
+                if s.direction == 'horizontal':
+                    p = xpts
+                else:
+                    p = ypts
 
-        # finally change the axes
-        self.document.applyOperation(
-            document.OperationMultiple(operations,descr=_('zoom axes')) )
+                # convert points on plotter to axis coordinates
+                # FIXME: Need To Trap Conversion Errors!
+                try:
+                    r = axis.plotterToGraphCoords(
+                        painthelper.widgetBounds(axis), p)
+                except KeyError:
+                    continue
+
+                # invert if min and max are inverted
+                if r[1] < r[0]:
+                    r[1], r[0] = r[0], r[1]
+                    r[3], r[2] = r[2], r[3]
+
+                # build up operations to change axis
+                if s.min != r[0]:
+                    operations.append( document.OperationSettingSet(
+                            s.get('min'),
+                            utils.round2delt(r[0], r[2])) )
+
+                if s.max != r[1]:
+                    operations.append( document.OperationSettingSet(
+                            s.get('max'),
+                            utils.round2delt(r[1], r[3])) )
+
+            # finally change the axes
+            self.document.applyOperation(
+                document.OperationMultiple(operations,descr=_('zoom axes')) )
+
+        # axes store their position when drawn, which may be in another thread
+        self.document.callWithPaintLock(zoom)
 
     def axesForPoint(self, mousepos):
-        """Find all the axes which contain the given mouse position"""
+        """Find all the axes which contain the given mouse position.
+
+        Returns None if this is not known while a page is being drawn.
+        """
 
         if self.painthelper is None:
             return []
@@ -600,20 +720,28 @@ class PlotWindow( qt4.QGraphicsView ):
         pos = self.mapToScene(mousepos)
         px, py = pos.x(), pos.y()
 
+        # axes store their position when drawn, which may be in another
+        # thread, so give up if drawing
+        if not self.document.paintlock.acquire(False):
+            return None
+
         axes = []
-        for widget, bounds in self.painthelper.widgetBoundsIterator(
-            widgettype=widgets.Axis):
-            # if widget is axis, and point lies within bounds
-            if ( px>=bounds[0] and px<=bounds[2] and
-                 py>=bounds[1] and py<=bounds[3] ):
-
-                # convert correct pointer position
-                if widget.settings.direction == 'horizontal':
-                    val = px
-                else:
-                    val = py
-                coords=widget.plotterToGraphCoords(bounds, N.array([val]))
-                axes.append( (widget, coords[0]) )
+        try:
+            for widget, bounds in self.painthelper.widgetBoundsIterator(
+                widgettype=widgets.Axis):
+                # if widget is axis, and point lies within bounds
+                if ( px>=bounds[0] and px<=bounds[2] and
+                     py>=bounds[1] and py<=bounds[3] ):
+
+                    # convert correct pointer position
+                    if widget.settings.direction == 'horizontal':
+                        val = px
+                    else:
+                        val = py
+                    coords=widget.plotterToGraphCoords(bounds, N.array([val]))
+                    axes.append( (widget, coords[0]) )
+        finally:
+            self.document.paintlock.release()
 
         return axes
 
@@ -627,6 +755,29 @@ class PlotWindow( qt4.QGraphicsView ):
     def doPick(self, mousepos):
         """Find the point on any plot-like widget closest to the cursor"""
 
+        # widgets store their position when drawn, so if drawing in
+        # another thread, pick the latest position afterwards
+        if not self.document.paintlock.acquire(False):
+            if self.deferredpick is None:
+                qt4.QTimer.singleShot(20, self.slotDeferredPick)
+            self.deferredpick = qt4.QPoint(mousepos)
+            return
+
+        self.deferredpick = None
+        try:
+            self._pick(mousepos)
+        finally:
+            self.document.paintlock.release()
+
+    def slotDeferredPick(self):
+        """Pick position remembered while drawing."""
+        if ( self.deferredpick is not None and self.clickmode == 'pick' and
+             self.painthelper is not None ):
+            self.doPick(self.deferredpick)
+
+    def _pick(self, mousepos):
+        """Pick point, holding paintlock."""
+
         self.pickerwidgets = []
 
         pickinfo = widgets.PickInfo()
@@ -736,9 +887,9 @@ class PlotWindow( qt4.QGraphicsView ):
         elif self.clickmode == 'select' or self.clickmode == 'pick':
             # find axes which map to this position
             axes = self.axesForPoint(event.pos())
-            vals = dict([ (a[0].name, a[1]) for a in axes ])
-
-            self.sigAxisValuesFromMouse.emit(vals)
+            if axes is not None:
+                vals = dict([ (a[0].name, a[1]) for a in axes ])
+                self.sigAxisValuesFromMouse.emit(vals)
 
             if self.currentclickmode == 'pick':
                 # drag the picker around
@@ -781,12 +932,16 @@ class PlotWindow( qt4.QGraphicsView ):
                 event.accept()
                 dir = 'right' if k == qt4.Qt.Key_Right else 'left'
                 ix = self.pickerinfo.index
-                pickinfo = self.pickerinfo.widget.pickIndex(
-                    ix, dir, self.painthelper.widgetBounds(
-                        self.pickerinfo.widget))
-                if pickinfo:
-                    # more points visible in this direction
-                    self.emitPicked(pickinfo)
+                def pickindex():
+                    pickinfo = self.pickerinfo.widget.pickIndex(
+                        ix, dir, self.painthelper.widgetBounds(
+                            self.pickerinfo.widget))
+                    if pickinfo:
+                        # more points visible in this direction
+                        self.emitPicked(pickinfo)
+
+                # widgets may be being drawn in another thread
+                self.document.callWithPaintLock(pickindex)
                 return
 
             elif k == qt4.Qt.Key_Up or k == qt4.Qt.Key_Down:
@@ -794,39 +949,41 @@ class PlotWindow( qt4.QGraphicsView ):
                 event.accept()
                 p = self.pickeritem.pos()
 
-                oldw = self.pickerinfo.widget
-                pickinfo = widgets.PickInfo()
-
-                dist = float('inf')
-                for w in self.pickerwidgets:
-                    if w == oldw:
-                        continue
-
-                    # ask the widgets to pick their point which is closest horizontally
-                    # to the last (screen) x value picked
-                    pi = w.pickPoint(self.pickerinfo.screenpos[0], p.y(),
-                                     self.painthelper.widgetBounds(w),
-                                     distance='horizontal')
-                    if not pi:
-                        continue
-
-                    dy = p.y() - pi.screenpos[1]
-
-                    # take the new point which is closest vertically to the current
-                    # one and either above or below it as appropriate
-                    if abs(dy) < dist and ( (k == qt4.Qt.Key_Up and dy > 0)
-                            or (k == qt4.Qt.Key_Down and dy < 0) ):
-                        pickinfo = pi
-                        dist = abs(dy)
-
-                if pickinfo:
-                    oldx = self.pickerinfo.screenpos[0]
-                    self.emitPicked(pickinfo)
-
-                    # restore the previous x-position, so that vertical navigation
-                    # stays repeatable
-                    pickinfo.screenpos = (oldx, pickinfo.screenpos[1])
-
+                def pickvert():
+                    oldw = self.pickerinfo.widget
+                    pickinfo = widgets.PickInfo()
+
+                    dist = float('inf')
+                    for w in self.pickerwidgets:
+                        if w == oldw:
+                            continue
+
+                        # ask the widgets to pick their point which is closest horizontally
+                        # to the last (screen) x value picked
+                        pi = w.pickPoint(self.pickerinfo.screenpos[0], p.y(),
+                                         self.painthelper.widgetBounds(w),
+                                         distance='horizontal')
+                        if not pi:
+                            continue
+
+                        dy = p.y() - pi.screenpos[1]
+
+                        # take the new point which is closest vertically to the current
+                        # one and either above or below it as appropriate
+                        if abs(dy) < dist and ( (k == qt4.Qt.Key_Up and dy > 0)
+                                or (k == qt4.Qt.Key_Down and dy < 0) ):
+                            pickinfo = pi
+                            dist = abs(dy)
+
+                    if pickinfo:
+                        oldx = self.pickerinfo.screenpos[0]
+                        self.emitPicked(pickinfo)
+
+                        # restore the previous x-position, so that vertical
+                        # navigation stays repeatable
+                        pickinfo.screenpos = (oldx, pickinfo.screenpos[1])
+
+                self.document.callWithPaintLock(pickvert)
                 return
 
         # handle up-stream
@@ -911,10 +1068,13 @@ class PlotWindow( qt4.QGraphicsView ):
             self.checkPlotUpdate()
 
     def checkPlotUpdate(self):
-        """Check whether plot needs updating."""
+        """Check whether plot needs updating.
+
+        The page is recorded and rendered by the render control, which
+        calls slotRenderFinished when done.
+        """
 
         # print >>sys.stderr, "checking update"
-        # no threads, so can't get interrupted here
         # draw data into background pixmap if modified
         if ( self.zoomfactor != self.oldzoom or
              self.document.changeset != self.docchangeset or
@@ -926,6 +1086,9 @@ class PlotWindow( qt4.QGraphicsView ):
             self.pagenumber = min( self.document.getNumberPages() - 1,
                                    self.pagenumber )
             self.oldpagenumber = self.pagenumber
+            # set before the job, in case an error is shown without threads
+            self.oldzoom = self.zoomfactor
+            self.docchangeset = self.document.changeset
 
             if self.pagenumber >= 0:
                 size = self.document.pageSize(
@@ -933,22 +1096,15 @@ class PlotWindow( qt4.QGraphicsView ):
 
                 # draw the data into the buffer
                 # errors cause an exception window to pop up
-                try:
-                    phelper = document.PaintHelper(
-                        self.document, size,
-                        scaling=self.zoomfactor, dpi=self.dpi)
-                    self.document.paintTo(phelper, self.pagenumber)
-
-                except Exception:
-                    # stop updates this time round and show exception dialog
-                    d = exceptiondialog.ExceptionDialog(sys.exc_info(), self)
-                    self.oldzoom = self.zoomfactor
-                    self.docchangeset = self.document.changeset
-                    d.exec_()
-
-                self.painthelper = phelper
-                self.rendercontrol.addJob(phelper)
+                phelper = document.PaintHelper(
+                    self.document, size,
+                    scaling=self.zoomfactor, dpi=self.dpi,
+                    spritemarkers=setting.settingdb['plot_spritemarkers'],
+                    spriteantialias=self.antialias)
+                self.rendercontrol.addJob(
+                    phelper, self.pagenumber, self.docchangeset)
             else:
+                self.rendercontrol.cancelJobs()
                 self.painthelper = None
                 self.pagenumber = 0
                 size = self.document.docSize()
@@ -956,14 +1112,11 @@ class PlotWindow( qt4.QGraphicsView ):
                 pixmap.fill( setting.settingdb.color('page') )
                 self.setSceneRect(0, 0, *size)
                 self.pixmapitem.setPixmap(pixmap)
+                self.updateControlGraphs(self.lastwidgetsselected)
 
             self.sigUpdatePage.emit(self.pagenumber)
             self.updatePageToolbar()
 
-            self.updateControlGraphs(self.lastwidgetsselected)
-            self.oldzoom = self.zoomfactor
-            self.docchangeset = self.document.changeset
-
     def slotRenderFinished(self, jobid, img, helper):
         """Update image on display if rendering (usually in other
         thread) finished."""
@@ -971,6 +1124,18 @@ class PlotWindow( qt4.QGraphicsView ):
         self.setSceneRect(0, 0, bufferpixmap.width(), bufferpixmap.height())
         self.pixmapitem.setPixmap(bufferpixmap)
 
+        # use the state of the plot shown for picking and controls
+        self.painthelper = helper
+        self.updateControlGraphs(self.lastwidgetsselected)
+
+        if self.profileoverlay.isVisible():
+            self.profileoverlay.updateTimes(helper)
+
+    def slotRenderError(self, excinfo):
+        """Show exception raised when recording plot."""
+        d = exceptiondialog.ExceptionDialog(excinfo, self)
+        d.exec_()
+
     def updatePlotSettings(self):
         """Update plot window settings from settings."""
         self.setTimeout(setting.settingdb['plot_updatepolicy'])
@@ -1019,6 +1184,18 @@ class PlotWindow( qt4.QGraphicsView ):
         act.setCheckable(True)
         act.setChecked(self.antialias)
 
+        # profiling submenu
+        submenu = menu.addMenu(_('Profiling'))
+        act = submenu.addAction(_('Record drawing times'),
+                                self.actionProfile)
+        act.setCheckable(True)
+        act.setChecked(utils.profiler.enabled)
+        act = submenu.addAction(_('Show times on plot'),
+                                self.actionProfileOverlay)
+        act.setCheckable(True)
+        act.setChecked(self.profileoverlay.isVisible())
+        submenu.addAction(_('Report...'), self.actionProfileReport)
+
         menu.exec_(qt4.QCursor.pos())
 
     def actionForceUpdate(self):
@@ -1066,6 +1243,31 @@ class PlotWindow( qt4.QGraphicsView ):
         setting.settingdb['plot_antialias'] = self.antialias
         self.actionForceUpdate()
 
+    def actionProfile(self):
+        """Toggle recording of drawing times."""
+        utils.profiler.enable(not utils.profiler.enabled)
+        self.actionForceUpdate()
+
+    def actionProfileOverlay(self):
+        """Toggle showing drawing times on plot."""
+        self.setProfileOverlay(not self.profileoverlay.isVisible())
+
+    def setProfileOverlay(self, show):
+        """Show or hide heat map of drawing times, enabling profiling
+        if showing."""
+        if show:
+            if not utils.profiler.enabled:
+                utils.profiler.enable()
+                self.actionForceUpdate()
+            self.profileoverlay.updateTimes(self.painthelper)
+        self.profileoverlay.setVisible(show)
+
+    def actionProfileReport(self):
+        """Show dialog with table of drawing times."""
+        from ..dialogs.profiledialog import ProfileDialog
+        d = ProfileDialog(self, self)
+        d.show()
+
     def setZoomFactor(self, zoomfactor):
         """Set the zoom factor of the window."""
         zoomfactor = max(0.05, min(20, zoomfactor))
@@ -1186,7 +1388,8 @@ class PlotWindow( qt4.QGraphicsView ):
         pt = self.grabpos
 
         # try to work out in which widget the first point is in
-        widget = self.painthelper.pointInWidgetBounds(
+        painthelper = self.painthelper
+        widget = painthelper.pointInWidgetBounds(
             pt.x(), pt.y(), widgets.Graph)
         if widget is None:
             return []
@@ -1195,29 +1398,46 @@ class PlotWindow( qt4.QGraphicsView ):
         xpts = N.array( [pt.x()] )
         ypts = N.array( [pt.y()] )
 
-        axesretn = []
-        # iterate over children, to look for plotters
-        for c in [i for i in widget.children if
-                  isinstance(i, widgets.GenericPlotter)]:
-
-            # get axes associated with plotter
-            axes = c.parent.getAxes( (c.settings.xAxis,
-                                      c.settings.yAxis) )
-
-            # iterate over each, and update the ranges
-            for axis in [a for a in axes if a is not None]:
-                s = axis.settings
-                if s.direction == 'horizontal':
-                    p = xpts
-                else:
-                    p = ypts
-
-                # convert point on plotter to axis coordinate
-                # FIXME: Need To Trap Conversion Errors!
-                r = axis.plotterToGraphCoords(
-                    self.painthelper.widgetBounds(axis), p)
+        # axes store their position when drawn, so wait for any drawing
+        # in another thread to finish (signalled by sigQueueChange)
+        paintlock = self.document.paintlock
+        if not paintlock.acquire(False):
+            loop = qt4.QEventLoop()
+            self.rendercontrol.sigQueueChange.connect(loop.quit)
+            try:
+                while not paintlock.acquire(False):
+                    # in case the lock is not held by a render thread
+                    qt4.QTimer.singleShot(100, loop.quit)
+                    loop.exec_()
+            finally:
+                self.rendercontrol.sigQueueChange.disconnect(loop.quit)
 
-                axesretn.append( (axis.path, r[0]) )
+        axesretn = []
+        try:
+            # iterate over children, to look for plotters
+            for c in [i for i in widget.children if
+                      isinstance(i, widgets.GenericPlotter)]:
+
+                # get axes associated with plotter
+                axes = c.parent.getAxes( (c.settings.xAxis,
+                                          c.settings.yAxis) )
+
+                # iterate over each, and update the ranges
+                for axis in [a for a in axes if a is not None]:
+                    s = axis.settings
+                    if s.direction == 'horizontal':
+                        p = xpts
+                    else:
+                        p = ypts
+
+                    # convert point on plotter to axis coordinate
+                    # FIXME: Need To Trap Conversion Errors!
+                    r = axis.plotterToGraphCoords(
+                        painthelper.widgetBounds(axis), p)
+
+                    axesretn.append( (axis.path, r[0]) )
+        finally:
+            self.document.paintlock.release()
 
         return axesretn
 
@@ -22,7 +22,7 @@ and formatting properties."""
 
 from __future__ import division
 
-from ..compat import crange, citems
+from ..compat import crange, citems, cvalues, czip
 from .. import qtall as qt4
 
 from .. import widgets
@@ -145,31 +145,37 @@ class SettingsProxySingle(SettingsProxy):
             document.OperationSettingSet(setn, setn.default))
 
 class SettingsProxyMulti(SettingsProxy):
-    """A proxy wrapping settings for multiple widgets."""
+    """A proxy wrapping settings for multiple widgets.
 
-    def __init__(self, document, widgets, _root=''):
+    Widgets of the same type have the same settings, as they are
+    copied from a template, so common settings are found by only
+    looking at one widget of each type. The proxies for subsettings
+    are made from the settings of this proxy.
+    """
+
+    def __init__(self, document, widgets, _root='', _setns=None):
         """Initialise settings proxy.
         widgets is a list of widgets to proxy for."""
         self.document = document
         self.widgets = widgets
         self._root = _root
 
-        self._settingsatlevel = self._getSettingsAtLevel()
+        if _setns is None:
+            _setns = [w.settings for w in widgets]
+        self._settingsatlevel = _setns
         self._cachesettings = self._cachesetting = self._cachechild = None
 
-    def _getSettingsAtLevel(self):
-        """Return settings of widgets at level given."""
-        if self._root:
-            levels = self._root.split('/')
-        else:
-            levels = []
-        setns = []
-        for w in self.widgets:
-            s = w.settings
-            for lev in levels:
-                s = s.get(lev)
-            setns.append(s)
-        return setns
+        # settings for first widget of each type
+        self._typesetns = []
+        types = set()
+        for w, s in czip(widgets, _setns):
+            if w.__class__ not in types:
+                types.add(w.__class__)
+                self._typesetns.append(s)
+
+        # cache of multivalued, until document changes
+        self._multivalued = {}
+        self._multichangeset = None
 
     def _objList(self, filterclasses):
         """Return a list of objects with the type in filterclasses."""
@@ -186,7 +192,7 @@ class SettingsProxyMulti(SettingsProxy):
                     break
 
         sset = set(names)
-        for s in setns[1:]:
+        for s in self._typesetns[1:]:
             sset &= set(s.getNames())
         names = [n for n in names if n in sset]
 
@@ -198,8 +204,9 @@ class SettingsProxyMulti(SettingsProxy):
                 newroot = n
                 if self._root:
                     newroot = self._root + '/' + newroot
-                v = SettingsProxyMulti(self.document, self.widgets,
-                                       _root=newroot)
+                v = SettingsProxyMulti(
+                    self.document, self.widgets, _root=newroot,
+                    _setns=[s.get(n) for s in setns])
             else:
                 # use setting from first settings as template
                 v = o
@@ -243,10 +250,8 @@ class SettingsProxyMulti(SettingsProxy):
         # construct list of operations to change each setting
         ops = []
         sname = setting.name
-        if self._root:
-            sname = self._root + '/' + sname
-        for w in self.widgets:
-            s = self.document.resolveFullSettingPath(w.path + '/' + sname)
+        for setns in self._settingsatlevel:
+            s = setns.get(sname)
             if s.val != val:
                 ops.append(document.OperationSettingSet(s, val))
         # apply all operations
@@ -279,12 +284,23 @@ class SettingsProxyMulti(SettingsProxy):
 
     def multivalued(self, name):
         """Is setting multivalued?"""
+        if self._multichangeset != self.document.changeset:
+            self._multivalued.clear()
+            self._multichangeset = self.document.changeset
+        try:
+            return self._multivalued[name]
+        except KeyError:
+            pass
+
+        retn = False
         slist = [s.get(name) for s in self._settingsatlevel]
         first = slist[0].get()
         for s in slist[1:]:
             if s.get() != first:
-                return True
-        return False
+                retn = True
+                break
+        self._multivalued[name] = retn
+        return retn
 
     def resetToDefault(self, name):
         """Reset settings to default."""
@@ -295,8 +311,30 @@ class SettingsProxyMulti(SettingsProxy):
         self.document.applyOperation(
             document.OperationMultiple(ops, descr=_("reset to default")))
 
+def _controlKey(setn):
+    """Return key for settings which can share controls.
+
+    Settings at the same position in widgets of the same type are
+    copied from the same template, so have the same type and options.
+    """
+    path = []
+    obj = setn
+    while obj is not None and not obj.isWidget():
+        path.append(obj.name)
+        obj = obj.parent
+    return (setn.__class__, obj.__class__, tuple(path), setn._info,
+            setn.readonly)
+
 class PropertyList(qt4.QWidget):
-    """Edit the widget properties using a set of controls."""
+    """Edit the widget properties using a set of controls.
+
+    When the properties are updated, controls which can be reused
+    (see setting.controls) are kept in a pool, to use for settings of
+    the same type in later updates.
+    """
+
+    # maximum number of unused labels and controls to keep
+    maxpooled = 200
 
     def __init__(self, document, showformatsettings=True,
                  *args):
@@ -311,6 +349,12 @@ class PropertyList(qt4.QWidget):
         self.childlist = []
         self.setncntrls = {}     # map setting name to controls
 
+        # (key, label, control, slot) for reusable controls shown
+        self.reusable = []
+        # unused controls: map key to list of (label, control)
+        self.pool = {}
+        self.numpooled = 0
+
     def getConsole(self):
         """Find console window. This is horrible: HACK."""
         win = self.parent()
@@ -343,19 +387,56 @@ class PropertyList(qt4.QWidget):
 
     def _addControl(self, setnsproxy, setn, row):
         """Add a control for a setting."""
-        cntrl = setn.makeControl(None)
-        if cntrl:
+
+        key = _controlKey(setn)
+        reused = bool(self.pool.get(key))
+        if reused:
+            lab, cntrl = self.pool[key].pop()
+            self.numpooled -= 1
+            lab.setSetting(setn, setnsproxy)
+            cntrl.setSetting(setn)
+        else:
+            cntrl = setn.makeControl(None)
+            if not cntrl:
+                return row
             lab = SettingLabel(self.document, setn, setnsproxy)
-            self.layout.addWidget(lab, row, 0)
-            self.childlist.append(lab)
 
-            cntrl.sigSettingChanged.connect(setnsproxy.onSettingChanged)
-            self.layout.addWidget(cntrl, row, 1)
-            self.childlist.append(cntrl)
-            self.setncntrls[setn.name] = (lab, cntrl)
+        self.layout.addWidget(lab, row, 0)
+        slot = setnsproxy.onSettingChanged
+        cntrl.sigSettingChanged.connect(slot)
+        self.layout.addWidget(cntrl, row, 1)
+        if reused:
+            lab.show()
+            cntrl.show()
 
-            row += 1
-        return row
+        if hasattr(cntrl, 'setSetting'):
+            self.reusable.append( (key, lab, cntrl, slot) )
+        else:
+            self.childlist += [lab, cntrl]
+        self.setncntrls[setn.name] = (lab, cntrl)
+
+        return row+1
+
+    def _poolControls(self):
+        """Remove reusable controls from the layout, keeping them for
+        later use."""
+
+        for key, lab, cntrl, slot in self.reusable:
+            # hide first, as this may make control update the setting
+            lab.hide()
+            cntrl.hide()
+            self.layout.removeWidget(lab)
+            self.layout.removeWidget(cntrl)
+            cntrl.sigSettingChanged.disconnect(slot)
+            lab.setSetting(None, None)
+
+            if self.numpooled < self.maxpooled:
+                self.pool.setdefault(key, []).append( (lab, cntrl) )
+                self.numpooled += 1
+            else:
+                lab.deleteLater()
+                cntrl.deleteLater()
+        del self.reusable[:]
 
     def _addGroupedSettingsControl(self, grpdsetting, row):
         """Add a control for a set of grouped settings."""
@@ -426,6 +507,7 @@ class PropertyList(qt4.QWidget):
         # delete all child widgets
         self.setUpdatesEnabled(False)
 
+        self._poolControls()
         while len(self.childlist) > 0:
             c = self.childlist.pop()
             self.layout.removeWidget(c)
@@ -480,9 +562,31 @@ class PropertyList(qt4.QWidget):
         self.layout.addWidget(w, row, 0)
         self.childlist.append(w)
 
+        if self.reusable:
+            self._updateReused()
+
         self.setUpdatesEnabled(True)
         self.layout.setEnabled(True)
 
+    def _updateReused(self):
+        """Update state of controls after reusing them."""
+
+        # reused controls may be in a different order to when made
+        focus = []
+        for i in crange(self.layout.rowCount()):
+            for j in (0, 1):
+                item = self.layout.itemAtPosition(i, j)
+                if ( item is not None and item.widget() is not None and
+                     (not focus or item.widget() is not focus[-1]) ):
+                    focus.append(item.widget())
+        for w1, w2 in czip(focus[:-1], focus[1:]):
+            qt4.QWidget.setTabOrder(w1, w2)
+
+        # switches show or hide other settings, which may be reused
+        for lab, cntrl in cvalues(self.setncntrls):
+            if hasattr(cntrl, 'updateState'):
+                cntrl.updateState()
+
     def showHideSettings(self, setnshow, setnhide):
         """Show or hide controls for settings."""
         for vis, setns in ( (True, setnshow), (False, setnhide) ):
@@ -492,7 +596,12 @@ class PropertyList(qt4.QWidget):
                         cntrl.setVisible(vis)
 
 class TabbedFormatting(qt4.QTabWidget):
-    """Class to have tabbed set of settings."""
+    """Class to have tabbed set of settings.
+
+    Tabs are filled when first shown. If the settings are changed to
+    those with the same tabs with setSettingsProxy, the tabs are
+    updated when next shown, reusing their controls.
+    """
 
     def __init__(self, document, setnsproxy, shownames=False):
         qt4.QTabWidget.__init__(self)
@@ -503,59 +612,76 @@ class TabbedFormatting(qt4.QTabWidget):
 
         # get list of settings
         self.setnsproxy = setnsproxy
-        setnslist = setnsproxy.settingsProxyList()
-
-        # add formatting settings if necessary
-        numformat = len( [setn for setn in setnsproxy.settingList()
-                          if setn.formatting] )
-        if numformat > 0:
-            # add on a formatting tab
-            setnslist.insert(0, setnsproxy)
+        self.tabsubsetns = self._tabSettings(setnsproxy)
 
         self.currentChanged.connect(self.slotCurrentChanged)
 
-        # subsettings for tabs
-        self.tabsubsetns = []
-
-        # collected titles and tooltips for tabs
-        self.tabtitles = []
-        self.tabtooltips = []
+        # details of each tab: (pixmap, name, title, tooltip)
+        self.tabinfo = [ self._tabInfo(setnsproxy, subset)
+                         for subset in self.tabsubsetns ]
 
         # tabs which have been initialized
         self.tabinit = set()
+        # property list for each tab made
+        self.tabplists = {}
 
         # add tab for each subsettings
-        for subset in setnslist:
-            if subset.setnsmode() not in ('formatting', 'widgetsettings'):
-                continue
-            self.tabsubsetns.append(subset)
-
-            # details of tab
-            if subset is setnsproxy:
-                # main tab formatting, so this is special
-                pixmap = 'settings_main'
-                tabname = title = _('Main')
-                tooltip = _('Main formatting')
-            else:
-                # others
-                if hasattr(subset, 'pixmap'):
-                    pixmap = subset.pixmap()
-                else:
-                    pixmap = None
-                tabname = subset.name()
-                tooltip = title = subset.usertext()
-                
+        for pixmap, tabname, title, tooltip in self.tabinfo:
             # hide name in tab
             if not shownames:
                 tabname = ''
 
-            self.tabtitles.append(title)
-            self.tabtooltips.append(tooltip)
-
             # create tab
             indx = self.addTab(qt4.QWidget(), utils.getIcon(pixmap), tabname)
             self.setTabToolTip(indx, tooltip)
 
+    @staticmethod
+    def _tabSettings(setnsproxy):
+        """Get list of subsettings to show in tabs."""
+
+        setnslist = list(setnsproxy.settingsProxyList())
+
+        # add formatting settings if necessary
+        numformat = len( [setn for setn in setnsproxy.settingList()
+                          if setn.formatting] )
+        if numformat > 0:
+            # add on a formatting tab
+            setnslist.insert(0, setnsproxy)
+
+        return [ subset for subset in setnslist
+                 if subset.setnsmode() in ('formatting', 'widgetsettings') ]
+
+    @staticmethod
+    def _tabInfo(setnsproxy, subset):
+        """Return (pixmap, name, title, tooltip) for tab."""
+        if subset is setnsproxy:
+            # main tab formatting, so this is special
+            return ( 'settings_main', _('Main'), _('Main'),
+                     _('Main formatting') )
+        else:
+            # others
+            if hasattr(subset, 'pixmap'):
+                pixmap = subset.pixmap()
+            else:
+                pixmap = None
+            return (pixmap, subset.name(), subset.usertext(),
+                    subset.usertext())
+
+    @classmethod
+    def tabKey(kls, setnsproxy):
+        """Return key which is the same for settings with the same tabs."""
+        return tuple([ kls._tabInfo(setnsproxy, subset)
+                       for subset in kls._tabSettings(setnsproxy) ])
+
+    def setSettingsProxy(self, setnsproxy):
+        """Show settings of setnsproxy, which must have the same tabs
+        (see tabKey)."""
+        self.setnsproxy = setnsproxy
+        self.tabsubsetns = self._tabSettings(setnsproxy)
+        self.tabinit = set()
+        if self.count() > 0:
+            self.slotCurrentChanged(self.currentIndex())
+
     def slotCurrentChanged(self, tab):
         """Lazy loading of tab when displayed."""
         if tab in self.tabinit:
@@ -567,12 +693,19 @@ class TabbedFormatting(qt4.QTabWidget):
         subsetn = self.tabsubsetns[tab]
         # whether these are the main settings
         mainsettings = subsetn is self.setnsproxy
+        title = self.tabinfo[tab][2:4]
+
+        if tab in self.tabplists:
+            # update existing list
+            self.tabplists[tab].updateProperties(
+                subsetn, title=title, onlyformatting=mainsettings)
+            return
 
         # add this property list to the scroll widget for tab
         plist = PropertyList(self.document, showformatsettings=not mainsettings)
-        plist.updateProperties(subsetn, title=(self.tabtitles[tab],
-                                               self.tabtooltips[tab]),
+        plist.updateProperties(subsetn, title=title,
                                onlyformatting=mainsettings)
+        self.tabplists[tab] = plist
 
         # create scrollable area
         scroll = qt4.QScrollArea()
@@ -590,8 +723,14 @@ class TabbedFormatting(qt4.QTabWidget):
 class FormatDock(qt4.QDockWidget):
     """A window for formatting the current widget.
     Provides tabbed formatting properties
+
+    Recently used tabbed widgets are kept, to be reused for settings
+    with the same tabs.
     """
 
+    # number of tabbed widgets to keep
+    maxtabwidgets = 4
+
     def __init__(self, document, treeedit, *args):
         qt4.QDockWidget.__init__(self, *args)
         self.setWindowTitle(_("Formatting - Veusz"))
@@ -600,6 +739,11 @@ class FormatDock(qt4.QDockWidget):
         self.document = document
         self.tabwidget = None
 
+        # tabbed widgets, most recently used first: list of (key, widget)
+        self.tabwidgets = []
+        self.stack = qt4.QStackedWidget()
+        self.setWidget(self.stack)
+
         # update our view when the tree edit window selection changes
         treeedit.widgetsSelected.connect(self.selectedWidgets)
 
@@ -612,17 +756,37 @@ class FormatDock(qt4.QDockWidget):
         else:
             tab = 0
 
-        # delete old tabwidget
-        if self.tabwidget:
-            self.tabwidget.deleteLater()
-            self.tabwidget = None
+        key = None
+        if setnsproxy is not None:
+            key = TabbedFormatting.tabKey(setnsproxy)
+
+        for i, (k, w) in enumerate(self.tabwidgets):
+            if k == key and key is not None:
+                # reuse existing tabbed widget
+                del self.tabwidgets[i]
+                self.tabwidget = w
+                # avoid filling tab before changing to it
+                w.blockSignals(True)
+                w.setCurrentIndex( max( min(w.count()-1, tab), 0 ) )
+                w.blockSignals(False)
+                w.setSettingsProxy(setnsproxy)
+                break
+        else:
+            self.tabwidget = TabbedFormatting(self.document, setnsproxy)
+            self.stack.addWidget(self.tabwidget)
 
-        self.tabwidget = TabbedFormatting(self.document, setnsproxy)
-        self.setWidget(self.tabwidget)
+            # wrap tab from zero to max number
+            tab = max( min(self.tabwidget.count()-1, tab), 0 )
+            self.tabwidget.setCurrentIndex(tab)
 
-        # wrap tab from zero to max number
-        tab = max( min(self.tabwidget.count()-1, tab), 0 )
-        self.tabwidget.setCurrentIndex(tab)
+        self.stack.setCurrentWidget(self.tabwidget)
+        self.tabwidgets.insert(0, (key, self.tabwidget))
+
+        # delete least recently used tabbed widgets
+        while len(self.tabwidgets) > self.maxtabwidgets:
+            k, w = self.tabwidgets.pop()
+            self.stack.removeWidget(w)
+            w.deleteLater()
 
 class PropertiesDock(qt4.QDockWidget):
     """A window for editing properties for widgets."""
@@ -1243,17 +1407,10 @@ class SettingLabel(qt4.QWidget):
         self.document = document
         document.signalModified.connect(self.slotDocModified)
 
-        self.setting = setting
-        self.setnsproxy = setnsproxy
-
         self.layout = qt4.QHBoxLayout(self)
         self.layout.setContentsMargins(2,2,2,2)
 
-        if setting.usertext:
-            text = setting.usertext
-        else:
-            text = setting.name
-        self.labelicon = qt4.QLabel(text)
+        self.labelicon = qt4.QLabel()
         self.layout.addWidget(self.labelicon)
         
         self.iconlabel = qt4.QLabel()
@@ -1266,6 +1423,23 @@ class SettingLabel(qt4.QWidget):
         self.inmenu = False
 
         # initialise settings
+        self.setSetting(setting, setnsproxy)
+
+    def setSetting(self, setting, setnsproxy):
+        """Describe another setting.
+        If setting is None, the label is not updated until set again."""
+
+        self.setting = setting
+        self.setnsproxy = setnsproxy
+        if setting is None:
+            return
+
+        if setting.usertext:
+            text = setting.usertext
+        else:
+            text = setting.name
+        self.labelicon.setText(text)
+
         self.slotDocModified(True)
 
     def mouseReleaseEvent(self, event):
@@ -1290,6 +1464,10 @@ class SettingLabel(qt4.QWidget):
     def slotDocModified(self, ismodified):
         """If the document has been modified."""
 
+        if self.setting is None:
+            # unused label
+            return
+
         # update pixmap (e.g. link added/removed)
         self.updateHighlight()
 